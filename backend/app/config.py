@@ -20,7 +20,15 @@ class Settings(BaseSettings):
     app_name: str = "J-Scenario API"
     app_version: str = "1.0.0"
     debug: bool = True
-    
+
+    # Logging
+    # 상세 페이로드 DEBUG 로그(전체 JSON, 인식 후보 등)를 남길 인터랙션 비율 (0.0 ~ 1.0)
+    debug_log_sample_rate: float = Field(default=0.1, ge=0.0, le=1.0)
+
+    # Tracing (요청별 span을 JSON Lines로 기록, 오프라인 분석용)
+    tracing_enabled: bool = False
+    tracing_jsonl_path: str = "logs/traces.jsonl"
+
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
@@ -31,6 +39,15 @@ class Settings(BaseSettings):
     # Google Gemini API (필수)
     gemini_api_key: str = Field(default="", description="Google Gemini API key")
     
+    # 문법 평가 + AI 응답을 Gemini 1회 호출로 생성 (입력 토큰 및 왕복 1회 절약)
+    # 단, AI 응답/TTS가 평가 완료 후에 시작되므로 스트리밍 시 응답 이벤트는 늦어질 수 있음
+    gemini_combined_evaluation: bool = False
+    
+    # Text correction 캐시 (LRU + TTL, DB 경로를 지정하면 SQLite에 영속화)
+    correction_cache_max_entries: int = 5000
+    correction_cache_ttl_seconds: int = 86400
+    correction_cache_db_path: str = ""
+    
     # Google Cloud (STT, TTS) - 선택사항
     google_application_credentials: str = Field(default="", description="Path to Google Cloud credentials JSON")
     google_cloud_project_id: str = Field(default="", description="Google Cloud project ID")
@@ -38,11 +55,103 @@ class Settings(BaseSettings):
     # Azure Cognitive Services (발음 평가) - 선택사항
     azure_speech_key: str = Field(default="", description="Azure Speech service key")
     azure_speech_region: str = Field(default="", description="Azure Speech service region")
+    # 미리 websocket 연결을 열어 둘 recognizer 수 (0이면 요청마다 새로 연결)
+    azure_pool_size: int = 4
+    # 마지막 사용 후 유휴 연결 최대 유지 시간 (초과 시 폐기 후 재연결)
+    azure_pool_max_idle_seconds: float = 60.0
+    
+    # 이 길이 이상의 발화는 Google STT streaming_recognize 사용 (0이면 비활성화)
+    # 동기 recognize는 오디오 1분 제한이 있으므로 그보다 작게 유지
+    stt_streaming_threshold_ms: int = 30000
+    
+    # 서버 시작 시 STT/TTS/Gemini 클라이언트 생성 및 연결 (첫 요청의 콜드 스타트 제거)
+    client_warmup_on_startup: bool = True
+    client_warmup_timeout_seconds: float = 5.0
     
+    # 블로킹 SDK 호출용 전용 스레드 풀 (워커 수 / 대기열 길이, 대기열 초과 시 503)
+    stt_executor_workers: int = 8
+    stt_executor_queue: int = 32
+    azure_executor_workers: int = 8
+    azure_executor_queue: int = 32
+    transcode_executor_workers: int = 4
+    transcode_executor_queue: int = 16
+
+    # 외부 API 호출 속도 제한 (제공자별 클라이언트 측 토큰 버킷, 0이면 제한 없음)
+    # 프로젝트/구독 할당량보다 약간 낮게 설정해 429를 받기 전에 호출을 고르게 펴서 대기시킴
+    gemini_rate_limit_rps: float = 25.0
+    gemini_rate_limit_tpm: int = 1_000_000
+    google_stt_rate_limit_rps: float = 15.0
+    google_tts_rate_limit_rps: float = 15.0
+    azure_speech_rate_limit_rps: float = 15.0
+    # 버킷 크기 (초당 허용량 × 이 값만큼 순간 버스트 허용)
+    rate_limit_burst_seconds: float = 1.0
+    # 호출 차례까지 이보다 오래 기다려야 하면 즉시 503 + Retry-After
+    rate_limit_max_wait_seconds: float = 10.0
+    # 429를 받으면 해당 제공자의 새 호출을 멈출 시간 (재시도 폭주 방지)
+    rate_limit_quota_backoff_seconds: float = 5.0
+
+    # 외부 API 회로 차단기 (제공자별, 최근 기간의 실패율이 높으면 호출 없이 즉시 503)
+    circuit_breaker_enabled: bool = True
+    circuit_breaker_window_seconds: float = 30.0
+    # 기간 내 호출이 이보다 적으면 회로를 열지 않음
+    circuit_breaker_min_calls: int = 10
+    circuit_breaker_failure_rate: float = Field(default=0.5, gt=0.0, le=1.0)
+    # 회로를 연 뒤 시험 호출 1회를 허용하기까지의 시간
+    circuit_breaker_open_seconds: float = 15.0
+
+    # 헤지 요청 (보정, TTS처럼 멱등인 호출만): 첫 호출이 최근 p95 안에 끝나지 않으면 한 번 더 보내 먼저 온 응답 사용
+    hedged_requests_enabled: bool = False
+    hedge_delay_percentile: float = Field(default=95.0, gt=0.0, le=100.0)
+    # 지연 시간 기록이 이보다 적으면 헤지하지 않음
+    hedge_min_samples: int = 20
+    hedge_min_delay_ms: float = 50.0
+    # 전체 호출 대비 헤지 비율 상한 (부하 증가 제한)
+    hedge_max_ratio: float = Field(default=0.1, ge=0.0, le=1.0)
+
     # File Upload
     upload_dir: str = "./uploads"
     max_audio_size_mb: int = 10
     
+    # 앞뒤 무음 제거 (VAD) - STT/Azure에 보내는 오디오 길이 단축
+    vad_enabled: bool = True
+    # 음성 구간 앞뒤로 남겨 둘 여유 (ms)
+    vad_padding_ms: int = 200
+    
+    # 인터랙션 동시 처리 제한 (/api/interactions, /api/sessions/ws의 턴 평가 공용, 0이면 제한 없음)
+    # 초과분은 사용자별 공정 대기열에서 기다리고, 대기열이 가득 차거나 대기 시간이 기한을 넘으면 503 + Retry-After
+    interaction_max_concurrent: int = 16
+    interaction_max_queue: int = 64
+    interaction_queue_deadline_seconds: float = 5.0
+    
+    # WebSocket 대화 세션 (/api/sessions/ws)
+    session_max_active: int = 200
+    # 동시에 진행 중인 발화 턴 수 상한 (턴마다 스트리밍 STT가 전용 "session_stt" 스레드 하나를 점유)
+    # REST 인터랙션용 "stt" 스레드 풀과 분리되어 있어 말하는 사용자가 많아도 REST STT가 밀리지 않음
+    session_max_concurrent_turns: int = 32
+    session_idle_timeout_seconds: float = 120.0
+    # AI 응답 문맥으로 유지할 최근 대화 턴 수
+    session_max_history_turns: int = 6
+    
+    # 시나리오 파일(data/scenarios.json) 변경 감시 주기 (0이면 비활성화)
+    scenario_reload_interval_seconds: float = 5.0
+    
+    # 오프라인 대체 구현 (STT/TTS/Gemini/Azure 대신 지연 시간/에러만 흉내, 부하 테스트·CI용)
+    stand_in_providers: bool = False
+    # 연산별 분포 덮어쓰기 (JSON, 예: {"recognize": {"median_ms": 800, "sigma": 0.5, "error_rate": 0.02}})
+    stand_in_profiles: dict[str, dict[str, float]] = Field(default_factory=dict)
+    # 모든 지연 시간에 곱할 배율 (0이면 지연 없음)
+    stand_in_latency_scale: float = Field(default=1.0, ge=0.0)
+    stand_in_seed: Optional[int] = None
+    
+    # TTS Cache (uploads/audio/cache, 디스크 LRU)
+    tts_cache_max_mb: int = 200
+    # 클라이언트에 URL을 반환한 파일은 이 시간 동안 용량을 넘어도 삭제하지 않음 (다운로드 전 404 방지)
+    tts_cache_retention_seconds: float = 600.0
+    
+    # 시나리오 고정 대사 사전 합성 (서버 시작 시 백그라운드 실행, 유료 TTS 호출이 발생하므로 기본 비활성화)
+    tts_warmup_on_startup: bool = False
+    tts_warmup_concurrency: int = 4
+    
     # CORS
     allowed_origins: str = "http://localhost:3000,http://localhost:8080,http://10.0.2.2:8000"  # 개발 환경 기본값
     
@@ -85,8 +194,8 @@ class Settings(BaseSettings):
         """
         errors = []
         
-        # Gemini API는 필수
-        if not self.gemini_api_key:
+        # Gemini API는 필수 (대체 구현 사용 시 제외)
+        if not self.gemini_api_key and not self.stand_in_providers:
             errors.append("GEMINI_API_KEY is required but not set")
         
         # Google Cloud는 선택사항이지만, 설정된 경우 파일 존재 확인
@@ -0,0 +1,201 @@
+"""
+Service container managed by the FastAPI lifespan
+서비스와 외부 클라이언트를 워커당 한 번만 생성하고, 시작 시 연결을 준비하며, 종료 시 정리
+"""
+import asyncio
+from dataclasses import dataclass, field, fields
+from typing import Any, Optional
+from fastapi import Depends
+from loguru import logger
+from starlette.requests import HTTPConnection
+from app.config import get_settings
+from app.services.audio_warmup_service import AudioWarmupService
+from app.services.azure_pronunciation_service import AzurePronunciationService
+from app.services.evaluation_service import EvaluationService
+from app.services.interaction_service import InteractionService
+from app.services.scenario_service import ScenarioCatalog, ScenarioService
+from app.services.session_service import SessionManager
+from app.services.stt_service import STTService
+from app.services.text_correction_service import TextCorrectionService
+from app.services.tts_service import TTSService
+from app.utils.admission import AdmissionController
+from app.utils.executors import shutdown_executors
+from app.utils.metrics import render_metrics
+
+settings = get_settings()
+
+
+@dataclass
+class ServiceContainer:
+    """앱 전체에서 공유하는 서비스 인스턴스"""
+    scenario_service: ScenarioService
+    stt_service: STTService
+    text_correction_service: TextCorrectionService
+    pronunciation_service: AzurePronunciationService
+    evaluation_service: EvaluationService
+    tts_service: TTSService
+    interaction_service: InteractionService
+    session_manager: SessionManager
+    admission_controller: AdmissionController
+    _audio_warmup_task: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def build(cls, **overrides: Any) -> "ServiceContainer":
+        """
+        서비스 생성 (overrides로 일부 서비스를 대체 구현으로 교체 가능)
+
+        Args:
+            overrides: 필드 이름 → 인스턴스 (예: stt_service=FakeSTTService())
+
+        Raises:
+            TypeError: 알 수 없는 서비스 이름
+        """
+        names = {f.name for f in fields(cls) if f.init}
+        unknown = set(overrides) - names
+        if unknown:
+            raise TypeError(f"Unknown services: {', '.join(sorted(unknown))}")
+
+        stt_service = overrides.get("stt_service") or STTService()
+        text_correction_service = overrides.get("text_correction_service") or TextCorrectionService()
+        pronunciation_service = overrides.get("pronunciation_service") or AzurePronunciationService()
+        evaluation_service = overrides.get("evaluation_service") or EvaluationService()
+        tts_service = overrides.get("tts_service") or TTSService()
+        interaction_service = overrides.get("interaction_service") or InteractionService(
+            stt_service=stt_service,
+            text_correction_service=text_correction_service,
+            pronunciation_service=pronunciation_service,
+            evaluation_service=evaluation_service,
+            tts_service=tts_service
+        )
+        return cls(
+            scenario_service=overrides.get("scenario_service") or ScenarioService(),
+            stt_service=stt_service,
+            text_correction_service=text_correction_service,
+            pronunciation_service=pronunciation_service,
+            evaluation_service=evaluation_service,
+            tts_service=tts_service,
+            interaction_service=interaction_service,
+            session_manager=overrides.get("session_manager") or SessionManager(
+                max_sessions=settings.session_max_active,
+                max_concurrent_turns=settings.session_max_concurrent_turns
+            ),
+            admission_controller=overrides.get("admission_controller") or AdmissionController(
+                max_concurrent=settings.interaction_max_concurrent,
+                max_queue=settings.interaction_max_queue,
+                queue_deadline_seconds=settings.interaction_queue_deadline_seconds
+            )
+        )
+
+    def _client_services(self) -> list[Any]:
+        return [
+            self.stt_service,
+            self.text_correction_service,
+            self.pronunciation_service,
+            self.evaluation_service,
+            self.tts_service,
+        ]
+
+    def render_metrics(self) -> bytes:
+        """Prometheus 지표 (요청 지표 + 현재 executor/캐시/세션/입장 제어 상태)"""
+        cache_stats = {
+            name: service.cache_stats
+            for name, service in (("tts", self.tts_service), ("correction", self.text_correction_service))
+            if hasattr(service, "cache_stats")
+        }
+        return render_metrics(
+            cache_stats,
+            session_stats=self.session_manager.stats,
+            admission_stats=self.admission_controller.stats
+        )
+
+    def recognizer_pool_stats(self) -> list[dict]:
+        """Azure recognizer 풀 통계 (대체 구현에는 풀이 없을 수 있음)"""
+        pool_stats = getattr(self.pronunciation_service, "pool_stats", None)
+        return pool_stats() if pool_stats is not None else []
+
+    async def startup(self) -> None:
+        """클라이언트 연결 준비, 시나리오 감시, 고정 대사 음성 사전 합성 시작"""
+        if settings.client_warmup_on_startup:
+            await self._warm_clients()
+
+        # 시나리오 파일 변경 시 재시작 없이 카탈로그 교체
+        self.scenario_service.start_watching(settings.scenario_reload_interval_seconds)
+
+        if settings.tts_warmup_on_startup:
+            # 시나리오 고정 대사 사전 합성 (서버 기동을 막지 않도록 백그라운드 실행)
+            warmup_service = AudioWarmupService(
+                self.tts_service,
+                concurrency=settings.tts_warmup_concurrency
+            )
+
+            async def warm_catalog(catalog: ScenarioCatalog) -> None:
+                result = await warmup_service.warmup(list(catalog.scenarios))
+                await self.scenario_service.attach_character_audio(catalog, result.audio_urls)
+
+            self._audio_warmup_task = asyncio.create_task(
+                warm_catalog(self.scenario_service.catalog)
+            )
+            # 핫 리로드로 추가된 시나리오도 합성
+            self.scenario_service.add_reload_listener(warm_catalog)
+
+    async def _warm_clients(self) -> None:
+        """
+        모든 클라이언트를 동시에 연결 (서비스별 제한 시간 적용, 실패해도 서버는 시작)
+
+        대체 구현에는 warmup()이 없을 수 있으므로 있는 서비스만 호출합니다.
+        """
+        async def warm(service: Any) -> None:
+            warmup = getattr(service, "warmup", None)
+            if warmup is None:
+                return
+            name = type(service).__name__
+            try:
+                await asyncio.wait_for(warmup(), timeout=settings.client_warmup_timeout_seconds)
+            except Exception as e:
+                logger.warning("{} warmup failed: {}: {}", name, type(e).__name__, e)
+
+        await asyncio.gather(*(warm(service) for service in self._client_services()))
+
+    async def shutdown(self) -> None:
+        """백그라운드 작업 취소 및 클라이언트/스레드 풀 종료"""
+        if self._audio_warmup_task is not None and not self._audio_warmup_task.done():
+            self._audio_warmup_task.cancel()
+            await asyncio.gather(self._audio_warmup_task, return_exceptions=True)
+
+        await self.scenario_service.stop_watching()
+
+        for service in self._client_services():
+            close = getattr(service, "close", None)
+            if close is None:
+                continue
+            try:
+                result = close()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.warning("{} close failed: {}", type(service).__name__, e)
+
+        shutdown_executors()
+        # 큐에 남은 로그 기록
+        await logger.complete()
+
+
+def get_container(connection: HTTPConnection) -> ServiceContainer:
+    """요청(HTTP/WebSocket)이 속한 앱의 서비스 컨테이너"""
+    return connection.app.state.container
+
+
+def get_scenario_service(container: ServiceContainer = Depends(get_container)) -> ScenarioService:
+    return container.scenario_service
+
+
+def get_interaction_service(container: ServiceContainer = Depends(get_container)) -> InteractionService:
+    return container.interaction_service
+
+
+def get_session_manager(container: ServiceContainer = Depends(get_container)) -> SessionManager:
+    return container.session_manager
+
+
+def get_admission_controller(container: ServiceContainer = Depends(get_container)) -> AdmissionController:
+    return container.admission_controller
@@ -1,105 +1,184 @@
 """
 FastAPI application entry point
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from app.config import get_settings
-from app.routes import scenarios, interactions
+from app.container import ServiceContainer, get_container
+from app.routes import scenarios, interactions, sessions
+from app.services.stand_in_services import build_stand_in_services
+from app.utils.circuit_breaker import circuit_breaker_stats
+from app.utils.executors import executor_stats
+from app.utils.hedging import hedge_stats
 from app.utils.logger import setup_logging
+from app.utils.metrics import METRICS_CONTENT_TYPE
+from app.utils.rate_limit import rate_limiter_stats
+from app.utils.tracing import JsonlSpanExporter, configure_tracing, shutdown_tracing
+from app.utils.upload import MULTIPART_OVERHEAD_BYTES, UploadSizeLimitMiddleware
 
 # 로깅 초기화
 logger = setup_logging()
 
 settings = get_settings()
 
-app = FastAPI(
-    title=settings.app_name,
-    version=settings.app_version,
-    description="롤플레잉 일본어 회화 학습 앱 백엔드 API",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
 
-# 정적 파일 서빙 설정 (uploads 디렉토리)
-uploads_dir = Path(__file__).parent.parent / "uploads"
-if uploads_dir.exists():
-    app.mount("/uploads", StaticFiles(directory=str(uploads_dir)), name="uploads")
-
-# CORS 설정
-# 환경 변수로 허용된 origin 목록 관리
-# .env 파일에 ALLOWED_ORIGINS="http://localhost:3000,https://yourdomain.com" 형식으로 설정
-allowed_origins_str = settings.allowed_origins
-allowed_origins_set = set()
-
-# 환경 변수에서 origin 목록 파싱
-if allowed_origins_str:
-    allowed_origins_set.update([
-        origin.strip() 
-        for origin in allowed_origins_str.split(",") 
-        if origin.strip()
-    ])
-
-# 프로덕션 환경에서는 "*" 사용 금지
-if settings.debug:
-    # 개발 환경: localhost 및 에뮬레이터 IP 허용 (중복 제거를 위해 set 사용)
-    allowed_origins_set.update([
-        "http://localhost:3000",
-        "http://localhost:8080",
-        "http://10.0.2.2:8000",  # Android 에뮬레이터
-        "http://127.0.0.1:8000"
-    ])
-else:
-    # 프로덕션 환경: 환경 변수에 명시된 origin만 허용
-    if not allowed_origins_set:
-        # 프로덕션에서 origin이 설정되지 않으면 경고
-        import warnings
-        warnings.warn(
-            "ALLOWED_ORIGINS not set in production environment. "
-            "This may cause CORS issues. Please set ALLOWED_ORIGINS in .env file."
+def create_app(container: Optional[ServiceContainer] = None) -> FastAPI:
+    """
+    FastAPI 앱 생성
+    
+    Args:
+        container: 사용할 서비스 컨테이너 (테스트에서 대체 구현 주입용).
+            None이면 lifespan 시작 시 실제 서비스로 생성
+    
+    Returns:
+        FastAPI: 앱 인스턴스
+    """
+    
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """Application startup / shutdown"""
+        # 클라이언트는 워커당 한 번만 생성하여 모든 요청이 공유
+        if settings.tracing_enabled:
+            configure_tracing(JsonlSpanExporter(settings.tracing_jsonl_path))
+        if container is not None:
+            services = container
+        elif settings.stand_in_providers:
+            services = ServiceContainer.build(**build_stand_in_services())
+        else:
+            services = ServiceContainer.build()
+        app.state.container = services
+        await services.startup()
+        
+        yield
+        
+        await services.shutdown()
+        shutdown_tracing()
+    
+    app = FastAPI(
+        title=settings.app_name,
+        version=settings.app_version,
+        description="롤플레잉 일본어 회화 학습 앱 백엔드 API",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan
+    )
+    
+    # 정적 파일 서빙 설정 (uploads 디렉토리)
+    uploads_dir = Path(__file__).parent.parent / "uploads"
+    if uploads_dir.exists():
+        app.mount("/uploads", StaticFiles(directory=str(uploads_dir)), name="uploads")
+    
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=_allowed_origins(),
+        allow_credentials=True,
+        allow_methods=["GET", "POST"],  # 필요한 메서드만 허용
+        allow_headers=["*"],
+    )
+    
+    # 업로드 본문 크기 제한 (multipart 파싱 전에 초과 요청 차단)
+    app.add_middleware(
+        UploadSizeLimitMiddleware,
+        max_body_bytes=settings.max_audio_size_mb * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES,
+        path_prefix="/api/interactions"
+    )
+    
+    # 라우터 등록
+    app.include_router(
+        scenarios.router,
+        prefix="/api/scenarios",
+        tags=["scenarios"]
+    )
+    
+    app.include_router(
+        interactions.router,
+        prefix="/api/interactions",
+        tags=["interactions"]
+    )
+    
+    app.include_router(
+        sessions.router,
+        prefix="/api/sessions",
+        tags=["sessions"]
+    )
+    
+    @app.get("/")
+    async def root():
+        """Root endpoint"""
+        return {
+            "message": "J-Scenario API is running",
+            "version": settings.app_version,
+            "docs": "/docs"
+        }
+    
+    @app.get("/health")
+    async def health_check(request: Request):
+        """Health check endpoint"""
+        return {
+            "status": "healthy",
+            "service": settings.app_name,
+            "version": settings.app_version,
+            "executors": executor_stats(),
+            "recognizer_pools": get_container(request).recognizer_pool_stats(),
+            "rate_limits": rate_limiter_stats(),
+            "circuit_breakers": circuit_breaker_stats(),
+            "hedging": hedge_stats(),
+            "sessions": get_container(request).session_manager.stats(),
+            "admission": get_container(request).admission_controller.stats()
+        }
+    
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics(request: Request):
+        """Prometheus metrics endpoint"""
+        return Response(
+            content=get_container(request).render_metrics(),
+            media_type=METRICS_CONTENT_TYPE
         )
-
-allowed_origins_list = list(allowed_origins_set) if allowed_origins_set else ["http://localhost:3000"]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowed_origins_list,
-    allow_credentials=True,
-    allow_methods=["GET", "POST"],  # 필요한 메서드만 허용
-    allow_headers=["*"],
-)
-
-# 라우터 등록
-app.include_router(
-    scenarios.router,
-    prefix="/api/scenarios",
-    tags=["scenarios"]
-)
-
-app.include_router(
-    interactions.router,
-    prefix="/api/interactions",
-    tags=["interactions"]
-)
-
-
-@app.get("/")
-async def root():
-    """Root endpoint"""
-    return {
-        "message": "J-Scenario API is running",
-        "version": settings.app_version,
-        "docs": "/docs"
-    }
-
-
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "service": settings.app_name,
-        "version": settings.app_version
-    }
-
+    
+    return app
+
+
+def _allowed_origins() -> list[str]:
+    """
+    CORS 허용 origin 목록
+    
+    환경 변수로 허용된 origin 목록 관리
+    .env 파일에 ALLOWED_ORIGINS="http://localhost:3000,https://yourdomain.com" 형식으로 설정
+    """
+    allowed_origins_set = set()
+    
+    # 환경 변수에서 origin 목록 파싱
+    if settings.allowed_origins:
+        allowed_origins_set.update([
+            origin.strip() 
+            for origin in settings.allowed_origins.split(",") 
+            if origin.strip()
+        ])
+    
+    # 프로덕션 환경에서는 "*" 사용 금지
+    if settings.debug:
+        # 개발 환경: localhost 및 에뮬레이터 IP 허용 (중복 제거를 위해 set 사용)
+        allowed_origins_set.update([
+            "http://localhost:3000",
+            "http://localhost:8080",
+            "http://10.0.2.2:8000",  # Android 에뮬레이터
+            "http://127.0.0.1:8000"
+        ])
+    else:
+        # 프로덕션 환경: 환경 변수에 명시된 origin만 허용
+        if not allowed_origins_set:
+            # 프로덕션에서 origin이 설정되지 않으면 경고
+            import warnings
+            warnings.warn(
+                "ALLOWED_ORIGINS not set in production environment. "
+                "This may cause CORS issues. Please set ALLOWED_ORIGINS in .env file."
+            )
+    
+    return list(allowed_origins_set) if allowed_origins_set else ["http://localhost:3000"]
+
+
+app = create_app()
@@ -60,6 +60,7 @@ class InteractionResponse(BaseModel):
     ai_response_text: str = Field(..., description="AI 캐릭터의 응답 대사")
     ai_response_audio_url: Optional[str] = Field(None, description="AI 응답 음성 URL")
     exp_earned: int = Field(default=0, description="획득한 경험치")
+    audio_trimmed_ms: int = Field(default=0, description="VAD로 잘라낸 앞뒤 무음 길이 (ms)")
     timestamp: datetime = Field(default_factory=datetime.now, description="처리 시각")
     success: bool = True
     message: str = "평가가 완료되었습니다"
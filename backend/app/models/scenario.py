@@ -24,6 +24,7 @@ class Scenario(BaseModel):
     description: str = Field(..., description="시나리오 설명")
     mission: str = Field(..., description="사용자에게 주어진 미션")
     image_url: str = Field(..., description="시나리오 이미지 URL")
+    character_line: Optional[str] = Field(None, description="캐릭터 첫 대사 (일본어, 챕터 시작 시 재생)")
     character_audio_url: Optional[str] = Field(None, description="캐릭터 음성 URL")
     difficulty_level: int = Field(..., ge=1, le=5, description="난이도 (1-5)")
     expected_keywords: list[str] = Field(default_factory=list, description="기대되는 키워드")
@@ -37,6 +38,7 @@ class Scenario(BaseModel):
                 "description": "당신은 지갑을 잃어버렸습니다. 경찰서에서 분실 신고를 해야 합니다.",
                 "mission": "경찰관에게 지갑을 잃어버린 경위와 지갑의 특징을 설명하세요.",
                 "image_url": "https://example.com/images/lost_wallet.jpg",
+                "character_line": "どうされましたか。",
                 "character_audio_url": "https://example.com/audio/police_greeting.mp3",
                 "difficulty_level": 3,
                 "expected_keywords": ["財布", "なくしました", "警察", "届け出"]
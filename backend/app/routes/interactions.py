@@ -1,27 +1,50 @@
 """
 Interactions API routes
 """
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, status
+import json
+from typing import Any, AsyncIterator, Callable, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, File, Form, status
+from fastapi.responses import StreamingResponse
+from starlette.requests import HTTPConnection
+from starlette.types import Receive, Scope, Send
+from app.container import get_admission_controller, get_interaction_service
 from app.models.interaction import InteractionRequest, InteractionResponse
 from app.services.interaction_service import InteractionService
-from app.utils.exceptions import ServiceUnavailableError, ServiceExecutionError, ServiceError
-from app.utils.validators import validate_scenario_id, validate_audio_file, sanitize_user_id
+from app.utils.admission import AdmissionController
+from app.utils.exceptions import (
+    CircuitOpenError,
+    ServiceUnavailableError,
+    ServiceExecutionError,
+    ServiceError,
+    ServiceOverloadedError,
+)
+from app.utils.metrics import record_service_error
+from app.utils.pipeline import PipelineRun
+from app.utils.tracing import tracer
+from app.utils.upload import AudioUpload, read_audio_upload
+from app.utils.validators import validate_scenario_id, sanitize_user_id
 from app.config import get_settings
 
 router = APIRouter()
-interaction_service = InteractionService()
 settings = get_settings()
 
 
 @router.post("", response_model=InteractionResponse)
 async def process_interaction(
+    request: Request,
+    response: Response,
     scenario_id: str = Form(...),
     user_id: str = Form(None),
-    audio_file: UploadFile = File(...)
+    audio_file: UploadFile = File(...),
+    interaction_service: InteractionService = Depends(get_interaction_service),
+    admission: AdmissionController = Depends(get_admission_controller)
 ):
     """
     사용자 발화 처리 및 평가
     
+    응답의 Server-Timing 헤더에 파이프라인 스테이지별 소요 시간을 담습니다 (부하 테스트/브라우저 개발자 도구용).
+    동시 처리 한도를 넘으면 사용자별 대기열에서 기다리며, 기한 안에 차례가 오지 않으면 503 + Retry-After를 반환합니다.
+    
     Args:
         scenario_id: 시나리오 ID
         user_id: 사용자 ID (선택)
@@ -31,55 +54,196 @@ async def process_interaction(
         InteractionResponse: 평가 결과 및 AI 응답
     """
     try:
-        # 입력 검증
-        validate_scenario_id(scenario_id)
-        sanitized_user_id = sanitize_user_id(user_id)
-        
-        # 파일 읽기
-        contents = await audio_file.read()
+        with tracer.span("request", route="/api/interactions"):
+            # 입력 검증
+            validate_scenario_id(scenario_id)
+            sanitized_user_id = sanitize_user_id(user_id)
+            
+            # 파일 읽기 및 검증 (청크 단위로 읽으며 크기/형식 초과 시 즉시 중단)
+            upload = await _traced_upload(audio_file)
+            
+            # 처리 (업로드를 다 받은 뒤 입장시켜 느린 업로드가 슬롯을 점유하지 않도록 함)
+            async with admission.admit(admission_key(request, sanitized_user_id)):
+                result = await interaction_service.process_audio_interaction(
+                    scenario_id=scenario_id,
+                    user_id=sanitized_user_id,
+                    audio_data=upload.data,
+                    filename=upload.filename,
+                    on_pipeline_complete=lambda run: _set_server_timing(response, run)
+                )
+            
+            return result
         
-        # 파일 검증 (크기, 타입, 확장자)
-        validate_audio_file(
-            filename=audio_file.filename,
-            content_type=audio_file.content_type,
-            file_size=len(contents),
-            max_size_mb=settings.max_audio_size_mb
+    except ServiceError as e:
+        raise to_http_exception(e)
+    except HTTPException:
+        raise
+    except Exception as e:
+        # 예상치 못한 에러
+        raise HTTPException(
+            status_code=500,
+            detail=f"인터랙션 처리 중 예상치 못한 오류가 발생했습니다: {str(e)}"
         )
+
+
+@router.post("/stream")
+async def stream_interaction(
+    request: Request,
+    scenario_id: str = Form(...),
+    user_id: str = Form(None),
+    audio_file: UploadFile = File(...),
+    interaction_service: InteractionService = Depends(get_interaction_service),
+    admission: AdmissionController = Depends(get_admission_controller)
+):
+    """
+    사용자 발화 처리 및 평가 (Server-Sent Events 스트리밍)
+    
+    각 단계 결과가 준비되는 즉시 SSE 이벤트로 전송합니다.
+    이벤트 순서: started → transcription → correction →
+    pronunciation / evaluation / reply → audio (완료 순서대로) → complete
+    실패 시 error 이벤트 (status_code, detail) 후 스트림이 종료됩니다.
+    입장 제어 거절(503 + Retry-After)은 스트림 시작 전에 일반 HTTP 에러로 반환됩니다.
+    
+    Args:
+        scenario_id: 시나리오 ID
+        user_id: 사용자 ID (선택)
+        audio_file: 음성 파일 (WAV, MP3 등)
         
-        # 처리
-        result = await interaction_service.process_audio_interaction(
-            scenario_id=scenario_id,
-            user_id=sanitized_user_id,
-            audio_data=contents,
-            filename=audio_file.filename or "audio.wav"
+    Returns:
+        StreamingResponse: text/event-stream
+    """
+    # 요청 span은 스트림 전송이 끝날 때 종료
+    request_span = tracer.start_span("request", route="/api/interactions/stream")
+    try:
+        with tracer.use_span(request_span):
+            # 입력 검증은 스트림 시작 전에 일반 HTTP 에러로 처리
+            validate_scenario_id(scenario_id)
+            sanitized_user_id = sanitize_user_id(user_id)
+            
+            upload = await _traced_upload(audio_file)
+            # 슬롯은 스트림 전송이 끝날 때 반납
+            ticket = await admission.acquire(admission_key(request, sanitized_user_id))
+    except ServiceOverloadedError as e:
+        tracer.end_span(request_span)
+        raise to_http_exception(e)
+    except BaseException:
+        tracer.end_span(request_span)
+        raise
+    
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            with tracer.use_span(request_span, end_on_exit=True):
+                async for event, payload in interaction_service.stream_audio_interaction(
+                    scenario_id=scenario_id,
+                    user_id=sanitized_user_id,
+                    audio_data=upload.data,
+                    filename=upload.filename
+                ):
+                    yield _format_sse(event, payload)
+        except ServiceError as e:
+            http_error = to_http_exception(e)
+            yield _format_sse("error", {
+                "status_code": http_error.status_code,
+                "detail": http_error.detail
+            })
+        except Exception as e:
+            yield _format_sse("error", {
+                "status_code": 500,
+                "detail": f"인터랙션 처리 중 예상치 못한 오류가 발생했습니다: {str(e)}"
+            })
+    
+    def close() -> None:
+        ticket.release()
+        tracer.end_span(request_span)
+    
+    # 제너레이터가 한 번도 실행되지 않고 끝나는 경우(전송 시작 전 연결 끊김 등)에도 슬롯 반납
+    return _ClosingStreamingResponse(
+        event_stream(),
+        on_close=close,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # 프록시 버퍼링 방지
+        }
+    )
+
+
+class _ClosingStreamingResponse(StreamingResponse):
+    """
+    전송이 어떻게 끝나든 on_close를 호출하는 StreamingResponse
+
+    제너레이터의 finally는 제너레이터가 한 번이라도 실행되어야 동작하고, background 태스크는
+    전송 중 연결이 끊겨 예외가 나면 실행되지 않으므로 응답 호출 자체를 try/finally로 감쌉니다.
+    """
+    
+    def __init__(self, content: Any, on_close: Callable[[], None], **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self._on_close = on_close
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._on_close()
+
+
+async def _traced_upload(audio_file: UploadFile) -> AudioUpload:
+    """업로드 수신 (upload span 기록)"""
+    with tracer.span("upload") as span:
+        upload = await read_audio_upload(audio_file, max_size_mb=settings.max_audio_size_mb)
+        span.set_attributes(size_bytes=upload.size, detected_format=upload.detected_format)
+        return upload
+
+
+def admission_key(connection: HTTPConnection, user_id: Optional[str]) -> str:
+    """공정 대기열 키 (사용자 ID가 없으면 클라이언트 주소, REST 요청과 WebSocket 세션 공용)"""
+    if user_id:
+        return f"user:{user_id}"
+    return f"client:{connection.client.host}" if connection.client else "anonymous"
+
+
+def _set_server_timing(response: Response, run: PipelineRun) -> None:
+    """파이프라인 스테이지별 소요 시간을 Server-Timing 헤더로 노출"""
+    response.headers["Server-Timing"] = run.server_timing()
+
+
+def _format_sse(event: str, payload: dict) -> str:
+    """SSE 이벤트 문자열 포맷"""
+    data = json.dumps(payload, ensure_ascii=False)
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def to_http_exception(e: ServiceError) -> HTTPException:
+    """서비스 에러를 HTTP 에러로 변환 (클라이언트에 반환되는 에러는 모두 여기를 거치므로 지표도 집계)"""
+    record_service_error(e)
+    if isinstance(e, ServiceOverloadedError):
+        # 동시 처리 한도 초과 (처리 전에 거절, 클라이언트는 Retry-After 후 재시도)
+        return HTTPException(
+            status_code=503,
+            detail=f"요청이 많아 잠시 후 다시 시도해 주세요: {str(e)}",
+            headers={"Retry-After": str(e.retry_after)}
         )
-        
-        return result
-        
-    except ServiceUnavailableError as e:
+    if isinstance(e, CircuitOpenError):
+        # 외부 API 장애로 회로 차단 중 (SDK 타임아웃까지 기다리지 않고 즉시 실패)
+        return HTTPException(
+            status_code=503,
+            detail=f"외부 서비스 장애로 잠시 후 다시 시도해 주세요: {str(e)}",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    if isinstance(e, ServiceUnavailableError):
         # 서비스 사용 불가 (API 키 없음, 초기화 실패 등)
-        raise HTTPException(
+        return HTTPException(
             status_code=503,  # Service Unavailable
             detail=f"서비스를 사용할 수 없습니다: {str(e)}"
         )
-    except ServiceExecutionError as e:
+    if isinstance(e, ServiceExecutionError):
         # 서비스 실행 중 에러
-        raise HTTPException(
+        return HTTPException(
             status_code=500,
             detail=f"서비스 처리 중 오류가 발생했습니다: {str(e)}"
         )
-    except ServiceError as e:
-        # 기타 서비스 에러
-        raise HTTPException(
-            status_code=500,
-            detail=f"서비스 오류: {str(e)}"
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        # 예상치 못한 에러
-        raise HTTPException(
-            status_code=500,
-            detail=f"인터랙션 처리 중 예상치 못한 오류가 발생했습니다: {str(e)}"
-        )
-
+    # 기타 서비스 에러
+    return HTTPException(
+        status_code=500,
+        detail=f"서비스 오류: {str(e)}"
+    )
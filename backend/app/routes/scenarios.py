@@ -1,16 +1,18 @@
 """
 Scenarios API routes
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from app.container import get_scenario_service
 from app.models.scenario import ScenarioResponse
 from app.services.scenario_service import ScenarioService
 
 router = APIRouter()
-scenario_service = ScenarioService()
 
 
 @router.get("/random", response_model=ScenarioResponse)
-async def get_random_scenario():
+async def get_random_scenario(
+    scenario_service: ScenarioService = Depends(get_scenario_service)
+):
     """
     랜덤 시나리오 조회
     
@@ -32,7 +34,10 @@ async def get_random_scenario():
 
 
 @router.get("/{scenario_id}", response_model=ScenarioResponse)
-async def get_scenario_by_id(scenario_id: str):
+async def get_scenario_by_id(
+    scenario_id: str,
+    scenario_service: ScenarioService = Depends(get_scenario_service)
+):
     """
     특정 시나리오 조회
     
@@ -0,0 +1,301 @@
+"""
+Conversation session WebSocket route
+한 연결에서 여러 턴을 주고받는 실시간 대화 세션
+
+Protocol:
+    client → server
+        {"type": "start", "scenario_id": "scenario_001_1", "user_id": "..."}  세션 시작 / 시나리오(챕터) 변경
+        binary frame                                                          마이크 PCM (16kHz, mono, s16le)
+        {"type": "end_turn"}                                                  발화 종료 → 평가 및 응답
+        {"type": "end"}                                                       세션 종료 (진행 중인 평가 결과를 보낸 뒤)
+    server → client
+        {"type": "session_started", "session_id", "scenario_id"}
+        {"type": "transcription_interim", "transcription"}                    말하는 동안의 중간 인식 결과
+        {"type": "transcription" | "correction" | "pronunciation" | "evaluation" | "reply" | "audio", ...}
+        {"type": "audio_start", "format": "mp3", "size"} → binary frames → {"type": "audio_end"}
+        {"type": "complete", ...InteractionResponse}
+        {"type": "error", "status_code", "detail"}
+
+턴 평가는 백그라운드에서 진행되므로 평가 중에도 다음 발화 프레임, end, 연결 종료를 바로 받습니다.
+평가 결과는 end_turn 순서대로 전송됩니다 (다음 턴 평가는 이전 턴 평가가 끝난 뒤 시작).
+"""
+import asyncio
+import json
+from typing import Any, Callable, Optional
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from app.config import get_settings
+from app.container import ServiceContainer, get_container
+from app.routes.interactions import admission_key, to_http_exception
+from app.services.interaction_service import InteractionService
+from app.services.session_service import ConversationSession, SessionManager, TurnRecorder
+from app.utils.admission import AdmissionController
+from app.utils.exceptions import ServiceError
+from app.utils.tracing import tracer
+from app.utils.validators import sanitize_user_id, validate_scenario_id
+
+router = APIRouter()
+settings = get_settings()
+
+# TTS 음성을 나눠 보낼 바이너리 프레임 크기
+AUDIO_CHUNK_BYTES = 16 * 1024
+
+# 송신 큐에 메시지를 넣는 함수 (dict → JSON 텍스트 프레임, bytes → 바이너리 프레임)
+MessageSender = Callable[[Any], None]
+
+
+@router.websocket("/ws")
+async def conversation_session(
+    websocket: WebSocket,
+    container: ServiceContainer = Depends(get_container)
+):
+    """
+    멀티 턴 시나리오 대화 세션
+
+    시나리오 문맥과 이전 대화 턴은 서버에 보관되어 매 턴 다시 보낼 필요가 없고,
+    마이크 프레임은 도착하는 즉시 스트리밍 STT로 전달됩니다.
+    """
+    interaction_service = container.interaction_service
+    session_manager = container.session_manager
+    admission = container.admission_controller
+    await websocket.accept()
+
+    # 모든 송신은 하나의 writer 태스크에서 순서대로 처리 (콜백에서 동시에 send하지 않도록)
+    outbox: asyncio.Queue[Optional[Any]] = asyncio.Queue()
+    writer_task = asyncio.create_task(_write_messages(websocket, outbox))
+
+    def send(message: Any) -> None:
+        outbox.put_nowait(message)
+
+    session: Optional[ConversationSession] = None
+    turn: Optional[TurnRecorder] = None
+    # 거절된 턴 (동시 턴 수 초과, 크기 초과: end_turn까지 같은 발화의 프레임을 버림)
+    turn_rejected = False
+    # 마지막으로 시작한 턴 평가 태스크
+    evaluation: Optional[asyncio.Task] = None
+
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    websocket.receive(),
+                    timeout=settings.session_idle_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                send(_error_message(408, "세션 유휴 시간이 초과되었습니다"))
+                break
+            if message["type"] == "websocket.disconnect":
+                break
+
+            # 마이크 프레임
+            frame = message.get("bytes")
+            if frame is not None:
+                if session is None:
+                    send(_error_message(400, "start 메시지로 세션을 먼저 시작해야 합니다"))
+                    continue
+                if turn_rejected:
+                    continue
+                if turn is None:
+                    try:
+                        turn = session_manager.start_turn(
+                            interaction_service.stt_service,
+                            max_bytes=settings.max_audio_size_mb * 1024 * 1024,
+                            on_interim=lambda text: send({"type": "transcription_interim", "transcription": text})
+                        )
+                    except ServiceError as e:
+                        turn_rejected = True
+                        http_error = to_http_exception(e)
+                        send(_error_message(http_error.status_code, http_error.detail))
+                        continue
+                try:
+                    turn.feed(frame)
+                except ValueError:
+                    await turn.cancel()
+                    turn = None
+                    # 남은 프레임으로 새 턴을 시작해 발화의 뒷부분만 평가하지 않도록 end_turn까지 버림
+                    turn_rejected = True
+                    send(_error_message(413, f"한 턴의 음성이 {settings.max_audio_size_mb}MB를 초과했습니다"))
+                continue
+
+            # 제어 메시지
+            try:
+                control = json.loads(message.get("text") or "")
+            except json.JSONDecodeError:
+                send(_error_message(400, "잘못된 JSON 메시지입니다"))
+                continue
+            message_type = control.get("type") if isinstance(control, dict) else None
+
+            if message_type == "start":
+                try:
+                    session = await _start_or_switch(interaction_service, session_manager, session, control)
+                except HTTPException as e:
+                    send(_error_message(e.status_code, e.detail))
+                    continue
+                except ServiceError as e:
+                    http_error = to_http_exception(e)
+                    send(_error_message(http_error.status_code, http_error.detail))
+                    continue
+                send({
+                    "type": "session_started",
+                    "session_id": session.session_id,
+                    "scenario_id": session.scenario_id
+                })
+            elif message_type == "end_turn":
+                if turn_rejected:
+                    # 거절 에러는 이미 전송함
+                    turn_rejected = False
+                    continue
+                if session is None or turn is None:
+                    send(_error_message(400, "평가할 음성이 없습니다"))
+                    continue
+                current_turn, turn = turn, None
+                evaluation = asyncio.create_task(_run_turn(
+                    interaction_service,
+                    admission,
+                    admission_key(websocket, session.user_id),
+                    session,
+                    current_turn,
+                    send,
+                    previous=evaluation
+                ))
+            elif message_type == "end":
+                if evaluation is not None:
+                    await asyncio.gather(evaluation, return_exceptions=True)
+                break
+            else:
+                send(_error_message(400, f"알 수 없는 메시지 타입입니다: {message_type}"))
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if evaluation is not None and not evaluation.done():
+            # 연결이 끊기거나 유휴 시간 초과 → 진행 중인 평가 중단
+            evaluation.cancel()
+            await asyncio.gather(evaluation, return_exceptions=True)
+        if turn is not None:
+            await turn.cancel()
+        if session is not None:
+            session_manager.close(session.session_id)
+        outbox.put_nowait(None)
+        await asyncio.gather(writer_task, return_exceptions=True)
+        try:
+            await websocket.close()
+        except RuntimeError:
+            # 이미 닫힌 연결
+            pass
+
+
+async def _start_or_switch(
+    interaction_service: InteractionService,
+    session_manager: SessionManager,
+    session: Optional[ConversationSession],
+    control: dict
+) -> ConversationSession:
+    """start 메시지 처리 (새 세션 생성 또는 시나리오 변경)"""
+    scenario_id = control.get("scenario_id") or ""
+    validate_scenario_id(scenario_id)
+    scenario_context = await interaction_service.text_correction_service.get_scenario_context(scenario_id)
+
+    if session is None:
+        return session_manager.open(
+            scenario_id=scenario_id,
+            scenario_context=scenario_context,
+            user_id=sanitize_user_id(control.get("user_id"))
+        )
+    session.switch_scenario(scenario_id, scenario_context)
+    return session
+
+
+async def _run_turn(
+    interaction_service: InteractionService,
+    admission: AdmissionController,
+    key: str,
+    session: ConversationSession,
+    turn: TurnRecorder,
+    send: MessageSender,
+    previous: Optional[asyncio.Task] = None
+) -> None:
+    """
+    한 턴 평가: 스트리밍 STT 결과를 받아 나머지 파이프라인 실행 후 결과와 TTS 음성 전송
+
+    나머지 파이프라인은 /api/interactions와 같은 동시 처리 제한(사용자별 공정 대기열)을 거칩니다.
+
+    Args:
+        previous: 이전 턴 평가 태스크 (끝난 뒤 시작하여 결과 전송 순서와 대화 기록 순서를 유지)
+    """
+    if previous is not None:
+        await asyncio.gather(previous, return_exceptions=True)
+    try:
+        with tracer.span("session_turn", session_id=session.session_id, turn=session.turn_count + 1):
+            # 스트리밍 STT는 사용자가 말하는 동안 진행되었으므로 남은 대기 시간만 기록
+            with tracer.span("stt_finish"):
+                transcript, canonical = await turn.finish()
+            send({"type": "transcription", "transcription": transcript})
+
+            reply_text = ""
+            async with admission.admit(key):
+                async for event, payload in interaction_service.stream_audio_interaction(
+                    scenario_id=session.scenario_id,
+                    audio_data=b"",
+                    filename=f"{session.session_id}_turn{session.turn_count + 1}.pcm",
+                    user_id=session.user_id,
+                    initial={
+                        "context": session.scenario_context,
+                        "ingest": canonical,
+                        "stt": transcript,
+                    },
+                    history=list(session.history)
+                ):
+                    if event == "started":
+                        continue
+                    send({"type": event, **payload})
+                    if event == "reply":
+                        reply_text = payload["ai_response_text"]
+                    elif event == "audio" and payload["ai_response_audio_url"]:
+                        await _send_tts_audio(interaction_service, reply_text, send)
+                    elif event == "complete":
+                        session.record_turn(
+                            payload["evaluation"]["corrected_text"] or transcript,
+                            payload["ai_response_text"],
+                            max_turns=settings.session_max_history_turns
+                        )
+
+    except ServiceError as e:
+        http_error = to_http_exception(e)
+        send(_error_message(http_error.status_code, http_error.detail))
+    except Exception as e:
+        send(_error_message(500, f"턴 처리 중 예상치 못한 오류가 발생했습니다: {str(e)}"))
+
+
+async def _send_tts_audio(
+    interaction_service: InteractionService,
+    reply_text: str,
+    send: MessageSender
+) -> None:
+    """합성된 응답 음성을 바이너리 프레임으로 분할 전송"""
+    path = interaction_service.tts_service.cached_audio_path(reply_text)
+    if path is None:
+        return
+    audio = await asyncio.to_thread(path.read_bytes)
+    send({"type": "audio_start", "format": "mp3", "size": len(audio)})
+    for offset in range(0, len(audio), AUDIO_CHUNK_BYTES):
+        send(audio[offset:offset + AUDIO_CHUNK_BYTES])
+    send({"type": "audio_end"})
+
+
+async def _write_messages(websocket: WebSocket, outbox: asyncio.Queue) -> None:
+    """outbox의 메시지를 순서대로 전송 (dict → JSON, bytes → 바이너리 프레임, None → 종료)"""
+    while True:
+        message = await outbox.get()
+        if message is None:
+            return
+        try:
+            if isinstance(message, bytes):
+                await websocket.send_bytes(message)
+            else:
+                await websocket.send_text(json.dumps(message, ensure_ascii=False))
+        except (WebSocketDisconnect, RuntimeError):
+            return
+
+
+def _error_message(status_code: int, detail: str) -> dict:
+    return {"type": "error", "status_code": status_code, "detail": detail}
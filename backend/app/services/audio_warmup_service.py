@@ -0,0 +1,82 @@
+"""
+Scenario audio warmup service
+시나리오의 고정 대사를 미리 TTS로 합성해 두어 첫 사용자가 합성 비용을 내지 않도록 함
+"""
+import asyncio
+from dataclasses import dataclass, field
+from loguru import logger
+from app.models.scenario import Scenario
+from app.services.tts_service import TTSService
+
+
+@dataclass
+class WarmupResult:
+    """사전 합성 결과"""
+    total: int = 0
+    synthesized: int = 0
+    skipped: int = 0
+    failed: int = 0
+    # 시나리오 ID → 합성된 음성 URL (character_audio_url이 비어 있던 시나리오만)
+    audio_urls: dict[str, str] = field(default_factory=dict)
+
+
+class AudioWarmupService:
+    """시나리오 고정 대사 사전 합성 서비스"""
+
+    def __init__(self, tts_service: TTSService, concurrency: int = 4):
+        """
+        Args:
+            tts_service: 합성 및 캐시를 담당하는 TTS 서비스
+            concurrency: 동시 합성 요청 수 상한
+        """
+        self.tts_service = tts_service
+        self.concurrency = max(1, concurrency)
+
+    async def warmup(self, scenarios: list[Scenario]) -> WarmupResult:
+        """
+        모든 시나리오의 캐릭터 대사를 합성하여 uploads/audio/cache에 저장
+
+        이미 캐시된 대사(콘텐츠 해시 기준)는 건너뛰므로 여러 번 실행해도 안전합니다.
+        시나리오 객체는 수정하지 않으며, character_audio_url이 비어 있는 시나리오의 URL은
+        결과의 audio_urls로 돌려줍니다 (해당 캐시 파일은 eviction되지 않도록 고정).
+
+        Args:
+            scenarios: 대상 시나리오 목록
+
+        Returns:
+            WarmupResult: 건수와 시나리오별 음성 URL
+        """
+        result = WarmupResult()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        cache = self.tts_service.cache
+
+        async def warm_scenario(scenario: Scenario) -> None:
+            text = (scenario.character_line or "").strip()
+            if not text:
+                return
+            result.total += 1
+
+            key = self.tts_service.cache_key(text)
+            if cache.contains(key):
+                result.skipped += 1
+                url = cache.url_for(key)
+            else:
+                async with semaphore:
+                    synthesized_url = await self.tts_service.synthesize_speech(text=text)
+                if synthesized_url is None:
+                    result.failed += 1
+                    return
+                result.synthesized += 1
+                url = synthesized_url
+
+            if not scenario.character_audio_url:
+                cache.pin(key)
+                result.audio_urls[scenario.id] = url
+
+        await asyncio.gather(*(warm_scenario(scenario) for scenario in scenarios))
+
+        logger.info(
+            "Audio warmup completed: total={}, synthesized={}, skipped={}, failed={}",
+            result.total, result.synthesized, result.skipped, result.failed
+        )
+        return result
@@ -2,18 +2,55 @@
 Azure Speech Service for pronunciation assessment
 보정된 텍스트를 Reference로 사용하여 발음 정확도를 평가
 """
-import os
 import asyncio
-import io
-import subprocess
-import tempfile
+import json
+import threading
 from typing import Optional, Dict, Any
+from loguru import logger
 from app.config import get_settings
-from app.utils.exceptions import ServiceUnavailableError, ServiceExecutionError
+from app.services.azure_recognizer_pool import AzureRecognizerPool
+from app.utils.audio import CanonicalAudio, ingest_audio, parse_wav_header
+from app.utils.exceptions import (
+    NoSpeechDetectedError,
+    ServiceExecutionError,
+    ServiceOverloadedError,
+    ServiceUnavailableError,
+)
+from app.utils.executors import get_executor
+from app.utils.logger import log_payload
+from app.utils.circuit_breaker import get_circuit_breaker
+from app.utils.metrics import track_provider_call
+from app.utils.rate_limit import get_rate_limiter
 
 settings = get_settings()
 
 
+def parse_word_scores(result_json: Optional[str]) -> list[Dict[str, Any]]:
+    """
+    Azure 인식 결과 JSON(result.json)에서 최상위 후보의 단어별 발음 점수 추출
+    
+    Args:
+        result_json: SpeechRecognitionResult.json 문자열 (없으면 빈 목록)
+        
+    Returns:
+        list: [{"word": "財布", "accuracy_score": 92.0, "error_type": "None"}, ...]
+    """
+    if not result_json:
+        return []
+    n_best = json.loads(result_json).get("NBest")
+    if not n_best:
+        return []
+    word_scores = []
+    for w in n_best[0].get("Words", []):
+        assessment = w.get("PronunciationAssessment", {})
+        word_scores.append({
+            "word": w.get("Word", ""),
+            "accuracy_score": assessment.get("AccuracyScore", 0),
+            "error_type": assessment.get("ErrorType", "None")
+        })
+    return word_scores
+
+
 class AzurePronunciationService:
     """Azure Speech 발음 평가 서비스"""
     
@@ -23,6 +60,11 @@ class AzurePronunciationService:
         self.speech_region = settings.azure_speech_region
         self.speech_sdk = None
         self._initialized = False
+        # (리전, 언어) → 사전 연결 recognizer 풀
+        self._pools: Dict[tuple[str, str], AzureRecognizerPool] = {}
+        # _get_pool은 워커 스레드에서도 호출되므로 동시 첫 요청이 풀을 중복 생성하지 않도록 보호
+        self._pools_lock = threading.Lock()
+        self._maintenance_task: Optional[asyncio.Task] = None
     
     def _ensure_sdk_initialized(self):
         """Ensure Azure Speech SDK is initialized"""
@@ -32,31 +74,99 @@ class AzurePronunciationService:
         self._initialized = True
         
         if not self.speech_key or not self.speech_region:
-            print("Warning: Azure Speech credentials not configured")
-            print(f"  speech_key exists: {bool(self.speech_key)}")
-            print(f"  speech_region: {self.speech_region}")
+            logger.warning(
+                "Azure Speech credentials not configured (speech_key exists: {}, speech_region: {})",
+                bool(self.speech_key), self.speech_region
+            )
             self.speech_sdk = None
             return
         
         try:
             import azure.cognitiveservices.speech as speechsdk
             self.speech_sdk = speechsdk
-            print(f"Azure Speech SDK initialized (region: {self.speech_region})")
+            logger.info("Azure Speech SDK initialized (region: {})", self.speech_region)
         except ImportError:
-            print("Warning: azure-cognitiveservices-speech not installed")
-            print("  Run: pip install azure-cognitiveservices-speech")
+            logger.warning("azure-cognitiveservices-speech not installed (pip install azure-cognitiveservices-speech)")
             self.speech_sdk = None
         except Exception as e:
-            print(f"Warning: Azure Speech SDK initialization failed: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.opt(exception=e).warning("Azure Speech SDK initialization failed: {}", e)
             self.speech_sdk = None
     
+    def _get_pool(self, language: str) -> Optional[AzureRecognizerPool]:
+        """리전/언어별 recognizer 풀 조회 (없으면 생성, 풀 크기 0이면 None, 스레드 안전)"""
+        if self.speech_sdk is None or settings.azure_pool_size <= 0:
+            return None
+        key = (self.speech_region, language)
+        pool = self._pools.get(key)
+        if pool is not None:
+            return pool
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = AzureRecognizerPool(
+                    speechsdk=self.speech_sdk,
+                    speech_key=self.speech_key,
+                    region=self.speech_region,
+                    language=language,
+                    size=settings.azure_pool_size,
+                    max_idle_seconds=settings.azure_pool_max_idle_seconds
+                )
+                self._pools[key] = pool
+        return pool
+    
+    def start_pool(self, language: str = "ja-JP") -> None:
+        """
+        서버 시작 시 recognizer 사전 연결 및 주기적 상태 검사 시작
+        
+        연결은 풀 전용 스레드에서 열리므로 이벤트 루프를 막지 않습니다.
+        """
+        self._ensure_sdk_initialized()
+        pool = self._get_pool(language)
+        if pool is None:
+            return
+        pool.schedule_refill()
+        
+        if self._maintenance_task is None:
+            async def maintain() -> None:
+                # 서버가 끊은 유휴 연결을 정리하고 다시 채움
+                interval = max(1.0, settings.azure_pool_max_idle_seconds / 2)
+                while True:
+                    await asyncio.sleep(interval)
+                    for pool in list(self._pools.values()):
+                        pool.schedule_refill()
+            
+            self._maintenance_task = asyncio.create_task(maintain(), name="azure-pool-maintenance")
+        logger.info("Azure recognizer pool started (region: {}, size: {})", self.speech_region, settings.azure_pool_size)
+    
+    async def warmup(self) -> None:
+        """서버 시작 시 SDK 로드 및 recognizer 사전 연결 시작"""
+        self.start_pool()
+    
+    async def close(self) -> None:
+        """풀 연결 종료"""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            await asyncio.gather(self._maintenance_task, return_exceptions=True)
+            self._maintenance_task = None
+        with self._pools_lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.close()
+    
+    def pool_stats(self) -> list[dict]:
+        """recognizer 풀 통계 (/health에 노출)"""
+        with self._pools_lock:
+            pools = list(self._pools.values())
+        return [pool.stats() for pool in pools]
+    
     async def assess_pronunciation(
         self,
         audio_data: bytes,
         reference_text: str,
-        language: str = "ja-JP"
+        language: str = "ja-JP",
+        filename: str = "audio.wav",
+        canonical: Optional[CanonicalAudio] = None
     ) -> Dict[str, Any]:
         """
         보정된 텍스트를 기준으로 발음 평가
@@ -65,6 +175,8 @@ class AzurePronunciationService:
             audio_data: 오디오 바이너리 데이터
             reference_text: 보정된 텍스트 (정답지)
             language: 언어 코드 (기본값: ja-JP)
+            filename: 원본 파일명 (로그용)
+            canonical: 인제스트 단계에서 디코딩된 표준 PCM (있으면 디코딩 생략)
             
         Returns:
             Dict: 발음 평가 결과
@@ -86,115 +198,48 @@ class AzurePronunciationService:
             )
         
         try:
-            # 비동기 실행을 위해 스레드 풀 사용
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self._perform_pronunciation_assessment(
-                    audio_data,
-                    reference_text,
-                    language
-                )
-            )
+            # 파이프라인에서 이미 디코딩했다면 그대로 사용, 아니면 여기서 한 번 디코딩
+            if canonical is None:
+                canonical = await ingest_audio(audio_data)
+            if canonical is not None:
+                pcm_data = canonical.as_bytes()
+            else:
+                logger.warning("Sending undecoded audio to Azure ({})", filename)
+                pcm_data = self._strip_wav_header(audio_data)
+            
+            # Azure 전용 스레드 풀에서 실행 (느린 Azure 호출이 STT 스레드를 점유하지 않도록)
+            async with get_circuit_breaker("azure_speech").guard(), get_rate_limiter("azure_speech").limit():
+                with track_provider_call("azure_speech", "pronunciation_assessment") as call:
+                    result = await get_executor("azure").run(
+                        self._perform_pronunciation_assessment,
+                        pcm_data,
+                        reference_text,
+                        language
+                    )
+                    call.record_bytes(sent=len(pcm_data))
             return result
             
-        except ServiceUnavailableError:
-            # ServiceUnavailableError는 그대로 전파
+        except (ServiceUnavailableError, ServiceOverloadedError):
+            # ServiceUnavailableError, 속도 제한 초과는 그대로 전파
             raise
         except Exception as e:
-            print(f"Azure Pronunciation Assessment Error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.opt(exception=e).error("Azure pronunciation assessment error: {}", e)
             raise ServiceExecutionError(
                 service_name="Azure Pronunciation Assessment",
                 details=str(e)
             ) from e
     
-    def _convert_audio_to_wav(self, audio_data: bytes, filename: str = "audio.amr") -> bytes:
-        """
-        AMR/기타 포맷을 WAV(16kHz, mono, 16-bit PCM)로 변환
-        Azure Speech SDK가 선호하는 포맷
-        ffmpeg을 직접 호출하여 변환 (Python 3.13+ 호환)
-        
-        Args:
-            audio_data: 원본 오디오 데이터
-            filename: 파일명 (확장자로 포맷 감지)
-            
-        Returns:
-            bytes: WAV 포맷 오디오 데이터
-        """
-        try:
-            # 파일 확장자로 포맷 결정
-            file_ext = filename.lower().split('.')[-1]
-            
-            print(f"  Converting {file_ext.upper()} to WAV using ffmpeg...")
-            
-            # 임시 파일 생성
-            with tempfile.NamedTemporaryFile(suffix=f'.{file_ext}', delete=False) as temp_input:
-                temp_input.write(audio_data)
-                temp_input_path = temp_input.name
-            
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_output:
-                temp_output_path = temp_output.name
-            
-            try:
-                # ffmpeg 명령 실행
-                # -ar 16000: 16kHz 샘플링 레이트
-                # -ac 1: 모노 채널
-                # -sample_fmt s16: 16-bit PCM
-                cmd = [
-                    'ffmpeg',
-                    '-i', temp_input_path,  # 입력 파일
-                    '-ar', '16000',          # 샘플링 레이트
-                    '-ac', '1',              # 모노 채널
-                    '-sample_fmt', 's16',    # 16-bit PCM
-                    '-y',                    # 덮어쓰기
-                    temp_output_path         # 출력 파일
-                ]
-                
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if result.returncode != 0:
-                    print(f"  ⚠ ffmpeg error: {result.stderr}")
-                    return audio_data
-                
-                # 변환된 WAV 파일 읽기
-                with open(temp_output_path, 'rb') as f:
-                    wav_data = f.read()
-                
-                print(f"  ✓ Converted: {len(audio_data)} bytes → {len(wav_data)} bytes (WAV 16kHz mono)")
-                
-                return wav_data
-                
-            finally:
-                # 임시 파일 삭제
-                try:
-                    os.unlink(temp_input_path)
-                    os.unlink(temp_output_path)
-                except:
-                    pass
-                    
-        except FileNotFoundError:
-            print("  ⚠ Warning: ffmpeg not found")
-            print("    Install: brew install ffmpeg (macOS)")
-            return audio_data
-        except subprocess.TimeoutExpired:
-            print("  ⚠ Warning: ffmpeg conversion timeout")
-            return audio_data
-        except Exception as e:
-            print(f"  ⚠ Warning: Audio conversion failed: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return audio_data
+    @staticmethod
+    def _strip_wav_header(wav_data: bytes) -> bytes:
+        """PushAudioInputStream은 헤더 없는 PCM을 기대하므로 WAV 헤더 제거"""
+        wav_info = parse_wav_header(wav_data)
+        if wav_info is None:
+            return wav_data
+        return wav_data[wav_info.data_offset:wav_info.data_offset + wav_info.data_size]
     
     def _perform_pronunciation_assessment(
         self,
-        audio_data: bytes,
+        pcm_data: bytes,
         reference_text: str,
         language: str
     ) -> Dict[str, Any]:
@@ -202,7 +247,7 @@ class AzurePronunciationService:
         실제 Azure Speech API 호출 (동기 함수)
         
         Args:
-            audio_data: 오디오 데이터
+            pcm_data: 헤더 없는 PCM 데이터 (16kHz, mono, 16-bit)
             reference_text: 참조 텍스트
             language: 언어 코드
             
@@ -211,79 +256,71 @@ class AzurePronunciationService:
         """
         speechsdk = self.speech_sdk
         
-        # 오디오 데이터 준비
-        # 안드로이드에서 WAV 16kHz mono로 녹음되므로 변환 불필요
-        # 필요 시 AMR → WAV 변환 로직 사용 가능
-        wav_data = audio_data
-        
-        # Speech Config 설정
-        speech_config = speechsdk.SpeechConfig(
-            subscription=self.speech_key,
-            region=self.speech_region
-        )
-        speech_config.speech_recognition_language = language
+        # 미리 연결된 recognizer 사용 (풀 비활성화 시 요청마다 생성)
+        pool = self._get_pool(language)
+        slot = pool.acquire() if pool is not None else None
         
-        # 발음 평가 설정
-        pronunciation_config = speechsdk.PronunciationAssessmentConfig(
-            reference_text=reference_text,
-            grading_system=speechsdk.PronunciationAssessmentGradingSystem.HundredMark,
-            granularity=speechsdk.PronunciationAssessmentGranularity.Phoneme,
-            enable_miscue=True  # 잘못된 발음 감지
-        )
+        # 발음 평가 설정 (실패하면 아직 쓰지 않은 슬롯은 풀에 반환)
+        try:
+            pronunciation_config = speechsdk.PronunciationAssessmentConfig(
+                reference_text=reference_text,
+                grading_system=speechsdk.PronunciationAssessmentGradingSystem.HundredMark,
+                granularity=speechsdk.PronunciationAssessmentGranularity.Phoneme,
+                enable_miscue=True  # 잘못된 발음 감지
+            )
+        except Exception:
+            if pool is not None and slot is not None:
+                pool.release(slot)
+            raise
         
-        # 오디오 스트림 설정 (WAV 포맷, 16kHz, mono)
-        # Azure Speech SDK가 기대하는 포맷 명시
-        audio_format = speechsdk.audio.AudioStreamFormat(
-            samples_per_second=16000,
-            bits_per_sample=16,
-            channels=1
-        )
+        if slot is not None:
+            recognizer = slot.recognizer
+            audio_stream = slot.stream
+        else:
+            # Speech Config 설정
+            speech_config = speechsdk.SpeechConfig(
+                subscription=self.speech_key,
+                region=self.speech_region
+            )
+            speech_config.speech_recognition_language = language
+            
+            # 오디오 스트림 설정 (WAV 포맷, 16kHz, mono)
+            # Azure Speech SDK가 기대하는 포맷 명시
+            audio_format = speechsdk.audio.AudioStreamFormat(
+                samples_per_second=16000,
+                bits_per_sample=16,
+                channels=1
+            )
+            audio_stream = speechsdk.audio.PushAudioInputStream(stream_format=audio_format)
+            audio_config = speechsdk.audio.AudioConfig(stream=audio_stream)
+            
+            # Speech Recognizer 생성
+            recognizer = speechsdk.SpeechRecognizer(
+                speech_config=speech_config,
+                audio_config=audio_config
+            )
         
-        audio_stream = speechsdk.audio.PushAudioInputStream(stream_format=audio_format)
-        audio_stream.write(wav_data)
+        audio_stream.write(pcm_data)
         audio_stream.close()
         
-        audio_config = speechsdk.audio.AudioConfig(stream=audio_stream)
-        
-        # Speech Recognizer 생성
-        recognizer = speechsdk.SpeechRecognizer(
-            speech_config=speech_config,
-            audio_config=audio_config
-        )
-        
         # 발음 평가 적용
         pronunciation_config.apply_to(recognizer)
         
-        # 음성 인식 및 평가 실행
-        result = recognizer.recognize_once()
+        # 음성 인식 및 평가 실행 (슬롯은 단일 사용이므로 끝나면 연결 종료)
+        try:
+            result = recognizer.recognize_once()
+        finally:
+            if slot is not None:
+                slot.close()
         
         # 결과 처리
         if result.reason == speechsdk.ResultReason.RecognizedSpeech:
             pronunciation_result = speechsdk.PronunciationAssessmentResult(result)
             
-            print(f"Azure Pronunciation Assessment:")
-            print(f"  Recognized: {result.text}")
-            print(f"  Reference: {reference_text}")
-            print(f"  Accuracy: {pronunciation_result.accuracy_score}")
-            print(f"  Pronunciation: {pronunciation_result.pronunciation_score}")
-            print(f"  Completeness: {pronunciation_result.completeness_score}")
-            print(f"  Fluency: {pronunciation_result.fluency_score}")
+            log_payload("Azure pronunciation assessment: recognized={!r} reference={!r}", result.text, reference_text)
             
             # 단어별 점수 추출
-            word_scores = []
-            if hasattr(result, 'json') and result.json:
-                import json
-                result_json = json.loads(result.json)
-                if "NBest" in result_json and len(result_json["NBest"]) > 0:
-                    words = result_json["NBest"][0].get("Words", [])
-                    word_scores = [
-                        {
-                            "word": w.get("Word", ""),
-                            "accuracy_score": w.get("PronunciationAssessment", {}).get("AccuracyScore", 0),
-                            "error_type": w.get("PronunciationAssessment", {}).get("ErrorType", "None")
-                        }
-                        for w in words
-                    ]
+            word_scores = parse_word_scores(getattr(result, 'json', None))
             
             return {
                 "accuracy_score": pronunciation_result.accuracy_score,
@@ -295,26 +332,25 @@ class AzurePronunciationService:
             }
         
         elif result.reason == speechsdk.ResultReason.NoMatch:
-            print("Azure: No speech could be recognized")
-            raise ServiceExecutionError(
+            logger.warning("Azure: No speech could be recognized")
+            raise NoSpeechDetectedError(
                 service_name="Azure Pronunciation Assessment",
                 details="No speech could be recognized from the audio"
             )
         
         elif result.reason == speechsdk.ResultReason.Canceled:
             cancellation = result.cancellation_details
-            print(f"Azure: Speech recognition canceled: {cancellation.reason}")
+            logger.warning("Azure: Speech recognition canceled: {} {}", cancellation.reason, cancellation.error_details or "")
             error_details = f"Canceled: {cancellation.reason}"
             if cancellation.reason == speechsdk.CancellationReason.Error:
                 error_details += f", Error: {cancellation.error_details}"
-                print(f"  Error details: {cancellation.error_details}")
             raise ServiceExecutionError(
                 service_name="Azure Pronunciation Assessment",
                 details=error_details
             )
         
         else:
-            print(f"Azure: Unexpected result reason: {result.reason}")
+            logger.warning("Azure: Unexpected result reason: {}", result.reason)
             raise ServiceExecutionError(
                 service_name="Azure Pronunciation Assessment",
                 details=f"Unexpected result reason: {result.reason}"
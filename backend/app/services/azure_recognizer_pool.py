@@ -0,0 +1,213 @@
+"""
+Pre-connected recognizer pool for Azure Speech
+요청 전에 websocket 연결을 미리 열어 둔 SpeechRecognizer를 보관하는 풀
+
+Azure SDK의 SpeechRecognizer는 생성 시 입력 스트림이 고정되고, 스트림을 닫으면(EOS) 재사용할 수 없습니다.
+따라서 풀은 "한 번 쓰고 버리는" 슬롯을 미리 연결해 두고, 꺼내 간 만큼 백그라운드에서 다시 채웁니다.
+오디오를 보내기 전에 요청이 중단되면 슬롯은 release()로 풀에 돌아갑니다.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+from loguru import logger
+
+
+@dataclass
+class RecognizerSlot:
+    """미리 연결된 단일 사용 recognizer"""
+    recognizer: Any
+    stream: Any  # PushAudioInputStream
+    connection: Any
+    # 연결에서 마지막으로 활동이 있었던 시각 (연결 직후 또는 풀에 반환된 시각), 유휴 만료 기준
+    last_used_at: float = field(default_factory=time.monotonic)
+    healthy: bool = True
+    warm: bool = True  # 요청 전에 연결이 열렸는지 여부
+
+    def close(self) -> None:
+        """연결 종료 (사용 후 또는 폐기 시)"""
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+
+
+class AzureRecognizerPool:
+    """리전/언어별 사전 연결 recognizer 풀 (크기 제한, 상태 검사)"""
+
+    def __init__(
+        self,
+        speechsdk: Any,
+        speech_key: str,
+        region: str,
+        language: str,
+        size: int,
+        max_idle_seconds: float
+    ):
+        """
+        Args:
+            speechsdk: azure.cognitiveservices.speech 모듈
+            speech_key: Azure Speech 키
+            region: Azure 리전
+            language: 인식 언어 코드
+            size: 미리 연결해 둘 슬롯 수 상한
+            max_idle_seconds: 마지막 사용 후 이 시간보다 오래 유휴 상태인 슬롯은 서버가 끊었을 수 있으므로 폐기
+        """
+        self.speechsdk = speechsdk
+        self.region = region
+        self.language = language
+        self.size = size
+        self.max_idle_seconds = max_idle_seconds
+
+        # SpeechConfig는 recognizer 간에 공유 가능
+        self.speech_config = speechsdk.SpeechConfig(subscription=speech_key, region=region)
+        self.speech_config.speech_recognition_language = language
+        self.audio_format = speechsdk.audio.AudioStreamFormat(
+            samples_per_second=16000,
+            bits_per_sample=16,
+            channels=1
+        )
+
+        self._slots: deque[RecognizerSlot] = deque()
+        self._lock = threading.Lock()
+        self._refill_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=f"azure-pool-{region}"
+        )
+        self._refilling = False
+        self._closed = False
+
+        self.warm_acquires = 0
+        self.cold_acquires = 0
+        self.discarded = 0
+
+    def _create_slot(self, connect: bool) -> RecognizerSlot:
+        """recognizer 생성 (connect=True면 websocket 연결까지 미리 수행)"""
+        speechsdk = self.speechsdk
+        stream = speechsdk.audio.PushAudioInputStream(stream_format=self.audio_format)
+        audio_config = speechsdk.audio.AudioConfig(stream=stream)
+        recognizer = speechsdk.SpeechRecognizer(
+            speech_config=self.speech_config,
+            audio_config=audio_config
+        )
+        connection = speechsdk.Connection.from_recognizer(recognizer)
+        slot = RecognizerSlot(
+            recognizer=recognizer,
+            stream=stream,
+            connection=connection,
+            warm=connect
+        )
+
+        def on_disconnected(_event: Any) -> None:
+            slot.healthy = False
+
+        connection.disconnected.connect(on_disconnected)
+        if connect:
+            connection.open(False)
+            slot.last_used_at = time.monotonic()
+        return slot
+
+    def _is_usable(self, slot: RecognizerSlot) -> bool:
+        return slot.healthy and time.monotonic() - slot.last_used_at < self.max_idle_seconds
+
+    def acquire(self) -> RecognizerSlot:
+        """
+        사용 가능한 슬롯 반환 (블로킹, 워커 스레드에서 호출)
+
+        미리 연결된 슬롯이 없으면 즉시 새로 생성(cold)하고, 어느 경우든 백그라운드 보충을 예약합니다.
+        """
+        slot = None
+        with self._lock:
+            while self._slots:
+                candidate = self._slots.popleft()
+                if self._is_usable(candidate):
+                    slot = candidate
+                    break
+                self.discarded += 1
+                candidate.close()
+
+        if slot is not None:
+            self.warm_acquires += 1
+        else:
+            self.cold_acquires += 1
+            slot = self._create_slot(connect=False)
+
+        self.schedule_refill()
+        return slot
+
+    def release(self, slot: RecognizerSlot) -> None:
+        """
+        오디오를 쓰기 전에 요청이 중단된 슬롯을 풀에 반환 (스트림을 닫은 슬롯은 재사용할 수 없으므로 close())
+
+        미리 연결된 정상 슬롯만 보관하며, 풀이 가득 찼거나 닫혔으면 연결을 종료합니다.
+        """
+        with self._lock:
+            if slot.warm and slot.healthy and not self._closed and len(self._slots) < self.size:
+                slot.last_used_at = time.monotonic()
+                # 가장 최근에 쓰인 슬롯이므로 먼저 만료될 슬롯들 뒤에 둠
+                self._slots.append(slot)
+                return
+        slot.close()
+
+    def schedule_refill(self) -> None:
+        """풀을 목표 크기까지 백그라운드에서 채움 (시작 시 사전 연결에도 사용)"""
+        with self._lock:
+            if self._refilling or self._closed:
+                return
+            self._refilling = True
+        self._refill_executor.submit(self._refill)
+
+    def _refill(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    # 오래된/끊긴 슬롯 정리 (health check)
+                    usable: deque[RecognizerSlot] = deque()
+                    for slot in self._slots:
+                        if self._is_usable(slot):
+                            usable.append(slot)
+                        else:
+                            self.discarded += 1
+                            slot.close()
+                    self._slots = usable
+                    if self._closed or len(self._slots) >= self.size:
+                        return
+                try:
+                    new_slot = self._create_slot(connect=True)
+                except Exception as e:
+                    logger.warning("Azure recognizer pre-connect failed ({}): {}", self.region, e)
+                    return
+                with self._lock:
+                    if self._closed:
+                        new_slot.close()
+                        return
+                    self._slots.append(new_slot)
+        finally:
+            with self._lock:
+                self._refilling = False
+
+    def close(self) -> None:
+        """모든 슬롯 연결 종료"""
+        with self._lock:
+            self._closed = True
+            slots = list(self._slots)
+            self._slots.clear()
+        for slot in slots:
+            slot.close()
+        self._refill_executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        """풀 통계"""
+        with self._lock:
+            idle = len(self._slots)
+        return {
+            "region": self.region,
+            "language": self.language,
+            "size": self.size,
+            "idle": idle,
+            "warm_acquires": self.warm_acquires,
+            "cold_acquires": self.cold_acquires,
+            "discarded": self.discarded,
+        }
@@ -0,0 +1,148 @@
+"""
+Memoization cache for Gemini text correction
+(시나리오, 프롬프트 템플릿, 정규화된 STT 텍스트) → 보정 결과
+메모리 LRU + TTL, 선택적으로 SQLite에 영속화
+"""
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+
+def normalize_transcript(text: str) -> str:
+    """
+    캐시 키용 STT 텍스트 정규화
+
+    NFKC 정규화(전각/반각 통일) 후 공백과 구두점(。、！？.,!? 등)을 제거합니다.
+    「すみません。」와 「すみません」은 같은 키가 됩니다.
+    """
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    return "".join(
+        ch for ch in normalized
+        if not ch.isspace() and not unicodedata.category(ch).startswith("P")
+    )
+
+
+class CorrectionCache:
+    """텍스트 보정 결과 캐시 (LRU + TTL, 선택적 SQLite 백엔드)"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, db_path: Optional[str] = None):
+        """
+        Args:
+            max_entries: 메모리 캐시 최대 항목 수
+            ttl_seconds: 항목 유효 시간 (초)
+            db_path: SQLite 파일 경로 (없으면 메모리 캐시만 사용)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        # key → (보정 결과, 저장 시각)
+        self._entries: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS corrections ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_corrections_created_at "
+                "ON corrections (created_at)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(scenario_key: str, template_hash: str, raw_text: str) -> str:
+        """캐시 키 생성 (raw_text는 정규화 후 사용)"""
+        material = "\x1f".join([scenario_key, template_hash, normalize_transcript(raw_text)])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        캐시 조회 (메모리 → SQLite 순)
+
+        Returns:
+            Optional[str]: 캐시된 보정 결과 (없거나 만료되면 None)
+        """
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, created_at = entry
+            if now - created_at <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        if self._db is not None:
+            row = await asyncio.to_thread(self._db_get, key)
+            if row is not None and now - row[1] <= self.ttl_seconds:
+                self._remember(key, row[0], row[1])
+                self.hits += 1
+                return row[0]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        """캐시 저장"""
+        created_at = time.time()
+        self._remember(key, value, created_at)
+        if self._db is not None:
+            await asyncio.to_thread(self._db_set, key, value, created_at)
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        """메모리 LRU에 저장하고 초과분 제거"""
+        self._entries[key] = (value, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _db_get(self, key: str) -> Optional[tuple[str, float]]:
+        with self._db_lock:
+            assert self._db is not None
+            cursor = self._db.execute(
+                "SELECT value, created_at FROM corrections WHERE key = ?", (key,)
+            )
+            return cursor.fetchone()
+
+    def _db_set(self, key: str, value: str, created_at: float) -> None:
+        with self._db_lock:
+            assert self._db is not None
+            self._db.execute(
+                "INSERT OR REPLACE INTO corrections (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, created_at)
+            )
+            # 만료된 항목 정리
+            self._db.execute(
+                "DELETE FROM corrections WHERE created_at < ?",
+                (created_at - self.ttl_seconds,)
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        """SQLite 연결 종료"""
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+
+    def stats(self) -> dict:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "persistent": self._db is not None,
+        }
@@ -2,14 +2,23 @@
 Evaluation service using Google Gemini API
 문법 및 표현 피드백 전담 (발음 평가는 Azure에서 처리)
 """
+import asyncio
 import json
 from typing import Optional, Any
 import google.generativeai as genai  # type: ignore
+from loguru import logger
 from app.config import get_settings
-from app.utils.exceptions import ServiceUnavailableError, ServiceExecutionError
+from app.utils.exceptions import ServiceUnavailableError, ServiceExecutionError, ServiceOverloadedError
+from app.utils.logger import log_payload
+from app.utils.circuit_breaker import get_circuit_breaker
+from app.utils.metrics import track_provider_call
+from app.utils.rate_limit import estimate_tokens, get_rate_limiter, usage_tokens
 
 settings = get_settings()
 
+# 이전 대화 턴 (사용자 발화, 캐릭터 응답) 목록 - 세션 모드에서 응답 문맥으로 사용
+ConversationHistory = list[tuple[str, str]]
+
 
 class EvaluationService:
     """문법 및 표현 피드백 생성 서비스"""
@@ -19,21 +28,25 @@ class EvaluationService:
         self.api_key = settings.gemini_api_key
         self.model: Optional[Any] = None  # type: ignore
         
-        print(f"[DEBUG] Gemini API Key present: {bool(self.api_key)}")
+        logger.debug("Gemini API key present: {}", bool(self.api_key))
         
         if self.api_key:
             try:
                 genai.configure(api_key=self.api_key)  # type: ignore
                 self.model = genai.GenerativeModel("gemini-2.0-flash")  # type: ignore
-                print(f"[DEBUG] Gemini model initialized: {self.model}")
-                print("Gemini API initialized for evaluation")
+                logger.info("Gemini API initialized for evaluation")
             except Exception as e:
-                print(f"Warning: Gemini API initialization failed: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.opt(exception=e).warning("Gemini API initialization failed: {}", e)
                 self.model = None
         else:
-            print("[WARNING] No Gemini API key found - using mock responses")
+            logger.warning("No Gemini API key found - using mock responses")
+    
+    async def warmup(self) -> None:
+        """서버 시작 시 Gemini 연결 준비 (과금되지 않는 count_tokens 호출)"""
+        if self.model is None:
+            return
+        await self.model.count_tokens_async("こんにちは")
+        logger.info("Gemini connection warmed up (evaluation)")
     
     async def evaluate_grammar_and_expression(
         self,
@@ -81,105 +94,258 @@ class EvaluationService:
                 max_output_tokens=512,
             )
             
-            response = await model.generate_content_async(
-                prompt,
-                generation_config=generation_config
+            response = await self._generate_content(
+                model, "grammar_evaluation", prompt, generation_config
             )
             
-            # 응답 검증 - 디버깅 로그 추가
-            print(f"[DEBUG] Gemini Response received")
+            response_text = self._extract_response_text(response, "Grammar Evaluation")
+            log_payload("Grammar evaluation response: {}", response_text)
             
-            if not response.candidates or len(response.candidates) == 0:
-                print("Warning: No candidates in Gemini grammar evaluation")
-                raise ServiceExecutionError(
-                    service_name="Grammar Evaluation",
-                    details="Gemini API returned no candidates"
-                )
+            result = self._parse_json_response(response_text)
             
-            candidate = response.candidates[0]
-            print(f"[DEBUG] finish_reason: {candidate.finish_reason} (type: {type(candidate.finish_reason)})")
+            return self._normalize_grammar_result(result)
             
-            # finish_reason 체크 완화 (STOP=1 외에도 다른 정상 완료 값 허용)
-            # Gemini 2.5에서는 finish_reason이 다를 수 있음
-            if hasattr(candidate.finish_reason, 'name'):
-                finish_reason_name = candidate.finish_reason.name
-                print(f"[DEBUG] finish_reason name: {finish_reason_name}")
-                if finish_reason_name not in ['STOP', 'MAX_TOKENS']:
-                    print(f"Warning: Gemini grammar evaluation finish_reason={finish_reason_name}")
-                    raise ServiceExecutionError(
-                        service_name="Grammar Evaluation",
-                        details=f"Gemini API returned unexpected finish_reason: {finish_reason_name}"
-                    )
-            elif candidate.finish_reason not in [1, 2]:  # 1=STOP, 2=MAX_TOKENS
-                print(f"Warning: Gemini grammar evaluation finish_reason={candidate.finish_reason}")
-                raise ServiceExecutionError(
-                    service_name="Grammar Evaluation",
-                    details=f"Gemini API returned unexpected finish_reason: {candidate.finish_reason}"
-                )
-            
-            if not hasattr(response, 'text') or not response.text:
-                print("Warning: No text in Gemini grammar evaluation")
-                print(f"[DEBUG] response attributes: {dir(response)}")
-                raise ServiceExecutionError(
-                    service_name="Grammar Evaluation",
-                    details="Gemini API returned no text in response"
-                )
+        except (ServiceUnavailableError, ServiceExecutionError, ServiceOverloadedError):
+            # 커스텀 예외는 그대로 전파
+            raise
+        except Exception as e:
+            logger.opt(exception=e).error("Grammar evaluation error: {}", e)
+            raise ServiceExecutionError(
+                service_name="Grammar Evaluation",
+                details=str(e)
+            ) from e
+    
+    async def evaluate_and_reply(
+        self,
+        corrected_text: str,
+        scenario_context: str,
+        raw_text: str = "",
+        history: Optional[ConversationHistory] = None
+    ) -> dict:
+        """
+        문법/표현 평가와 AI 캐릭터 응답을 한 번의 Gemini 호출로 생성
+        
+        같은 시나리오 문맥과 보정 텍스트를 두 번 보내지 않도록 구조화된 JSON 출력 하나로 받습니다.
+        응답 JSON 파싱에 실패하거나 ai_response가 없을 때만 기존 2회 호출 경로(evaluate_grammar_and_expression + generate_ai_response)로 대체하고,
+        API 에러/타임아웃/빈 응답은 그대로 전파합니다.
+        
+        Args:
+            corrected_text: 보정된 일본어 텍스트
+            scenario_context: 시나리오 상황
+            raw_text: 원본 STT 텍스트 (교정 전)
+            history: 이전 대화 턴 (응답 생성에만 사용, 선택)
             
-            response_text = response.text.strip()
-            print(f"[DEBUG] Raw response text: {response_text[:200]}...")
+        Returns:
+            dict: evaluate_grammar_and_expression 결과 + "ai_response" (캐릭터 응답 대사)
             
-            # JSON 추출
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
+        Raises:
+            ServiceExecutionError: Gemini 호출 실패 또는 응답에 사용할 후보가 없는 경우
+        """
+        if self.model is None:
+            raise ServiceUnavailableError(
+                service_name="Grammar Evaluation",
+                details="Gemini API key is not configured or model initialization failed"
+            )
+        
+        model = self.model
+        
+        try:
+            prompt = self._create_grammar_evaluation_prompt(
+                corrected_text,
+                scenario_context,
+                raw_text,
+                include_reply=True,
+                history=history
+            )
             
-            result = json.loads(response_text)
+            generation_config = genai.types.GenerationConfig(  # type: ignore
+                temperature=0.3,
+                top_p=0.95,
+                top_k=40,
+                max_output_tokens=640,  # 평가(512) + 응답 1문장
+                response_mime_type="application/json",
+            )
             
-            print(f"Grammar Evaluation Result: {result}")
+            response = await self._generate_content(
+                model, "combined_evaluation", prompt, generation_config
+            )
             
-            return {
-                "grammar_score": result.get("grammar_score", 85),
-                "grammar_feedback": result.get("grammar_feedback", ""),
-                "appropriateness_score": result.get("appropriateness_score", 90),
-                "appropriateness_feedback": result.get("appropriateness_feedback", ""),
-                "better_expressions": result.get("better_expressions", []),
-                "coaching_advice": result.get("coaching_advice", "")
-            }
+            response_text = self._extract_response_text(response, "Combined Evaluation")
             
-        except (ServiceUnavailableError, ServiceExecutionError):
-            # 커스텀 예외는 그대로 전파
+        except (ServiceUnavailableError, ServiceExecutionError, ServiceOverloadedError):
+            # API 장애/속도 제한/빈 응답은 2회 호출로 대체해도 같은 결과이고 할당량만 더 쓰므로 그대로 전파
             raise
         except Exception as e:
-            print(f"Grammar Evaluation Error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.opt(exception=e).error("Combined evaluation error: {}", e)
             raise ServiceExecutionError(
-                service_name="Grammar Evaluation",
+                service_name="Combined Evaluation",
                 details=str(e)
             ) from e
+        
+        try:
+            result = self._parse_json_response(response_text)
+            
+            ai_response = result.get("ai_response")
+            if not isinstance(ai_response, str) or not ai_response.strip():
+                raise ValueError("ai_response is missing in combined evaluation result")
+            
+        except (json.JSONDecodeError, ValueError) as e:
+            # 응답 형식만 어긋난 경우 → 기존 2회 호출 경로로 대체
+            logger.warning("Combined evaluation response unusable, falling back to two calls: {}", e)
+        else:
+            combined_result = self._normalize_grammar_result(result)
+            combined_result["ai_response"] = ai_response.strip()
+            log_payload("Combined evaluation result: {}", combined_result)
+            return combined_result
+        
+        grammar_eval, ai_response = await asyncio.gather(
+            self.evaluate_grammar_and_expression(
+                corrected_text=corrected_text,
+                scenario_context=scenario_context,
+                raw_text=raw_text
+            ),
+            self.generate_ai_response(
+                corrected_text=corrected_text,
+                scenario_context=scenario_context,
+                history=history
+            )
+        )
+        return {**grammar_eval, "ai_response": ai_response}
+    
+    @staticmethod
+    async def _generate_content(
+        model: Any,
+        operation: str,
+        prompt: str,
+        generation_config: Any
+    ) -> Any:
+        """Gemini 호출 (회로 차단기 확인, 공유 속도 제한 대기 후 지연 시간, 프롬프트 크기, 토큰 수 계측)"""
+        max_output_tokens = getattr(generation_config, "max_output_tokens", None) or 0
+        limiter = get_rate_limiter("gemini")
+        async with get_circuit_breaker("gemini").guard(), limiter.limit(tokens=estimate_tokens(prompt, max_output_tokens)) as permit:
+            with track_provider_call("gemini", operation) as call:
+                response = await model.generate_content_async(
+                    prompt,
+                    generation_config=generation_config
+                )
+                call.record_bytes(sent=len(prompt.encode()))
+                call.record_usage(response)
+            permit.settle(usage_tokens(response))
+        return response
+    
+    @staticmethod
+    def _format_history(history: Optional[ConversationHistory]) -> str:
+        """프롬프트에 넣을 이전 대화 블록 (최근 턴이 마지막)"""
+        if not history:
+            return ""
+        lines = []
+        for user_text, reply_text in history:
+            lines.append(f"ユーザー: {user_text}")
+            lines.append(f"あなた: {reply_text}")
+        return "\n**これまでの会話:**\n" + "\n".join(lines) + "\n"
+    
+    def _extract_response_text(self, response: Any, service_name: str) -> str:
+        """
+        Gemini 응답 검증 후 텍스트 추출
+        
+        Raises:
+            ServiceExecutionError: 후보 없음, 비정상 finish_reason, 빈 텍스트
+        """
+        if not response.candidates or len(response.candidates) == 0:
+            logger.warning("No candidates in {}", service_name)
+            raise ServiceExecutionError(
+                service_name=service_name,
+                details="Gemini API returned no candidates"
+            )
+        
+        candidate = response.candidates[0]
+        logger.debug("{} finish_reason: {}", service_name, candidate.finish_reason)
+        
+        # finish_reason 체크 완화 (STOP=1 외에도 다른 정상 완료 값 허용)
+        # Gemini 2.5에서는 finish_reason이 다를 수 있음
+        if hasattr(candidate.finish_reason, 'name'):
+            finish_reason_name = candidate.finish_reason.name
+            if finish_reason_name not in ['STOP', 'MAX_TOKENS']:
+                logger.warning("{} finish_reason={}", service_name, finish_reason_name)
+                raise ServiceExecutionError(
+                    service_name=service_name,
+                    details=f"Gemini API returned unexpected finish_reason: {finish_reason_name}"
+                )
+        elif candidate.finish_reason not in [1, 2]:  # 1=STOP, 2=MAX_TOKENS
+            logger.warning("{} finish_reason={}", service_name, candidate.finish_reason)
+            raise ServiceExecutionError(
+                service_name=service_name,
+                details=f"Gemini API returned unexpected finish_reason: {candidate.finish_reason}"
+            )
+        
+        if not hasattr(response, 'text') or not response.text:
+            logger.warning("No text in {}", service_name)
+            raise ServiceExecutionError(
+                service_name=service_name,
+                details="Gemini API returned no text in response"
+            )
+        
+        return response.text.strip()
+    
+    @staticmethod
+    def _parse_json_response(response_text: str) -> dict:
+        """코드 펜스(```json)를 제거한 뒤 JSON 파싱"""
+        if "```json" in response_text:
+            json_start = response_text.find("```json") + 7
+            json_end = response_text.find("```", json_start)
+            response_text = response_text[json_start:json_end].strip()
+        elif "```" in response_text:
+            json_start = response_text.find("```") + 3
+            json_end = response_text.find("```", json_start)
+            response_text = response_text[json_start:json_end].strip()
+        
+        result = json.loads(response_text)
+        if not isinstance(result, dict):
+            raise ValueError("Gemini response JSON is not an object")
+        return result
+    
+    @staticmethod
+    def _normalize_grammar_result(result: dict) -> dict:
+        """문법 평가 결과에 기본값 적용"""
+        return {
+            "grammar_score": result.get("grammar_score", 85),
+            "grammar_feedback": result.get("grammar_feedback", ""),
+            "appropriateness_score": result.get("appropriateness_score", 90),
+            "appropriateness_feedback": result.get("appropriateness_feedback", ""),
+            "better_expressions": result.get("better_expressions", []),
+            "coaching_advice": result.get("coaching_advice", "")
+        }
     
     def _create_grammar_evaluation_prompt(
         self,
         corrected_text: str,
         scenario_context: str,
-        raw_text: str = ""
+        raw_text: str = "",
+        include_reply: bool = False,
+        history: Optional[ConversationHistory] = None
     ) -> str:
-        """문법 및 표현 평가 프롬프트 생성"""
+        """
+        문법 및 표현 평가 프롬프트 생성
+        
+        include_reply=True이면 캐릭터 응답(ai_response)도 같은 JSON으로 요청합니다.
+        history는 응답 문맥용이므로 include_reply=True일 때만 포함됩니다.
+        """
         raw_text_info = f"""
 **ユーザーの実際の発言（STT原文）:**
 {raw_text}
 """ if raw_text else ""
         
+        reply_item = """5. **キャラクターの応答（必須）**: この状況にいる親切な日本人のキャラクターとして、
+   ユーザーの発言に自然で助けになる日本語で1文だけ応答（説明や引用符は不要）
+""" if include_reply else ""
+        
+        reply_field = ',\n    "ai_response": "キャラクターの応答（日本語1文）"' if include_reply else ""
+        
         return f"""あなたは優しく厳格な日本語コーチです。学習者が成長できるよう、具体的で実践的なアドバイスをしてください。
 
 **状況（シナリオ）:**
 {scenario_context}
-{raw_text_info}
+{self._format_history(history) if include_reply else ""}{raw_text_info}
 **ユーザーの発言（補正済み）:**
 {corrected_text}
 
@@ -188,7 +354,7 @@ class EvaluationService:
 2. 状況への適切性（TPO、0-100点）
 3. より良い表現の提案
 4. **韓国語コーチングアドバイス（必須）**
-
+{reply_item}
 **フィードバック原則:**
 - 80点以下: 具体的な誤りや改善点を明示
 - 81-89点: 改善できる具体的なポイントを提示
@@ -212,7 +378,7 @@ class EvaluationService:
     "appropriateness_score": 点数,
     "appropriateness_feedback": "TPO評価（具体的改善点、30文字以内）",
     "better_expressions": ["より自然な表現1", "より丁寧な表現2"],
-    "coaching_advice": "韓国語で200-300文字の具体的コーチング（必ず上記ルールに従う）"
+    "coaching_advice": "韓国語で200-300文字の具体的コーチング（必ず上記ルールに従う）"{reply_field}
 }}
 
 **重要:** 説明不要。JSON形式のみ出力してください。coaching_adviceは必須です。"""
@@ -235,15 +401,19 @@ class EvaluationService:
         self,
         corrected_text: str,
         scenario_context: str,
-        overall_score: int
+        overall_score: Optional[int] = None,
+        history: Optional[ConversationHistory] = None
     ) -> str:
         """
         AI 캐릭터의 응답 생성
         
+        응답 프롬프트는 점수를 사용하지 않으므로 평가와 병렬로 호출할 수 있습니다.
+        
         Args:
             corrected_text: 보정된 텍스트
             scenario_context: 시나리오 상황
-            overall_score: 전체 점수
+            overall_score: 전체 점수 (선택, 현재 프롬프트에는 미사용)
+            history: 이전 대화 턴 (세션 모드, 선택)
             
         Returns:
             str: AI 캐릭터의 응답 대사
@@ -261,7 +431,7 @@ class EvaluationService:
 
 **状況:**
 {scenario_context}
-
+{self._format_history(history)}
 **ユーザーの発言:**
 {corrected_text}
 
@@ -278,54 +448,17 @@ class EvaluationService:
                 max_output_tokens=100,
             )
             
-            response = await model.generate_content_async(
-                prompt,
-                generation_config=generation_config
+            response = await self._generate_content(
+                model, "reply", prompt, generation_config
             )
             
-            # 응답 검증 - 디버깅 로그 추가
-            print(f"[DEBUG] AI Response - Gemini Response received")
-            
-            if not response.candidates or len(response.candidates) == 0:
-                print("Warning: No candidates in AI response")
-                raise ServiceExecutionError(
-                    service_name="AI Response Generation",
-                    details="Gemini API returned no candidates"
-                )
-            
-            candidate = response.candidates[0]
-            print(f"[DEBUG] AI Response finish_reason: {candidate.finish_reason}")
-            
-            # finish_reason 체크 완화
-            if hasattr(candidate.finish_reason, 'name'):
-                finish_reason_name = candidate.finish_reason.name
-                if finish_reason_name not in ['STOP', 'MAX_TOKENS']:
-                    print(f"Warning: AI response finish_reason={finish_reason_name}")
-                    raise ServiceExecutionError(
-                        service_name="AI Response Generation",
-                        details=f"Gemini API returned unexpected finish_reason: {finish_reason_name}"
-                    )
-            elif candidate.finish_reason not in [1, 2]:
-                print(f"Warning: AI response finish_reason={candidate.finish_reason}")
-                raise ServiceExecutionError(
-                    service_name="AI Response Generation",
-                    details=f"Gemini API returned unexpected finish_reason: {candidate.finish_reason}"
-                )
-            
-            if not hasattr(response, 'text') or not response.text:
-                print("Warning: No text in AI response")
-                raise ServiceExecutionError(
-                    service_name="AI Response Generation",
-                    details="Gemini API returned no text in response"
-                )
-            
-            return response.text.strip()
+            return self._extract_response_text(response, "AI Response Generation")
             
-        except (ServiceUnavailableError, ServiceExecutionError):
+        except (ServiceUnavailableError, ServiceExecutionError, ServiceOverloadedError):
             # 커스텀 예외는 그대로 전파
             raise
         except Exception as e:
-            print(f"AI Response Generation Error: {str(e)}")
+            logger.error("AI response generation error: {}", e)
             raise ServiceExecutionError(
                 service_name="AI Response Generation",
                 details=str(e)
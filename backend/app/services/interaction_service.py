@@ -1,219 +1,567 @@
 """
 Interaction service for processing user audio with advanced pipeline
-Sequential Processing:
+Stage DAG Processing (의존성이 준비되는 즉시 각 스테이지 시작):
+0. Audio Ingest (매직 바이트로 포맷 감지, 표준 PCM으로 한 번만 디코딩 → VAD로 앞뒤 무음 제거)
 1. Google STT (1차 텍스트 변환)
 2. Gemini Text Correction (문맥 기반 보정) ← 핵심!
 3. Azure Pronunciation Assessment (보정된 텍스트 기준 발음 평가)
 4. Gemini Grammar Evaluation (문법/표현 피드백)
-5. Response Generation (TTS)
+5. Response Generation (AI 응답 + TTS)
+
+STT → 보정 이후 3, 4, 5는 모두 corrected_text만 필요하므로 병렬로 실행됩니다.
+전체 지연 시간 ≈ STT + 보정 + max(Azure, 문법 평가, AI 응답 + TTS)
 """
+import asyncio
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Any, AsyncIterator, Callable, Optional
+from loguru import logger
+from app.config import get_settings
 from app.models.interaction import (
     InteractionResponse,
     EvaluationResult,
     FeedbackCategory
 )
-from app.services.stt_service import STTService
+from app.services.stt_service import InterimCallback, STTService
 from app.services.text_correction_service import TextCorrectionService
 from app.services.azure_pronunciation_service import AzurePronunciationService
-from app.services.evaluation_service import EvaluationService
+from app.services.evaluation_service import ConversationHistory, EvaluationService
 from app.services.tts_service import TTSService
+from app.utils.audio import CanonicalAudio, ingest_audio
+from app.utils.executors import get_executor
+from app.utils.logger import interaction_context, log_payload
+from app.utils.metrics import observe_stage_timings, track_interaction
+from app.utils.vad import TrimResult, trim_silence
 from app.utils.exceptions import ServiceError
+from app.utils.pipeline import PipelineRun, Stage, StageGraph
+from app.utils.tracing import current_span, set_span_attributes, tracer
+
+settings = get_settings()
+
+
+# 스트리밍 이벤트로 내보낼 스테이지 → SSE 이벤트 이름
+STREAM_STAGE_EVENTS = {
+    "stt_interim": "transcription_interim",  # 스테이지가 아닌 스트리밍 STT 중간 결과
+    "stt": "transcription",
+    "correction": "correction",
+    "pronunciation": "pronunciation",
+    "grammar": "evaluation",
+    "reply": "reply",
+    "tts": "audio",
+}
 
 
 class InteractionService:
     """사용자 인터랙션 처리 서비스 (Advanced Pipeline)"""
     
-    def __init__(self):
-        """Initialize all services"""
-        self.stt_service = STTService()
-        self.text_correction_service = TextCorrectionService()
-        self.pronunciation_service = AzurePronunciationService()
-        self.evaluation_service = EvaluationService()
-        self.tts_service = TTSService()
+    def __init__(
+        self,
+        stt_service: Optional[STTService] = None,
+        text_correction_service: Optional[TextCorrectionService] = None,
+        pronunciation_service: Optional[AzurePronunciationService] = None,
+        evaluation_service: Optional[EvaluationService] = None,
+        tts_service: Optional[TTSService] = None
+    ):
+        """
+        Initialize all services
+        
+        주입하지 않은 서비스는 새로 생성합니다 (앱에서는 ServiceContainer가 공유 인스턴스를 주입).
+        """
+        self.stt_service = stt_service or STTService()
+        self.text_correction_service = text_correction_service or TextCorrectionService()
+        self.pronunciation_service = pronunciation_service or AzurePronunciationService()
+        self.evaluation_service = evaluation_service or EvaluationService()
+        self.tts_service = tts_service or TTSService()
     
     async def process_audio_interaction(
         self,
         scenario_id: str,
         audio_data: bytes,
         filename: str,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        on_pipeline_complete: Optional[Callable[[PipelineRun], None]] = None
     ) -> InteractionResponse:
         """
-        오디오 인터랙션 처리 (Sequential Pipeline)
+        오디오 인터랙션 처리 (Stage DAG Pipeline)
         
         Args:
             scenario_id: 시나리오 ID
             audio_data: 오디오 바이너리 데이터
             filename: 파일명
             user_id: 사용자 ID (선택)
+            on_pipeline_complete: 파이프라인 완료 시 실행 결과(스테이지 타이밍)를 받을 콜백 (선택)
             
         Returns:
             InteractionResponse: 처리 결과
         """
         interaction_id = f"int_{uuid.uuid4().hex[:12]}"
         
-        print(f"\n{'='*60}")
-        print(f"[Interaction Pipeline Started] ID: {interaction_id}")
-        print(f"  Scenario: {scenario_id}")
-        print(f"  Audio: {filename} ({len(audio_data)} bytes)")
-        print(f"{'='*60}\n")
+        with (
+            interaction_context(interaction_id),
+            track_interaction("rest"),
+            tracer.span("interaction", **self._span_attributes(interaction_id, scenario_id, audio_data, "rest"))
+        ):
+            return await self._process_audio_interaction(
+                interaction_id=interaction_id,
+                scenario_id=scenario_id,
+                audio_data=audio_data,
+                filename=filename,
+                on_pipeline_complete=on_pipeline_complete
+            )
+    
+    async def _process_audio_interaction(
+        self,
+        interaction_id: str,
+        scenario_id: str,
+        audio_data: bytes,
+        filename: str,
+        on_pipeline_complete: Optional[Callable[[PipelineRun], None]] = None
+    ) -> InteractionResponse:
+        logger.info(
+            "Interaction pipeline started: scenario={} audio={} ({} bytes)",
+            scenario_id, filename, len(audio_data)
+        )
         
         try:
-            # ============================================================
-            # Step 1: Google STT (1차 텍스트 변환)
-            # ============================================================
-            print("📝 [Step 1/5] Google STT - 1차 텍스트 변환")
-            raw_text = await self.stt_service.transcribe_audio(audio_data, filename)
-            print(f"  ✓ Raw STT Result: '{raw_text}'\n")
-            
-            # ============================================================
-            # Step 2: Gemini Text Correction (문맥 기반 보정) ← 핵심!
-            # ============================================================
-            print("🔧 [Step 2/5] Gemini - 문맥 기반 텍스트 보정")
-            scenario_context = await self.text_correction_service.get_scenario_context(
-                scenario_id
-            )
-            print(f"  Scenario Context: '{scenario_context}'")
-            
-            corrected_text = await self.text_correction_service.correct_text_with_context(
-                raw_text=raw_text,
-                scenario_context=scenario_context
-            )
-            print(f"  ✓ Corrected Text: '{corrected_text}'\n")
-            
-            # ============================================================
-            # Step 3: Azure Pronunciation Assessment (발음 평가)
-            # ============================================================
-            print("🎤 [Step 3/5] Azure Speech - 발음 평가")
-            print(f"  Reference Text: '{corrected_text}'")
-            
-            pronunciation_scores = await self.pronunciation_service.assess_pronunciation(
+            graph = self._build_pipeline(
+                scenario_id=scenario_id,
                 audio_data=audio_data,
-                reference_text=corrected_text,
-                language="ja-JP"
-            )
-            
-            print(f"  ✓ Pronunciation Scores:")
-            print(f"    - Accuracy: {pronunciation_scores['accuracy_score']}")
-            print(f"    - Pronunciation: {pronunciation_scores['pronunciation_score']}")
-            print(f"    - Fluency: {pronunciation_scores['fluency_score']}")
-            print(f"    - Completeness: {pronunciation_scores['completeness_score']}\n")
-            
-            # ============================================================
-            # Step 4: Gemini Grammar Evaluation (문법/표현 평가)
-            # ============================================================
-            print("📚 [Step 4/5] Gemini - 문법 및 표현 피드백")
-            grammar_eval = await self.evaluation_service.evaluate_grammar_and_expression(
-                corrected_text=corrected_text,
-                scenario_context=scenario_context,
-                raw_text=raw_text
+                filename=filename
             )
+            run = await graph.run()
+            observe_stage_timings(run.timings)
+            if on_pipeline_complete is not None:
+                on_pipeline_complete(run)
             
-            print(f"  ✓ Grammar Score: {grammar_eval['grammar_score']}")
-            print(f"  ✓ Appropriateness Score: {grammar_eval['appropriateness_score']}")
-            print(f"  ✓ Coaching Advice: {grammar_eval.get('coaching_advice', 'N/A')[:50]}...\n")
-            
-            # ============================================================
-            # 종합 점수 계산
-            # ============================================================
-            overall_score = self._calculate_overall_score(
-                pronunciation_scores=pronunciation_scores,
-                grammar_score=grammar_eval['grammar_score'],
-                appropriateness_score=grammar_eval['appropriateness_score']
-            )
-            
-            print(f"⭐ Overall Score: {overall_score}/100\n")
-            
-            # ============================================================
-            # EvaluationResult 구성
-            # ============================================================
-            evaluation = EvaluationResult(
-                overall_score=overall_score,
-                pronunciation=FeedbackCategory(
-                    name="発音",
-                    score=int(round(pronunciation_scores['pronunciation_score'])),
-                    description=f"Accuracy: {int(round(pronunciation_scores['accuracy_score']))}, "
-                               f"Fluency: {int(round(pronunciation_scores['fluency_score']))}",
-                    suggestions=self._extract_pronunciation_suggestions(pronunciation_scores)
-                ),
-                grammar=FeedbackCategory(
-                    name="文法",
-                    score=int(round(grammar_eval['grammar_score'])),
-                    description=grammar_eval['grammar_feedback'],
-                    suggestions=[]
-                ),
-                appropriateness=FeedbackCategory(
-                    name="適切性 (TPO)",
-                    score=int(round(grammar_eval['appropriateness_score'])),
-                    description=grammar_eval['appropriateness_feedback'],
-                    suggestions=[]
-                ),
-                transcription=raw_text,  # 원본 STT 결과
-                corrected_text=corrected_text,  # 보정된 텍스트
-                example_responses=grammar_eval['better_expressions'],
-                coaching_advice=grammar_eval.get('coaching_advice', "")
-            )
-            
-            # ============================================================
-            # Step 5: AI 응답 생성 및 TTS
-            # ============================================================
-            print("🤖 [Step 5/5] AI 응답 생성 및 TTS")
-            ai_response_text = await self.evaluation_service.generate_ai_response(
-                corrected_text=corrected_text,
-                scenario_context=scenario_context,
-                overall_score=overall_score
+            response = self._build_response(
+                interaction_id=interaction_id,
+                scenario_id=scenario_id,
+                results=run.results
             )
-            print(f"  AI Response: '{ai_response_text}'")
             
-            ai_audio_url = await self.tts_service.synthesize_speech(
-                text=ai_response_text,
-                interaction_id=interaction_id
+            logger.info(
+                "Interaction pipeline completed: score={} exp=+{} | {} | critical path: {}",
+                response.evaluation.overall_score,
+                response.exp_earned,
+                run.summary(),
+                " → ".join(graph.critical_path(run))
             )
-            print(f"  ✓ AI Audio URL: {ai_audio_url}\n")
-            
-            # 경험치 계산
-            exp_earned = self._calculate_exp(overall_score)
             
-            print(f"{'='*60}")
-            print(f"[Interaction Pipeline Completed]")
-            print(f"  Original STT: '{raw_text}'")
-            print(f"  Corrected: '{corrected_text}'")
-            print(f"  Score: {overall_score}/100")
-            print(f"  EXP: +{exp_earned}")
-            print(f"{'='*60}\n")
-            
-            return InteractionResponse(
-                interaction_id=interaction_id,
-                scenario_id=scenario_id,
-                evaluation=evaluation,
-                ai_response_text=ai_response_text,
-                ai_response_audio_url=ai_audio_url,
-                exp_earned=exp_earned,
-                timestamp=datetime.now(),
-                success=True,
-                message="評価が完了しました"
-            )
+            return response
             
         except ServiceError as e:
             # 서비스 에러는 그대로 전파 (라우터에서 HTTP 에러로 변환)
-            print(f"\n❌ [Pipeline Error] {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.opt(exception=e).error("Interaction pipeline failed: {}", e)
             raise
         except Exception as e:
             # 예상치 못한 에러는 ServiceExecutionError로 변환
-            print(f"\n❌ [Pipeline Error] {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.opt(exception=e).error("Interaction pipeline failed: {}", e)
             from app.utils.exceptions import ServiceExecutionError
             raise ServiceExecutionError(
                 service_name="Interaction Pipeline",
                 details=str(e)
             ) from e
     
+    async def stream_audio_interaction(
+        self,
+        scenario_id: str,
+        audio_data: bytes,
+        filename: str,
+        user_id: Optional[str] = None,
+        initial: Optional[dict[str, Any]] = None,
+        history: Optional[ConversationHistory] = None
+    ) -> AsyncIterator[tuple[str, dict]]:
+        """
+        오디오 인터랙션 처리 (스트리밍)
+        
+        각 스테이지 결과가 준비되는 즉시 (이벤트 이름, payload)를 내보내고,
+        마지막에 전체 InteractionResponse를 "complete" 이벤트로 내보냅니다.
+        
+        Args:
+            scenario_id: 시나리오 ID
+            audio_data: 오디오 바이너리 데이터
+            filename: 파일명
+            user_id: 사용자 ID (선택)
+            initial: 이미 계산된 스테이지 결과 (예: 세션에서 미리 받은 context, ingest, stt)
+            history: 이전 대화 턴 (세션 모드, 선택)
+            
+        Yields:
+            tuple[str, dict]: (이벤트 이름, JSON 직렬화 가능한 payload)
+            
+        Raises:
+            ServiceError: 파이프라인 실행 중 에러 (이미 내보낸 이벤트는 유지됨)
+        """
+        interaction_id = f"int_{uuid.uuid4().hex[:12]}"
+        # 제너레이터 본문은 소비하는 쪽 컨텍스트에서 실행되므로 bind로 ID를 붙임
+        log = logger.bind(interaction_id=interaction_id)
+        log.info("Interaction stream started: scenario={} audio={} ({} bytes)", scenario_id, filename, len(audio_data))
+        
+        queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+        graph = self._build_pipeline(
+            scenario_id=scenario_id,
+            audio_data=audio_data,
+            filename=filename,
+            on_stt_interim=lambda text: queue.put_nowait(("stt_interim", text)),
+            history=history
+        )
+        span = tracer.start_span(
+            "interaction", **self._span_attributes(interaction_id, scenario_id, audio_data, "stream")
+        )
+        # 파이프라인 태스크(와 그 스테이지 태스크)는 생성 시점의 컨텍스트를 물려받음
+        with interaction_context(interaction_id), tracer.use_span(span):
+            run_task = asyncio.create_task(
+                graph.run(
+                    on_stage_complete=lambda name, result: queue.put_nowait((name, result)),
+                    initial=initial
+                )
+            )
+        # run 종료 시 대기 중인 queue.get()을 깨우기 위한 sentinel
+        run_task.add_done_callback(lambda _: queue.put_nowait(("", None)))
+        
+        try:
+            with track_interaction("stream"):
+                yield "started", {"interaction_id": interaction_id, "scenario_id": scenario_id}
+                
+                while True:
+                    stage_name, result = await queue.get()
+                    if not stage_name:
+                        break
+                    if stage_name in STREAM_STAGE_EVENTS:
+                        yield STREAM_STAGE_EVENTS[stage_name], self._stage_event_payload(stage_name, result)
+                
+                try:
+                    run = run_task.result()
+                except ServiceError:
+                    raise
+                except Exception as e:
+                    from app.utils.exceptions import ServiceExecutionError
+                    raise ServiceExecutionError(
+                        service_name="Interaction Pipeline",
+                        details=str(e)
+                    ) from e
+                observe_stage_timings(run.timings)
+                
+                response = self._build_response(
+                    interaction_id=interaction_id,
+                    scenario_id=scenario_id,
+                    results=run.results
+                )
+                log.info("Interaction stream completed: score={} | {}", response.evaluation.overall_score, run.summary())
+                yield "complete", response.model_dump(mode="json")
+        
+        except Exception as e:
+            span.record_error(e)
+            raise
+        finally:
+            # 클라이언트 연결 종료 등으로 중단되면 남은 스테이지 취소
+            if not run_task.done():
+                run_task.cancel()
+                await asyncio.gather(run_task, return_exceptions=True)
+            tracer.end_span(span)
+    
+    @staticmethod
+    def _span_attributes(interaction_id: str, scenario_id: str, audio_data: bytes, mode: str) -> dict:
+        """interaction span 속성 (trace 최상위 span에도 interaction_id 기록)"""
+        parent = current_span()
+        if parent is not None:
+            parent.trace_root.set_attribute("interaction_id", interaction_id)
+        return {
+            "interaction_id": interaction_id,
+            "scenario_id": scenario_id,
+            "mode": mode,
+            "audio_bytes": len(audio_data),
+        }
+    
+    def _stage_event_payload(self, stage_name: str, result: Any) -> dict:
+        """스테이지 결과를 InteractionResponse 구성 요소와 같은 형태의 이벤트 payload로 변환"""
+        if stage_name in ("stt", "stt_interim"):
+            return {"transcription": result}
+        if stage_name == "correction":
+            return {"corrected_text": result}
+        if stage_name == "pronunciation":
+            return {
+                "pronunciation": self._build_pronunciation_feedback(result).model_dump(mode="json")
+            }
+        if stage_name == "grammar":
+            return {
+                "grammar": self._build_grammar_feedback(result).model_dump(mode="json"),
+                "appropriateness": self._build_appropriateness_feedback(result).model_dump(mode="json"),
+                "example_responses": result['better_expressions'],
+                "coaching_advice": result.get('coaching_advice', "")
+            }
+        if stage_name == "reply":
+            return {"ai_response_text": result}
+        if stage_name == "tts":
+            return {"ai_response_audio_url": result}
+        return {}
+    
+    def _build_pipeline(
+        self,
+        scenario_id: str,
+        audio_data: bytes,
+        filename: str,
+        on_stt_interim: Optional[InterimCallback] = None,
+        history: Optional[ConversationHistory] = None
+    ) -> StageGraph:
+        """
+        인터랙션 파이프라인 스테이지 그래프 구성
+        
+        on_stt_interim은 긴 발화가 스트리밍 STT로 처리될 때 중간 인식 결과를 받습니다.
+        history는 세션 모드에서 AI 응답 생성에 전달되는 이전 대화 턴입니다.
+        
+        ingest ─ vad ─ stt ─┐
+                            ├─ correction ─┬─ pronunciation (+ vad)
+        context ────────────┘              ├─ grammar
+                                           └─ reply ─ tts
+        
+        GEMINI_COMBINED_EVALUATION이 켜져 있으면 grammar와 reply는
+        하나의 Gemini 호출(evaluation 스테이지)에서 함께 나옵니다.
+        """
+        async def run_context(results: dict[str, Any]) -> str:
+            scenario_context = await self.text_correction_service.get_scenario_context(
+                scenario_id
+            )
+            log_payload("Scenario context: {!r}", scenario_context)
+            set_span_attributes(text_length=len(scenario_context))
+            return scenario_context
+        
+        async def run_ingest(results: dict[str, Any]) -> Optional[CanonicalAudio]:
+            # 업로드를 한 번만 디코딩하여 STT와 Azure가 같은 PCM 버퍼를 공유
+            canonical = await ingest_audio(audio_data)
+            if canonical is not None:
+                logger.debug("Audio: {} → PCM {}ms", canonical.source_format, canonical.duration_ms)
+                set_span_attributes(
+                    source_format=canonical.source_format,
+                    audio_duration_ms=canonical.duration_ms,
+                    transcoded=canonical.pcm.obj is not audio_data
+                )
+            return canonical
+        
+        async def run_vad(results: dict[str, Any]) -> Optional[TrimResult]:
+            # 앞뒤 무음 제거 (STT와 Azure 모두 오디오 길이만큼 과금/지연)
+            canonical = results["ingest"]
+            if canonical is None or not settings.vad_enabled:
+                return None
+            try:
+                trim = await get_executor("transcode").run(
+                    trim_silence, canonical, settings.vad_padding_ms
+                )
+            except Exception as e:
+                # 트리밍은 최적화일 뿐이므로 실패해도 원본 오디오로 계속 진행
+                logger.opt(exception=e).warning("VAD failed, using untrimmed audio: {}", e)
+                set_span_attributes(vad_error=type(e).__name__)
+                return None
+            logger.debug(
+                "VAD: trimmed {}ms (leading {}ms, trailing {}ms)",
+                trim.trimmed_ms, trim.leading_ms, trim.trailing_ms
+            )
+            set_span_attributes(
+                trimmed_ms=trim.trimmed_ms,
+                speech_detected=trim.speech_detected,
+                audio_duration_ms=trim.audio.duration_ms
+            )
+            return trim
+        
+        def speech_audio(results: dict[str, Any]) -> Optional[CanonicalAudio]:
+            trim = results["vad"]
+            return trim.audio if trim is not None else results["ingest"]
+        
+        async def run_stt(results: dict[str, Any]) -> str:
+            # Step 1: Google STT (1차 텍스트 변환)
+            canonical = speech_audio(results)
+            raw_text = await self.stt_service.transcribe_audio(
+                audio_data,
+                filename,
+                canonical=canonical,
+                on_interim=on_stt_interim
+            )
+            log_payload("STT result: {!r}", raw_text)
+            set_span_attributes(
+                audio_duration_ms=canonical.duration_ms if canonical is not None else None,
+                text_length=len(raw_text)
+            )
+            return raw_text
+        
+        async def run_correction(results: dict[str, Any]) -> str:
+            # Step 2: Gemini Text Correction (문맥 기반 보정) ← 핵심!
+            corrected_text = await self.text_correction_service.correct_text_with_context(
+                raw_text=results["stt"],
+                scenario_context=results["context"],
+                scenario_id=scenario_id
+            )
+            log_payload("Corrected text: {!r}", corrected_text)
+            set_span_attributes(text_length=len(corrected_text), changed=corrected_text != results["stt"])
+            return corrected_text
+        
+        async def run_pronunciation(results: dict[str, Any]) -> dict:
+            # Step 3: Azure Pronunciation Assessment (발음 평가)
+            canonical = speech_audio(results)
+            pronunciation_scores = await self.pronunciation_service.assess_pronunciation(
+                audio_data=audio_data,
+                reference_text=results["correction"],
+                language="ja-JP",
+                filename=filename,
+                canonical=canonical
+            )
+            set_span_attributes(
+                audio_duration_ms=canonical.duration_ms if canonical is not None else None,
+                pronunciation_score=pronunciation_scores['pronunciation_score']
+            )
+            logger.debug(
+                "Pronunciation scores: accuracy={} pronunciation={} fluency={} completeness={}",
+                pronunciation_scores['accuracy_score'],
+                pronunciation_scores['pronunciation_score'],
+                pronunciation_scores['fluency_score'],
+                pronunciation_scores['completeness_score']
+            )
+            return pronunciation_scores
+        
+        async def run_grammar(results: dict[str, Any]) -> dict:
+            # Step 4: Gemini Grammar Evaluation (문법/표현 평가)
+            grammar_eval = await self.evaluation_service.evaluate_grammar_and_expression(
+                corrected_text=results["correction"],
+                scenario_context=results["context"],
+                raw_text=results["stt"]
+            )
+            logger.debug(
+                "Grammar scores: grammar={} appropriateness={}",
+                grammar_eval['grammar_score'],
+                grammar_eval['appropriateness_score']
+            )
+            set_span_attributes(text_length=len(results["correction"]), grammar_score=grammar_eval['grammar_score'])
+            return grammar_eval
+        
+        async def run_reply(results: dict[str, Any]) -> str:
+            # Step 5-1: AI 응답 생성 (점수와 무관하므로 평가와 병렬 실행)
+            ai_response_text = await self.evaluation_service.generate_ai_response(
+                corrected_text=results["correction"],
+                scenario_context=results["context"],
+                history=history
+            )
+            log_payload("AI response: {!r}", ai_response_text)
+            set_span_attributes(text_length=len(ai_response_text), history_turns=len(history or []))
+            return ai_response_text
+        
+        async def run_tts(results: dict[str, Any]) -> Optional[str]:
+            # Step 5-2: TTS
+            ai_audio_url = await self.tts_service.synthesize_speech(text=results["reply"])
+            logger.debug("AI audio URL: {}", ai_audio_url)
+            set_span_attributes(text_length=len(results["reply"]), synthesized=ai_audio_url is not None)
+            return ai_audio_url
+        
+        async def run_combined_evaluation(results: dict[str, Any]) -> dict:
+            # Step 4+5-1: 문법 평가와 AI 응답을 Gemini 1회 호출로 생성
+            return await self.evaluation_service.evaluate_and_reply(
+                corrected_text=results["correction"],
+                scenario_context=results["context"],
+                raw_text=results["stt"],
+                history=history
+            )
+        
+        async def take_grammar(results: dict[str, Any]) -> dict:
+            combined = results["evaluation"]
+            return {key: value for key, value in combined.items() if key != "ai_response"}
+        
+        async def take_reply(results: dict[str, Any]) -> str:
+            return results["evaluation"]["ai_response"]
+        
+        stages = [
+            Stage("context", run_context),
+            Stage("ingest", run_ingest),
+            Stage("vad", run_vad, depends_on=("ingest",)),
+            Stage("stt", run_stt, depends_on=("ingest", "vad")),
+            Stage("correction", run_correction, depends_on=("stt", "context")),
+            Stage("pronunciation", run_pronunciation, depends_on=("ingest", "vad", "correction")),
+            Stage("tts", run_tts, depends_on=("reply",)),
+        ]
+        if settings.gemini_combined_evaluation:
+            stages += [
+                Stage("evaluation", run_combined_evaluation, depends_on=("stt", "context", "correction")),
+                Stage("grammar", take_grammar, depends_on=("evaluation",)),
+                Stage("reply", take_reply, depends_on=("evaluation",)),
+            ]
+        else:
+            stages += [
+                Stage("grammar", run_grammar, depends_on=("stt", "context", "correction")),
+                Stage("reply", run_reply, depends_on=("context", "correction")),
+            ]
+        
+        return StageGraph(stages)
+    
+    def _build_response(
+        self,
+        interaction_id: str,
+        scenario_id: str,
+        results: dict[str, Any]
+    ) -> InteractionResponse:
+        """스테이지 결과로부터 InteractionResponse 구성"""
+        raw_text = results["stt"]
+        corrected_text = results["correction"]
+        pronunciation_scores = results["pronunciation"]
+        grammar_eval = results["grammar"]
+        
+        # 종합 점수 계산
+        overall_score = self._calculate_overall_score(
+            pronunciation_scores=pronunciation_scores,
+            grammar_score=grammar_eval['grammar_score'],
+            appropriateness_score=grammar_eval['appropriateness_score']
+        )
+        
+        evaluation = EvaluationResult(
+            overall_score=overall_score,
+            pronunciation=self._build_pronunciation_feedback(pronunciation_scores),
+            grammar=self._build_grammar_feedback(grammar_eval),
+            appropriateness=self._build_appropriateness_feedback(grammar_eval),
+            transcription=raw_text,  # 원본 STT 결과
+            corrected_text=corrected_text,  # 보정된 텍스트
+            example_responses=grammar_eval['better_expressions'],
+            coaching_advice=grammar_eval.get('coaching_advice', "")
+        )
+        
+        # 경험치 계산
+        exp_earned = self._calculate_exp(overall_score)
+        
+        return InteractionResponse(
+            interaction_id=interaction_id,
+            scenario_id=scenario_id,
+            evaluation=evaluation,
+            ai_response_text=results["reply"],
+            ai_response_audio_url=results["tts"],
+            exp_earned=exp_earned,
+            audio_trimmed_ms=results["vad"].trimmed_ms if results["vad"] is not None else 0,
+            timestamp=datetime.now(),
+            success=True,
+            message="評価が完了しました"
+        )
+    
+    def _build_pronunciation_feedback(self, pronunciation_scores: dict) -> FeedbackCategory:
+        """발음 평가 FeedbackCategory 구성"""
+        return FeedbackCategory(
+            name="発音",
+            score=int(round(pronunciation_scores['pronunciation_score'])),
+            description=f"Accuracy: {int(round(pronunciation_scores['accuracy_score']))}, "
+                       f"Fluency: {int(round(pronunciation_scores['fluency_score']))}",
+            suggestions=self._extract_pronunciation_suggestions(pronunciation_scores)
+        )
+    
+    def _build_grammar_feedback(self, grammar_eval: dict) -> FeedbackCategory:
+        """문법 평가 FeedbackCategory 구성"""
+        return FeedbackCategory(
+            name="文法",
+            score=int(round(grammar_eval['grammar_score'])),
+            description=grammar_eval['grammar_feedback'],
+            suggestions=[]
+        )
+    
+    def _build_appropriateness_feedback(self, grammar_eval: dict) -> FeedbackCategory:
+        """적절성(TPO) 평가 FeedbackCategory 구성"""
+        return FeedbackCategory(
+            name="適切性 (TPO)",
+            score=int(round(grammar_eval['appropriateness_score'])),
+            description=grammar_eval['appropriateness_feedback'],
+            suggestions=[]
+        )
+    
     def _calculate_overall_score(
         self,
         pronunciation_scores: dict,
@@ -1,21 +1,144 @@
 """
 Scenario service for managing scenarios
 """
+import asyncio
+import hashlib
 import json
 import random
-import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Awaitable, Callable, Optional
+from loguru import logger
 from app.models.scenario import Scenario
 
 
+# 카탈로그 교체 후 호출되는 콜백 (예: 새 시나리오 음성 사전 합성)
+ReloadListener = Callable[["ScenarioCatalog"], Awaitable[None]]
+
+
+def parse_scenario_id(scenario_id: str) -> tuple[str, int]:
+    """
+    시나리오 ID를 (스토리 ID, 챕터 번호)로 분해
+    
+    Examples:
+        scenario_001_1 → ("scenario_001", 1)
+        scenario_001_2 → ("scenario_001", 2)
+        scenario_002 → ("scenario_002", 1) (단일 챕터)
+    """
+    parts = scenario_id.split("_")
+    if len(parts) == 3:
+        # scenario_001_1 형태 (챕터가 있는 시나리오)
+        try:
+            return f"{parts[0]}_{parts[1]}", int(parts[2])
+        except ValueError:
+            # 숫자가 아니면 단일 챕터로 간주
+            return scenario_id, 1
+    return scenario_id, 1
+
+
+@dataclass(frozen=True)
+class ScenarioCatalog:
+    """
+    로드 시점에 한 번 구축되는 시나리오 인덱스 (읽기 전용)
+    
+    요청 처리 중에는 dict 조회와 배열 인덱싱만 수행합니다.
+    """
+    scenarios: tuple[Scenario, ...]
+    by_id: dict[str, Scenario]
+    by_category: dict[str, tuple[Scenario, ...]]
+    by_story: dict[str, tuple[Scenario, ...]]  # 스토리 ID → 챕터 순서대로 정렬
+    first_chapters: tuple[Scenario, ...]  # Chapter 1 또는 단일 챕터
+    
+    @classmethod
+    def build(cls, scenarios: list[Scenario]) -> "ScenarioCatalog":
+        """시나리오 목록으로부터 인덱스 구축"""
+        by_id: dict[str, Scenario] = {}
+        by_category: dict[str, list[Scenario]] = {}
+        by_story: dict[str, list[tuple[int, Scenario]]] = {}
+        first_chapters: list[Scenario] = []
+        
+        for scenario in scenarios:
+            if scenario.id in by_id:
+                logger.warning("Duplicate scenario ID ignored: {}", scenario.id)
+                continue
+            by_id[scenario.id] = scenario
+            by_category.setdefault(scenario.category.value, []).append(scenario)
+            
+            story_id, chapter_number = parse_scenario_id(scenario.id)
+            by_story.setdefault(story_id, []).append((chapter_number, scenario))
+            if chapter_number == 1:
+                first_chapters.append(scenario)
+        
+        return cls(
+            scenarios=tuple(by_id.values()),
+            by_id=by_id,
+            by_category={
+                category: tuple(items) for category, items in by_category.items()
+            },
+            by_story={
+                story_id: tuple(s for _, s in sorted(chapters, key=lambda c: c[0]))
+                for story_id, chapters in by_story.items()
+            },
+            first_chapters=tuple(first_chapters)
+        )
+
+
 class ScenarioService:
     """시나리오 관리 서비스"""
     
     def __init__(self):
         """Initialize scenario service and load scenarios"""
         self.scenarios_file = Path(__file__).parent.parent.parent / "data" / "scenarios.json"
-        self.scenarios = self._load_scenarios()
+        self._file_signature: Optional[tuple[int, int]] = None  # (mtime_ns, size)
+        self._file_hash: Optional[str] = None
+        self._watch_task: Optional[asyncio.Task] = None
+        self._reload_listeners: list[ReloadListener] = []
+        # 실행 중인 리스너 태스크 (감시 루프를 막지 않도록 분리 실행, stop_watching에서 취소)
+        self._listener_tasks: set[asyncio.Task] = set()
+        self._catalog = ScenarioCatalog.build(self._load_scenarios())
+        logger.info(
+            "Scenarios loaded: {} ({} first chapters)",
+            len(self._catalog.scenarios), len(self._catalog.first_chapters)
+        )
+    
+    @property
+    def scenarios(self) -> list[Scenario]:
+        """로드된 전체 시나리오 목록"""
+        return list(self._catalog.scenarios)
+    
+    @property
+    def catalog(self) -> ScenarioCatalog:
+        """현재 카탈로그 (교체될 수 있으므로 필요한 시점에 다시 조회)"""
+        return self._catalog
+    
+    async def attach_character_audio(self, catalog: ScenarioCatalog, audio_urls: dict[str, str]) -> bool:
+        """
+        사전 합성된 캐릭터 음성 URL을 채운 새 카탈로그로 교체
+        
+        기존 카탈로그를 읽는 요청이 있을 수 있으므로 Scenario를 수정하지 않고 복사본으로 새 카탈로그를 만듭니다.
+        합성하는 동안 리로드로 카탈로그가 바뀌었으면 적용하지 않습니다 (새 카탈로그는 리로드 리스너가 처리).
+        
+        Args:
+            catalog: URL을 합성한 기준 카탈로그
+            audio_urls: 시나리오 ID → 음성 URL
+            
+        Returns:
+            bool: 카탈로그가 교체되었으면 True
+        """
+        if not audio_urls or catalog is not self._catalog:
+            return False
+        
+        scenarios = [
+            scenario.model_copy(update={"character_audio_url": audio_urls[scenario.id]})
+            if scenario.id in audio_urls and not scenario.character_audio_url
+            else scenario
+            for scenario in catalog.scenarios
+        ]
+        updated = await asyncio.to_thread(ScenarioCatalog.build, scenarios)
+        if catalog is not self._catalog:
+            return False
+        self._catalog = updated
+        return True
     
     def _load_scenarios(self) -> list[Scenario]:
         """
@@ -25,16 +148,141 @@ class ScenarioService:
             list[Scenario]: 로드된 시나리오 목록
         """
         try:
-            with open(self.scenarios_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return [Scenario(**scenario) for scenario in data]
+            self._file_signature = self._stat_signature()
+            scenarios, self._file_hash = self._read_scenarios_file()
+            return scenarios
         except FileNotFoundError:
-            print(f"Warning: Scenarios file not found at {self.scenarios_file}")
+            logger.warning("Scenarios file not found at {}", self.scenarios_file)
             return []
         except Exception as e:
-            print(f"Error loading scenarios: {str(e)}")
+            logger.opt(exception=e).error("Error loading scenarios: {}", e)
             return []
     
+    def _stat_signature(self) -> Optional[tuple[int, int]]:
+        """파일 변경 감지용 (mtime_ns, size), 파일이 없으면 None"""
+        try:
+            stat = self.scenarios_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _read_scenarios_file(self) -> tuple[list[Scenario], str]:
+        """
+        시나리오 파일을 읽고 검증 (블로킹, 스레드에서 호출)
+        
+        Returns:
+            tuple[list[Scenario], str]: (시나리오 목록, 파일 내용 sha256)
+            
+        Raises:
+            ValueError: 형식이 잘못되었거나 ID가 중복된 경우
+        """
+        raw = self.scenarios_file.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        data = json.loads(raw)
+        if not isinstance(data, list):
+            raise ValueError("scenarios.json must contain a list of scenarios")
+        
+        scenarios = [Scenario(**scenario) for scenario in data]
+        
+        seen: set[str] = set()
+        duplicates: set[str] = set()
+        for scenario in scenarios:
+            if scenario.id in seen:
+                duplicates.add(scenario.id)
+            seen.add(scenario.id)
+        if duplicates:
+            raise ValueError(f"Duplicate scenario IDs: {sorted(duplicates)}")
+        
+        return scenarios, digest
+    
+    def add_reload_listener(self, listener: ReloadListener) -> None:
+        """카탈로그가 교체된 뒤 호출할 콜백 등록 (백그라운드 태스크로 실행되며 완료를 기다리지 않음)"""
+        self._reload_listeners.append(listener)
+    
+    def _notify_listeners(self, catalog: ScenarioCatalog) -> None:
+        """리스너를 각각 태스크로 실행 (TTS 사전 합성처럼 오래 걸려도 다음 변경 감지가 밀리지 않음)"""
+        async def run(listener: ReloadListener) -> None:
+            try:
+                await listener(catalog)
+            except Exception as e:
+                logger.opt(exception=e).warning("Scenario reload listener failed: {}", e)
+        
+        for listener in self._reload_listeners:
+            task = asyncio.create_task(run(listener), name="scenario-reload-listener")
+            self._listener_tasks.add(task)
+            task.add_done_callback(self._listener_tasks.discard)
+    
+    async def reload_if_changed(self) -> bool:
+        """
+        시나리오 파일이 바뀌었으면 새 카탈로그를 구축하여 원자적으로 교체
+        
+        파싱, 검증, 인덱스 구축은 이벤트 루프 밖(스레드)에서 수행하고,
+        완성된 카탈로그를 참조 하나의 대입으로 교체하므로
+        처리 중인 요청은 이전 카탈로그 또는 새 카탈로그 중 하나만 보게 됩니다.
+        새 파일이 유효하지 않으면 기존 카탈로그를 유지합니다.
+        
+        Returns:
+            bool: 카탈로그가 교체되었으면 True
+        """
+        signature = self._stat_signature()
+        if signature is None or signature == self._file_signature:
+            return False
+        
+        def build() -> tuple[ScenarioCatalog, str]:
+            scenarios, digest = self._read_scenarios_file()
+            if not scenarios:
+                raise ValueError("scenarios.json is empty")
+            return ScenarioCatalog.build(scenarios), digest
+        
+        try:
+            catalog, digest = await asyncio.to_thread(build)
+        except Exception as e:
+            # 편집 중인 파일일 수 있으므로 signature를 기록해 같은 내용으로 재시도하지 않음
+            self._file_signature = signature
+            logger.warning("Scenario reload rejected, keeping current catalog: {}", e)
+            return False
+        
+        self._file_signature = signature
+        if digest == self._file_hash:
+            # mtime만 바뀌고 내용은 동일
+            return False
+        
+        self._catalog = catalog
+        self._file_hash = digest
+        logger.info(
+            "Scenarios reloaded: {} ({} first chapters)",
+            len(catalog.scenarios), len(catalog.first_chapters)
+        )
+        
+        self._notify_listeners(catalog)
+        return True
+    
+    def start_watching(self, interval_seconds: float) -> None:
+        """백그라운드에서 시나리오 파일 변경 감시 시작"""
+        if self._watch_task is not None or interval_seconds <= 0:
+            return
+        
+        async def watch() -> None:
+            while True:
+                await asyncio.sleep(interval_seconds)
+                try:
+                    await self.reload_if_changed()
+                except Exception as e:
+                    logger.warning("Scenario watcher error: {}", e)
+        
+        self._watch_task = asyncio.create_task(watch(), name="scenario-watcher")
+        logger.info("Scenario watcher started (interval: {}s)", interval_seconds)
+    
+    async def stop_watching(self) -> None:
+        """시나리오 파일 감시 중지 (실행 중인 리로드 리스너도 취소)"""
+        tasks = list(self._listener_tasks)
+        if self._watch_task is not None:
+            tasks.append(self._watch_task)
+            self._watch_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
     def _is_first_chapter(self, scenario_id: str) -> bool:
         """
         시나리오가 첫 번째 챕터인지 확인
@@ -50,25 +298,8 @@ class ScenarioService:
             scenario_001_2 → False (Chapter 2)
             scenario_002 → True (단일 챕터)
         """
-        # 언더스코어로 split해서 개수 확인
-        parts = scenario_id.split("_")
-        
-        if len(parts) == 3:
-            # scenario_001_1 형태 (챕터가 있는 시나리오)
-            # parts = ["scenario", "001", "1"]
-            try:
-                chapter_number = int(parts[2])
-                is_first = chapter_number == 1
-                print(f"  📄 {scenario_id}: Chapter {chapter_number} → {'✅ First' if is_first else '❌ Not first'}")
-                return is_first
-            except ValueError:
-                # 숫자가 아니면 단일 챕터로 간주
-                print(f"  📄 {scenario_id}: Single chapter (invalid chapter number) → ✅ First")
-                return True
-        else:
-            # scenario_002 형태 (단일 챕터 시나리오)
-            print(f"  📄 {scenario_id}: Single chapter → ✅ First")
-            return True
+        _, chapter_number = parse_scenario_id(scenario_id)
+        return chapter_number == 1
     
     async def get_random_scenario(self) -> Scenario:
         """
@@ -83,35 +314,20 @@ class ScenarioService:
         Raises:
             ValueError: 시나리오가 없을 경우
         """
-        print("\n" + "="*60)
-        print("🎲 GET RANDOM SCENARIO CALLED")
-        print("="*60)
+        catalog = self._catalog
         
-        if not self.scenarios:
+        if not catalog.scenarios:
             raise ValueError("사용 가능한 시나리오가 없습니다")
         
-        print(f"📚 Total scenarios loaded: {len(self.scenarios)}")
-        print(f"📋 All scenario IDs: {[s.id for s in self.scenarios]}")
-        
-        # Chapter 1만 필터링 (scenario_001_1, scenario_002, scenario_003 등)
-        # Chapter 2, 3 제외 (scenario_001_2, scenario_001_3)
-        first_chapter_scenarios = [
-            s for s in self.scenarios 
-            if self._is_first_chapter(s.id)
-        ]
-        
-        print(f"📖 First chapter scenarios: {len(first_chapter_scenarios)}")
-        print(f"📝 First chapter IDs: {[s.id for s in first_chapter_scenarios]}")
-        
-        if not first_chapter_scenarios:
+        # Chapter 1 목록은 로드 시 미리 계산됨 (scenario_001_1, scenario_002 등)
+        pool = catalog.first_chapters
+        if not pool:
             # 만약 Chapter 1이 없으면 전체에서 선택 (Fallback)
-            print("⚠️  Warning: No first chapter scenarios found, returning any scenario")
-            return random.choice(self.scenarios)
+            logger.warning("No first chapter scenarios found, returning any scenario")
+            pool = catalog.scenarios
         
-        selected = random.choice(first_chapter_scenarios)
-        
-        print(f"✅ Random Scenario Selected: {selected.id} - {selected.title}")
-        print("="*60 + "\n")
+        selected = pool[random.randrange(len(pool))]
+        logger.debug("Random scenario selected: {}", selected.id)
         
         return selected
     
@@ -127,12 +343,12 @@ class ScenarioService:
         Returns:
             Optional[Scenario]: 찾은 시나리오 또는 None
         """
-        for scenario in self.scenarios:
-            if scenario.id == scenario_id:
-                print(f"Scenario Retrieved: {scenario.id} - {scenario.title}")
-                return scenario
+        scenario = self._catalog.by_id.get(scenario_id)
+        if scenario is not None:
+            logger.debug("Scenario retrieved: {}", scenario.id)
+            return scenario
         
-        print(f"Warning: Scenario not found: {scenario_id}")
+        logger.info("Scenario not found: {}", scenario_id)
         return None
     
     async def get_scenarios_by_category(self, category: str) -> list[Scenario]:
@@ -145,7 +361,20 @@ class ScenarioService:
         Returns:
             list[Scenario]: 해당 카테고리의 시나리오 목록
         """
-        return [s for s in self.scenarios if s.category == category]
+        return list(self._catalog.by_category.get(category, ()))
+    
+    def get_story_chapters(self, scenario_id: str) -> list[Scenario]:
+        """
+        Get all chapters of the story a scenario belongs to
+        
+        Args:
+            scenario_id: 스토리 내 아무 챕터의 시나리오 ID (예: scenario_001_2)
+            
+        Returns:
+            list[Scenario]: 챕터 순서대로 정렬된 시나리오 목록
+        """
+        story_id, _ = parse_scenario_id(scenario_id)
+        return list(self._catalog.by_story.get(story_id, ()))
     
     def get_all_first_chapters(self) -> list[Scenario]:
         """
@@ -156,7 +385,4 @@ class ScenarioService:
         Returns:
             list[Scenario]: Chapter 1 또는 단일 챕터 시나리오 목록
         """
-        return [
-            s for s in self.scenarios 
-            if self._is_first_chapter(s.id)
-        ]
+        return list(self._catalog.first_chapters)
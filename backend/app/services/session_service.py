@@ -0,0 +1,206 @@
+"""
+Conversation session service for the WebSocket endpoint
+한 연결 동안 시나리오 문맥과 이전 대화 턴을 서버에 보관하고, 턴 단위로 마이크 PCM을 받아 스트리밍 STT에 전달
+"""
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Optional
+from app.services.evaluation_service import ConversationHistory
+from app.services.scenario_service import parse_scenario_id
+from app.services.stt_service import InterimCallback, STTService
+from app.utils.audio import FORMAT_PCM, CanonicalAudio
+from app.utils.exceptions import ServiceOverloadedError, ServiceUnavailableError
+
+
+@dataclass
+class ConversationSession:
+    """멀티 턴 대화 세션 상태"""
+    session_id: str
+    scenario_id: str
+    scenario_context: str
+    user_id: Optional[str] = None
+    history: ConversationHistory = field(default_factory=list)
+    turn_count: int = 0
+    created_at: float = field(default_factory=time.time)
+
+    def switch_scenario(self, scenario_id: str, scenario_context: str) -> None:
+        """
+        시나리오 변경 (같은 스토리의 다음 챕터면 대화 이력 유지)
+
+        Args:
+            scenario_id: 새 시나리오 ID
+            scenario_context: 새 시나리오 문맥
+        """
+        if parse_scenario_id(scenario_id)[0] != parse_scenario_id(self.scenario_id)[0]:
+            self.history.clear()
+        self.scenario_id = scenario_id
+        self.scenario_context = scenario_context
+
+    def record_turn(self, user_text: str, reply_text: str, max_turns: int) -> None:
+        """완료된 턴을 이력에 추가 (최근 max_turns개만 유지)"""
+        self.turn_count += 1
+        self.history.append((user_text, reply_text))
+        del self.history[:-max_turns]
+
+
+class TurnRecorder:
+    """
+    한 턴 동안의 마이크 PCM 수집기
+
+    첫 프레임이 도착하면 스트리밍 STT를 시작하므로, 사용자가 말하는 동안 인식이 진행되고
+    턴 종료 시에는 마지막 확정 결과만 기다리면 됩니다.
+    SessionManager.start_turn()으로 생성합니다 (동시 턴 수 제한).
+    """
+
+    def __init__(
+        self,
+        stt_service: STTService,
+        max_bytes: int,
+        on_interim: Optional[InterimCallback] = None,
+        on_done: Optional[Callable[[], None]] = None
+    ):
+        """
+        Args:
+            stt_service: 스트리밍 인식에 사용할 STT 서비스
+            max_bytes: 한 턴에 허용할 최대 PCM 크기
+            on_interim: 중간 인식 결과 콜백
+            on_done: 스트리밍 인식이 끝나(스레드 반납) 호출되는 콜백
+        """
+        self.max_bytes = max_bytes
+        self._buffer = bytearray()
+        self._frames: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
+        self._stt_task = asyncio.create_task(
+            stt_service.transcribe_stream(self._iter_frames(), on_interim=on_interim, executor="session_stt")
+        )
+        if on_done is not None:
+            self._stt_task.add_done_callback(lambda _: on_done())
+
+    async def _iter_frames(self) -> AsyncIterator[bytes]:
+        while True:
+            frame = await self._frames.get()
+            if frame is None:
+                return
+            yield frame
+
+    @property
+    def size(self) -> int:
+        return len(self._buffer)
+
+    def feed(self, frame: bytes) -> None:
+        """
+        마이크 프레임 추가 (16kHz mono s16le)
+
+        Raises:
+            ValueError: 턴 최대 크기 초과
+        """
+        if len(self._buffer) + len(frame) > self.max_bytes:
+            raise ValueError(f"turn audio exceeds {self.max_bytes} bytes")
+        self._buffer.extend(frame)
+        self._frames.put_nowait(frame)
+
+    async def finish(self) -> tuple[str, CanonicalAudio]:
+        """
+        입력 종료 후 최종 인식 결과와 턴 전체 PCM 반환
+
+        Returns:
+            tuple[str, CanonicalAudio]: (STT 텍스트, 표준 PCM)
+        """
+        self._frames.put_nowait(None)
+        transcript = await self._stt_task
+        # 홀수 바이트는 샘플 경계가 아니므로 버림
+        usable = len(self._buffer) - (len(self._buffer) % 2)
+        pcm = memoryview(bytes(self._buffer[:usable]))
+        return transcript, CanonicalAudio(pcm=pcm, source_format=FORMAT_PCM)
+
+    async def cancel(self) -> None:
+        """턴 중단 (연결 종료 등)"""
+        self._frames.put_nowait(None)
+        if not self._stt_task.done():
+            self._stt_task.cancel()
+        await asyncio.gather(self._stt_task, return_exceptions=True)
+
+
+class SessionManager:
+    """활성 세션 레지스트리 (동시 세션 수 제한)"""
+
+    def __init__(self, max_sessions: int, max_concurrent_turns: int):
+        """
+        Args:
+            max_sessions: 동시에 열 수 있는 최대 세션 수
+            max_concurrent_turns: 동시에 진행 중인 발화 턴 최대 수 ("session_stt" executor 워커 수와 같게 설정)
+        """
+        self.max_sessions = max_sessions
+        self.max_concurrent_turns = max_concurrent_turns
+        self._sessions: dict[str, ConversationSession] = {}
+        self.opened = 0
+        self.active_turns = 0
+        self.rejected_turns = 0
+
+    def open(
+        self,
+        scenario_id: str,
+        scenario_context: str,
+        user_id: Optional[str] = None
+    ) -> ConversationSession:
+        """
+        새 세션 생성
+
+        Raises:
+            ServiceUnavailableError: 최대 세션 수 초과
+        """
+        if len(self._sessions) >= self.max_sessions:
+            raise ServiceUnavailableError(
+                service_name="Conversation Session",
+                details=f"too many active sessions ({self.max_sessions})"
+            )
+        session = ConversationSession(
+            session_id=f"ses_{uuid.uuid4().hex[:12]}",
+            scenario_id=scenario_id,
+            scenario_context=scenario_context,
+            user_id=user_id
+        )
+        self._sessions[session.session_id] = session
+        self.opened += 1
+        return session
+
+    def close(self, session_id: str) -> None:
+        """세션 종료"""
+        self._sessions.pop(session_id, None)
+
+    def start_turn(
+        self,
+        stt_service: STTService,
+        max_bytes: int,
+        on_interim: Optional[InterimCallback] = None
+    ) -> TurnRecorder:
+        """
+        새 발화 턴 시작 (스트리밍 인식이 끝날 때까지 턴 슬롯 하나 점유)
+
+        Raises:
+            ServiceOverloadedError: 동시 턴 수 초과 (클라이언트는 잠시 후 다시 발화)
+        """
+        if self.active_turns >= self.max_concurrent_turns:
+            self.rejected_turns += 1
+            raise ServiceOverloadedError(
+                service_name="Conversation Turn",
+                retry_after=1,
+                details=f"too many concurrent turns ({self.max_concurrent_turns})"
+            )
+        self.active_turns += 1
+        return TurnRecorder(stt_service, max_bytes, on_interim=on_interim, on_done=self._end_turn)
+
+    def _end_turn(self) -> None:
+        self.active_turns -= 1
+
+    def stats(self) -> dict:
+        """세션 통계"""
+        return {
+            "active": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "opened": self.opened,
+            "active_turns": self.active_turns,
+            "max_concurrent_turns": self.max_concurrent_turns,
+            "rejected_turns": self.rejected_turns,
+        }
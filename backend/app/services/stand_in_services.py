@@ -0,0 +1,326 @@
+"""
+Offline stand-in providers for load testing and CI
+Google STT/TTS, Gemini, Azure 대신 설정한 지연 시간/에러율 분포만 흉내 내는 로컬 구현
+
+실제 서비스 클래스를 상속하고 외부 클라이언트 호출 부분만 교체하므로
+전용 스레드 풀, 캐시, 동일 요청 합치기, 응답 파싱, 지표/추적 계측은 실제와 같은 경로로 실행됩니다.
+"""
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Optional
+from google.cloud import speech
+from loguru import logger
+from app.config import get_settings
+from app.services.azure_pronunciation_service import AzurePronunciationService
+from app.services.azure_recognizer_pool import AzureRecognizerPool
+from app.services.evaluation_service import EvaluationService
+from app.services.stt_service import STTService
+from app.services.text_correction_service import TextCorrectionService
+from app.services.tts_cache import TTSCache
+from app.services.tts_service import TTSService
+
+settings = get_settings()
+
+STAND_IN_TRANSCRIPT = "すみません、財布をなくしてしまいました。"
+STAND_IN_REPLY = "それは大変でしたね。{}番の窓口で紛失届をお書きください。"
+# 응답 대사 종류 수 (실제 응답처럼 대부분 TTS 캐시 미스가 나도록 충분히 크게)
+STAND_IN_REPLY_VARIANTS = 1000
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """
+    외부 호출 하나의 지연 시간/에러 분포
+
+    지연 시간은 로그 정규 분포 (median_ms × e^N(0, sigma))로 뽑아 실제 API처럼 긴 꼬리를 갖습니다.
+    """
+    median_ms: float
+    sigma: float = 0.35
+    error_rate: float = 0.0
+
+    def sample_seconds(self, rng: random.Random, scale: float = 1.0) -> float:
+        return self.median_ms * rng.lognormvariate(0.0, self.sigma) * scale / 1000
+
+
+# 연산 이름은 provider 지표의 operation 라벨과 같음
+DEFAULT_PROFILES: dict[str, LatencyProfile] = {
+    "recognize": LatencyProfile(median_ms=600),
+    "streaming_recognize": LatencyProfile(median_ms=250),  # 입력 종료 후 최종 결과까지
+    "correction": LatencyProfile(median_ms=350),
+    "grammar_evaluation": LatencyProfile(median_ms=900, sigma=0.4),
+    "combined_evaluation": LatencyProfile(median_ms=1000, sigma=0.4),
+    "reply": LatencyProfile(median_ms=500),
+    "pronunciation_assessment": LatencyProfile(median_ms=700, sigma=0.3),
+    "synthesize": LatencyProfile(median_ms=300),
+}
+
+
+class StandInProviderError(RuntimeError):
+    """설정한 에러율에 따라 주입된 외부 호출 실패"""
+
+
+class StandInProvider:
+    """연산별 지연 시간/에러를 만들어 내는 가짜 외부 API"""
+
+    def __init__(
+        self,
+        profiles: Optional[dict[str, LatencyProfile]] = None,
+        latency_scale: float = 1.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            profiles: 연산 이름 → 분포 (없는 연산은 DEFAULT_PROFILES 사용)
+            latency_scale: 모든 지연 시간에 곱할 배율 (0이면 지연 없음)
+            seed: 난수 시드 (재현 가능한 실행용)
+        """
+        self.profiles = {**DEFAULT_PROFILES, **(profiles or {})}
+        self.latency_scale = latency_scale
+        self.rng = random.Random(seed)
+
+    @classmethod
+    def from_settings(cls) -> "StandInProvider":
+        """
+        STAND_IN_PROFILES / STAND_IN_LATENCY_SCALE / STAND_IN_SEED 설정으로 생성
+
+        Raises:
+            ValueError: 알 수 없는 연산 이름
+        """
+        unknown = set(settings.stand_in_profiles) - set(DEFAULT_PROFILES)
+        if unknown:
+            raise ValueError(f"Unknown stand-in operations: {', '.join(sorted(unknown))}")
+        profiles = {
+            name: LatencyProfile(**{**DEFAULT_PROFILES[name].__dict__, **overrides})
+            for name, overrides in settings.stand_in_profiles.items()
+        }
+        return cls(profiles, latency_scale=settings.stand_in_latency_scale, seed=settings.stand_in_seed)
+
+    def _draw(self, operation: str) -> tuple[float, bool]:
+        profile = self.profiles[operation]
+        return profile.sample_seconds(self.rng, self.latency_scale), self.rng.random() < profile.error_rate
+
+    def _fail(self, operation: str) -> None:
+        raise StandInProviderError(f"injected {operation} failure")
+
+    async def call(self, operation: str) -> None:
+        """비동기 SDK 호출 흉내 (이벤트 루프를 막지 않고 대기)"""
+        delay, failed = self._draw(operation)
+        await asyncio.sleep(delay)
+        if failed:
+            self._fail(operation)
+
+    def call_blocking(self, operation: str) -> None:
+        """동기 SDK 호출 흉내 (호출한 스레드 풀 워커를 점유)"""
+        delay, failed = self._draw(operation)
+        time.sleep(delay)
+        if failed:
+            self._fail(operation)
+
+
+class _StandInSpeechClient:
+    """speech.SpeechClient 대체 (recognize / streaming_recognize)"""
+
+    def __init__(self, provider: StandInProvider):
+        self.provider = provider
+        self.transport = SimpleNamespace(close=lambda: None)
+
+    @staticmethod
+    def _result(**kwargs: Any) -> speech.SpeechRecognitionResult:
+        alternative = speech.SpeechRecognitionAlternative(transcript=STAND_IN_TRANSCRIPT, confidence=0.92)
+        return speech.SpeechRecognitionResult(alternatives=[alternative], **kwargs)
+
+    def recognize(self, config: Any, audio: Any) -> speech.RecognizeResponse:
+        self.provider.call_blocking("recognize")
+        return speech.RecognizeResponse(results=[self._result()])
+
+    def streaming_recognize(self, config: Any, requests: Any):
+        # 실제 스트림처럼 입력이 끝날 때까지 청크를 받은 뒤 최종 결과 반환
+        for _ in requests:
+            pass
+        self.provider.call_blocking("streaming_recognize")
+        yield speech.StreamingRecognizeResponse(
+            results=[speech.StreamingRecognitionResult(
+                alternatives=self._result().alternatives,
+                is_final=True
+            )]
+        )
+
+
+class StandInSTTService(STTService):
+    """Google STT 대체"""
+
+    def __init__(self, provider: StandInProvider):
+        super().__init__()
+        self.provider = provider
+
+    def _ensure_client_initialized(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        self.client = _StandInSpeechClient(self.provider)
+
+    async def warmup(self) -> None:
+        self._ensure_client_initialized()
+
+
+class _StandInGeminiModel:
+    """genai.GenerativeModel 대체 (프롬프트 종류에 맞는 응답 텍스트 반환)"""
+
+    def __init__(self, provider: StandInProvider, evaluation: bool):
+        """
+        Args:
+            provider: 지연 시간/에러 생성기
+            evaluation: True면 평가/응답 모델, False면 보정 모델
+        """
+        self.provider = provider
+        self.evaluation = evaluation
+
+    def _respond(self, prompt: str) -> tuple[str, str]:
+        """(연산 이름, 응답 텍스트)"""
+        if not self.evaluation:
+            return "correction", STAND_IN_TRANSCRIPT
+        reply = STAND_IN_REPLY.format(self.provider.rng.randint(1, STAND_IN_REPLY_VARIANTS))
+        evaluation = {
+            "grammar_score": self.provider.rng.randint(70, 95),
+            "grammar_feedback": "文法的に正確です",
+            "appropriateness_score": self.provider.rng.randint(70, 95),
+            "appropriateness_feedback": "状況に適切です",
+            "better_expressions": ["財布を紛失しました。届け出をお願いします。"],
+            "coaching_advice": "좋은 시도예요! 상황에 맞는 자연스러운 표현입니다.",
+        }
+        if '"ai_response"' in prompt:
+            return "combined_evaluation", json.dumps({**evaluation, "ai_response": reply}, ensure_ascii=False)
+        if "JSON" in prompt:
+            return "grammar_evaluation", json.dumps(evaluation, ensure_ascii=False)
+        return "reply", reply
+
+    async def generate_content_async(self, prompt: str, generation_config: Any = None) -> Any:
+        operation, text = self._respond(prompt)
+        await self.provider.call(operation)
+        return SimpleNamespace(
+            candidates=[SimpleNamespace(finish_reason=1)],  # 1=STOP
+            text=text,
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=len(prompt) // 2,
+                candidates_token_count=len(text) // 2
+            )
+        )
+
+    async def count_tokens_async(self, contents: str) -> Any:
+        return SimpleNamespace(total_tokens=len(contents) // 2)
+
+
+class StandInTextCorrectionService(TextCorrectionService):
+    """Gemini 보정 대체"""
+
+    def __init__(self, provider: StandInProvider):
+        super().__init__()
+        self.model = _StandInGeminiModel(provider, evaluation=False)
+        # 영속 캐시(CORRECTION_CACHE_DB_PATH)에 실제 보정 결과와 섞이지 않도록 키 분리
+        self.template_hash = f"stand-in-{self.template_hash}"
+
+
+class StandInEvaluationService(EvaluationService):
+    """Gemini 평가/응답 생성 대체"""
+
+    def __init__(self, provider: StandInProvider):
+        super().__init__()
+        self.model = _StandInGeminiModel(provider, evaluation=True)
+
+
+class StandInPronunciationService(AzurePronunciationService):
+    """Azure 발음 평가 대체 (recognizer 풀 없이 azure 스레드 풀에서 호출)"""
+
+    def __init__(self, provider: StandInProvider):
+        super().__init__()
+        self.provider = provider
+
+    def _ensure_sdk_initialized(self):
+        self._initialized = True
+        # SDK 모듈 대신 아무 객체나 넣어 두면 assess_pronunciation이 사용 가능으로 판단
+        self.speech_sdk = self.provider
+
+    def _get_pool(self, language: str) -> Optional[AzureRecognizerPool]:
+        return None
+
+    def _perform_pronunciation_assessment(
+        self,
+        pcm_data: bytes,
+        reference_text: str,
+        language: str
+    ) -> dict[str, Any]:
+        self.provider.call_blocking("pronunciation_assessment")
+        rng = self.provider.rng
+        return {
+            "accuracy_score": rng.uniform(70, 98),
+            "pronunciation_score": rng.uniform(70, 98),
+            "completeness_score": rng.uniform(80, 100),
+            "fluency_score": rng.uniform(70, 98),
+            "recognized_text": reference_text,
+            "word_scores": []
+        }
+
+
+class _StandInTTSClient:
+    """texttospeech.TextToSpeechAsyncClient 대체"""
+
+    def __init__(self, provider: StandInProvider):
+        self.provider = provider
+        self.transport = self
+
+    async def list_voices(self, language_code: str) -> None:
+        return None
+
+    async def synthesize_speech(self, input: Any, voice: Any, audio_config: Any) -> Any:
+        await self.provider.call("synthesize")
+        # 글자당 약 0.15초 분량의 32kbps MP3 크기만큼 채운 더미 데이터
+        return SimpleNamespace(audio_content=b"ID3" + bytes(len(input.text) * 600))
+
+    async def close(self) -> None:
+        return None
+
+
+class StandInTTSService(TTSService):
+    """Google TTS 대체 (실제 음성 캐시와 섞이지 않도록 별도 캐시 디렉토리 사용)"""
+
+    def __init__(self, provider: StandInProvider):
+        super().__init__()
+        self.provider = provider
+        self.cache = TTSCache(
+            cache_dir=self.upload_dir / "stand_in",
+            url_prefix="/uploads/audio/stand_in",
+            max_bytes=settings.tts_cache_max_mb * 1024 * 1024
+        )
+
+    def _ensure_client_initialized(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        from google.cloud import texttospeech
+        self.client = _StandInTTSClient(self.provider)
+        self.texttospeech = texttospeech
+
+
+def build_stand_in_services(provider: Optional[StandInProvider] = None) -> dict[str, Any]:
+    """
+    ServiceContainer.build()에 넘길 대체 서비스 모음
+
+    Args:
+        provider: 지연 시간/에러 생성기 (None이면 설정으로 생성)
+
+    Returns:
+        dict: 서비스 필드 이름 → 대체 인스턴스
+    """
+    provider = provider or StandInProvider.from_settings()
+    logger.warning("Using offline stand-in providers (latency scale {})", provider.latency_scale)
+    return {
+        "stt_service": StandInSTTService(provider),
+        "text_correction_service": StandInTextCorrectionService(provider),
+        "pronunciation_service": StandInPronunciationService(provider),
+        "evaluation_service": StandInEvaluationService(provider),
+        "tts_service": StandInTTSService(provider),
+    }
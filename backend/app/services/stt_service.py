@@ -1,15 +1,44 @@
 """
 Speech-to-Text service using Google Cloud Speech-to-Text API
 """
-import os
 import asyncio
-from typing import Optional
+import os
+import queue
+from typing import AsyncIterator, Callable, Optional, Union, cast
+import grpc  # type: ignore
 from google.cloud import speech
+from google.cloud.speech_v1.helpers import SpeechHelpers
+from loguru import logger
 from app.config import get_settings
-from app.utils.exceptions import ServiceUnavailableError
+from app.utils.audio import (
+    CanonicalAudio,
+    FORMAT_AMR_NB,
+    FORMAT_AMR_WB,
+    FORMAT_FLAC,
+    FORMAT_MP3,
+    FORMAT_OGG,
+    FORMAT_PCM,
+    FORMAT_WAV,
+    FORMAT_WEBM,
+    TARGET_SAMPLE_RATE,
+    detect_audio_format,
+)
+from app.utils.logger import log_payload
+from app.utils.circuit_breaker import get_circuit_breaker
+from app.utils.metrics import track_provider_call
+from app.utils.tracing import set_span_attributes
+from app.utils.exceptions import ServiceUnavailableError, ServiceOverloadedError
+from app.utils.executors import get_executor
+from app.utils.rate_limit import get_rate_limiter
 
 settings = get_settings()
 
+# streaming_recognize 요청당 오디오 크기 (100ms @ 16kHz s16, Google 권장 프레임 크기)
+STREAM_CHUNK_BYTES = 3200
+
+# 중간 인식 결과 콜백 (지금까지 확정된 텍스트 + 진행 중인 텍스트)
+InterimCallback = Callable[[str], None]
+
 
 class STTService:
     """음성을 텍스트로 변환하는 서비스"""
@@ -28,36 +57,107 @@ class STTService:
         self._initialized = True
         
         # Google Cloud Speech-to-Text 클라이언트 초기화
-        print(f"STT Service init: credentials_path={self.credentials_path}")
+        logger.debug("STT Service init: credentials_path={}", self.credentials_path)
         if self.credentials_path and os.path.exists(self.credentials_path):
             try:
                 os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = self.credentials_path
-                print(f"Setting GOOGLE_APPLICATION_CREDENTIALS={self.credentials_path}")
                 self.client = speech.SpeechClient()
-                print("Google Cloud Speech-to-Text client initialized successfully")
+                logger.info("Google Cloud Speech-to-Text client initialized")
             except Exception as e:
-                print(f"Warning: Google Cloud Speech client initialization failed: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.opt(exception=e).warning("Google Cloud Speech client initialization failed: {}", e)
                 self.client = None
         else:
-            print(f"Warning: Credentials file not found at {self.credentials_path}")
-            if self.credentials_path:
-                print(f"  Absolute path check: {os.path.abspath(self.credentials_path)}")
-                print(f"  File exists (abs): {os.path.exists(os.path.abspath(self.credentials_path))}")
+            logger.warning(
+                "STT credentials file not found at {} (absolute: {})",
+                self.credentials_path,
+                os.path.abspath(self.credentials_path) if self.credentials_path else None
+            )
             self.client = None
     
-    async def transcribe_audio(self, audio_data: bytes, filename: str = "") -> str:
+    async def warmup(self) -> None:
         """
-        Transcribe audio to text using Google Cloud Speech-to-Text
+        서버 시작 시 클라이언트 생성 및 gRPC 채널 연결
+        
+        첫 요청이 클라이언트 생성과 TLS/HTTP2 연결 비용을 내지 않도록 미리 수행합니다.
+        gRPC가 아닌 transport(REST 등)는 연결을 미리 열 채널이 없으므로 클라이언트 생성까지만 합니다.
+        """
+        self._ensure_client_initialized()
+        if self.client is None:
+            return
+        channel = getattr(self.client.transport, "grpc_channel", None)
+        if channel is None:
+            logger.debug("STT transport has no gRPC channel, skipping connection warmup")
+            return
+        await get_executor("stt").run(
+            grpc.channel_ready_future(channel).result,
+            timeout=settings.client_warmup_timeout_seconds
+        )
+        logger.info("STT gRPC channel connected")
+    
+    def close(self) -> None:
+        """gRPC 채널 종료"""
+        if self.client is not None:
+            self.client.transport.close()
+            self.client = None
+            self._initialized = False
+    
+    @staticmethod
+    def _build_recognition_config(
+        audio_format: str,
+        sample_rate: int = TARGET_SAMPLE_RATE
+    ) -> speech.RecognitionConfig:
+        """
+        오디오 포맷별 RecognitionConfig 생성
         
         Args:
-            audio_data: 오디오 바이너리 데이터
-            filename: 파일명 (확장자로 포맷 감지용, 선택)
-            
-        Returns:
-            str: 변환된 텍스트
+            audio_format: FORMAT_PCM(헤더 없는 LINEAR16) 또는 detect_audio_format() 결과
+            sample_rate: PCM 샘플링 레이트
         """
+        common = dict(
+            language_code="ja-JP",
+            alternative_language_codes=["en-US"],
+            enable_automatic_punctuation=True,
+        )
+        AudioEncoding = speech.RecognitionConfig.AudioEncoding
+        
+        if audio_format == FORMAT_PCM:
+            return speech.RecognitionConfig(
+                encoding=AudioEncoding.LINEAR16,
+                sample_rate_hertz=sample_rate,
+                use_enhanced=True,
+                **common
+            )
+        if audio_format == FORMAT_AMR_WB:
+            # AMR-WB는 16kHz 고정
+            return speech.RecognitionConfig(
+                encoding=AudioEncoding.AMR_WB,
+                sample_rate_hertz=16000,
+                use_enhanced=True,
+                **common
+            )
+        if audio_format == FORMAT_AMR_NB:
+            # AMR-NB는 8kHz 고정
+            return speech.RecognitionConfig(
+                encoding=AudioEncoding.AMR,
+                sample_rate_hertz=8000,
+                **common
+            )
+        if audio_format == FORMAT_WAV:
+            # WAV 헤더에서 샘플레이트를 읽으므로 인코딩만 지정
+            return speech.RecognitionConfig(encoding=AudioEncoding.LINEAR16, use_enhanced=True, **common)
+        if audio_format == FORMAT_MP3:
+            return speech.RecognitionConfig(encoding=AudioEncoding.MP3, **common)
+        if audio_format == FORMAT_FLAC:
+            return speech.RecognitionConfig(encoding=AudioEncoding.FLAC, **common)
+        if audio_format == FORMAT_OGG:
+            return speech.RecognitionConfig(encoding=AudioEncoding.OGG_OPUS, sample_rate_hertz=48000, **common)
+        if audio_format == FORMAT_WEBM:
+            return speech.RecognitionConfig(encoding=AudioEncoding.WEBM_OPUS, sample_rate_hertz=48000, **common)
+        # 기본값: ENCODING_UNSPECIFIED (자동 감지)
+        return speech.RecognitionConfig(encoding=AudioEncoding.ENCODING_UNSPECIFIED, **common)
+    
+    def _require_client(self) -> speech.SpeechClient:
+        """클라이언트 초기화 후 반환 (없으면 ServiceUnavailableError)"""
         # 클라이언트 초기화 확인
         self._ensure_client_initialized()
         
@@ -69,95 +169,204 @@ class STTService:
                 service_name="STT",
                 details=error_details
             )
+        return self.client
+    
+    @staticmethod
+    async def _iter_pcm(canonical: CanonicalAudio) -> AsyncIterator[memoryview]:
+        """표준 PCM 버퍼를 스트리밍 요청 크기로 나눈 view (복사 없음)"""
+        pcm = canonical.pcm
+        for offset in range(0, len(pcm), STREAM_CHUNK_BYTES):
+            yield pcm[offset:offset + STREAM_CHUNK_BYTES]
+    
+    async def transcribe_stream(
+        self,
+        chunks: AsyncIterator[Union[bytes, memoryview]],
+        sample_rate: int = TARGET_SAMPLE_RATE,
+        on_interim: Optional[InterimCallback] = None,
+        executor: str = "stt"
+    ) -> str:
+        """
+        Transcribe PCM chunks with gRPC streaming_recognize
         
-        # 타입 가드를 위해 로컬 변수에 할당
-        client = self.client
+        청크가 도착하는 대로 Google에 전송하므로 업로드(또는 마이크 입력)와 인식이 겹쳐 진행되고,
+        입력이 끝나면 마지막 확정 결과만 기다리면 됩니다.
+        블로킹 gRPC 스트림은 STT 전용 스레드 풀에서 소비하고, 청크는 스레드 안전 큐로 전달합니다.
+        스트림은 입력이 끝날 때까지 스레드를 점유하므로, 마이크 입력처럼 긴 스트림은 별도 executor를 사용합니다.
         
-        try:
-            # 비동기 실행을 위해 스레드 풀 사용
-            loop = asyncio.get_event_loop()
+        Args:
+            chunks: 헤더 없는 16-bit mono PCM 청크 (async iterator)
+            sample_rate: 샘플링 레이트
+            on_interim: 중간 인식 결과 콜백 (이벤트 루프 스레드에서 호출)
+            executor: 스트림을 소비할 executor 이름 (세션 턴은 "session_stt")
             
-            # 파일 확장자로 포맷 감지
-            # Android 앱은 AMR-WB 포맷으로 녹음 (Google STT 지원)
-            filename_lower = filename.lower() if filename else ""
+        Returns:
+            str: 확정된 전체 텍스트
+        """
+        client = self._require_client()
+        loop = asyncio.get_running_loop()
+        
+        # None은 입력 종료 표시
+        audio_queue: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        streaming_config = speech.StreamingRecognitionConfig(
+            config=self._build_recognition_config(FORMAT_PCM, sample_rate),
+            interim_results=on_interim is not None
+        )
+        
+        def requests():
+            while True:
+                chunk = audio_queue.get()
+                if chunk is None:
+                    return
+                yield speech.StreamingRecognizeRequest(audio_content=chunk)
+        
+        def recognize() -> str:
+            finals: list[str] = []
+            # speech.SpeechClient는 SpeechHelpers.streaming_recognize(config, requests)를 노출하지만
+            # 타입 검사기는 GAPIC 시그니처(requests만)로 보므로 helper 타입으로 호출
+            responses = cast(SpeechHelpers, client).streaming_recognize(streaming_config, requests())
+            for response in responses:
+                for result in response.results:
+                    if not result.alternatives:
+                        continue
+                    transcript = result.alternatives[0].transcript
+                    if result.is_final:
+                        finals.append(transcript)
+                        log_payload("STT stream final: {!r}", transcript)
+                    elif on_interim is not None:
+                        loop.call_soon_threadsafe(on_interim, "".join(finals) + transcript)
+            return "".join(finals)
+        
+        sent_bytes = 0
+        
+        async def pump() -> None:
+            nonlocal sent_bytes
+            try:
+                async for chunk in chunks:
+                    sent_bytes += len(chunk)
+                    for offset in range(0, len(chunk), STREAM_CHUNK_BYTES):
+                        audio_queue.put(bytes(chunk[offset:offset + STREAM_CHUNK_BYTES]))
+            finally:
+                audio_queue.put(None)
+        
+        pump_task = asyncio.create_task(pump())
+        try:
+            async with get_circuit_breaker("google_stt").guard(), get_rate_limiter("google_stt").limit():
+                with track_provider_call("google_stt", "streaming_recognize") as call:
+                    transcript = await get_executor(executor).run(recognize)
+                    call.record_bytes(sent=sent_bytes, received=len(transcript.encode()))
+        except (ServiceUnavailableError, ServiceOverloadedError):
+            raise
+        except Exception as e:
+            logger.error("STT stream error: {}", e)
+            from app.utils.exceptions import ServiceExecutionError
+            raise ServiceExecutionError(
+                service_name="STT",
+                details=str(e)
+            ) from e
+        finally:
+            # 인식이 먼저 끝나거나 실패해도 요청 생성 스레드가 큐에서 영원히 대기하지 않도록 종료 표시
+            audio_queue.put(None)
+            if not pump_task.done():
+                pump_task.cancel()
+            await asyncio.gather(pump_task, return_exceptions=True)
+        
+        if not transcript:
+            logger.warning("STT returned no results (streaming)")
+            return "音声を認識できませんでした。"
+        log_payload("STT success (streaming): {!r}", transcript)
+        return transcript
+    
+    async def transcribe_audio(
+        self,
+        audio_data: bytes,
+        filename: str = "",
+        canonical: Optional[CanonicalAudio] = None,
+        on_interim: Optional[InterimCallback] = None
+    ) -> str:
+        """
+        Transcribe audio to text using Google Cloud Speech-to-Text
+        
+        표준 PCM 길이가 STT_STREAMING_THRESHOLD_MS 이상이면 streaming_recognize로 처리합니다
+        (동기 recognize는 1분 제한이 있고, 긴 발화는 스트리밍이 먼저 결과를 냅니다).
+        
+        Args:
+            audio_data: 오디오 바이너리 데이터 (canonical이 없을 때 사용)
+            filename: 파일명 (로그용, 선택)
+            canonical: 인제스트 단계에서 디코딩된 표준 PCM (있으면 우선 사용)
+            on_interim: 스트리밍 경로에서 중간 인식 결과를 받을 콜백 (선택)
             
-            # AMR 파일: Google STT가 공식 지원하는 포맷
-            if filename_lower.endswith('.amr'):
-                # AMR-WB는 16kHz 고정, 명시적으로 지정 필요
-                config = speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.AMR_WB,
-                    sample_rate_hertz=16000,  # AMR-WB는 16kHz 고정
-                    language_code="ja-JP",
-                    alternative_language_codes=["en-US"],
-                    enable_automatic_punctuation=True,
-                    use_enhanced=True,  # AMR은 use_enhanced 지원
-                )
-            elif filename_lower.endswith('.wav'):
-                # WAV 파일은 LINEAR16 인코딩, 샘플레이트 지정 필요
-                config = speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                    sample_rate_hertz=16000,
-                    language_code="ja-JP",
-                    alternative_language_codes=["en-US"],
-                    enable_automatic_punctuation=True,
-                    use_enhanced=True,
-                )
-            elif filename_lower.endswith(('.mp3', '.mp4')):
-                # MP3 파일 (Google STT 지원)
-                config = speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.MP3,
-                    language_code="ja-JP",
-                    alternative_language_codes=["en-US"],
-                    enable_automatic_punctuation=True,
-                )
+        Returns:
+            str: 변환된 텍스트
+        """
+        if (
+            canonical is not None
+            and settings.stt_streaming_threshold_ms > 0
+            and canonical.duration_ms >= settings.stt_streaming_threshold_ms
+        ):
+            logger.debug("STT: streaming recognition for {}ms audio", canonical.duration_ms)
+            set_span_attributes(streaming=True)
+            return await self.transcribe_stream(
+                self._iter_pcm(canonical),
+                sample_rate=canonical.sample_rate,
+                on_interim=on_interim
+            )
+        
+        client = self._require_client()
+        
+        try:
+            if canonical is not None:
+                # 인제스트 단계에서 디코딩된 헤더 없는 16kHz PCM 사용
+                config = self._build_recognition_config(FORMAT_PCM, canonical.sample_rate)
+                content = canonical.as_bytes()
             else:
-                # 기본값: ENCODING_UNSPECIFIED (자동 감지)
-                config = speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED,
-                    language_code="ja-JP",
-                    alternative_language_codes=["en-US"],
-                    enable_automatic_punctuation=True,
-                )
+                # 디코딩 실패 시 원본 전송 (확장자가 아닌 매직 바이트로 포맷 감지)
+                config = self._build_recognition_config(detect_audio_format(audio_data))
+                content = audio_data
             
-            audio = speech.RecognitionAudio(content=audio_data)
+            audio = speech.RecognitionAudio(content=content)
             
-            # 디버깅: 설정 정보 출력
-            print(f"STT Config: encoding={config.encoding}, sample_rate={config.sample_rate_hertz if hasattr(config, 'sample_rate_hertz') else 'N/A'}, language={config.language_code}")
-            print(f"STT Audio: size={len(audio_data)} bytes, filename={filename}")
-            
-            # 동기 호출을 비동기로 실행
-            response = await loop.run_in_executor(
-                None,
-                lambda: client.recognize(config=config, audio=audio)
+            logger.debug(
+                "STT request: encoding={} sample_rate={} size={} bytes filename={}",
+                config.encoding, config.sample_rate_hertz, len(content), filename
             )
             
-            # 결과 추출 및 상세 로깅
-            print(f"STT Response: results_count={len(response.results)}")
+            # 동기 호출을 STT 전용 스레드 풀에서 실행 (Azure 등 다른 블로킹 호출과 분리)
+            async with get_circuit_breaker("google_stt").guard(), get_rate_limiter("google_stt").limit():
+                with track_provider_call("google_stt", "recognize") as call:
+                    response = await get_executor("stt").run(
+                        client.recognize,
+                        config=config,
+                        audio=audio
+                    )
+                    call.record_bytes(sent=len(content))
+            
+            # 결과 추출 (인식 후보 전체 목록은 샘플링된 인터랙션에서만 기록)
             if response.results:
-                for i, result in enumerate(response.results):
-                    print(f"  Result {i}: alternatives={len(result.alternatives)}")
-                    for j, alternative in enumerate(result.alternatives):
-                        print(f"    Alternative {j}: transcript='{alternative.transcript}', confidence={alternative.confidence}")
+                log_payload(
+                    "STT alternatives: {}",
+                    lambda: [
+                        [(alternative.transcript, alternative.confidence) for alternative in result.alternatives]
+                        for result in response.results
+                    ]
+                )
                 
                 transcript = response.results[0].alternatives[0].transcript
                 confidence = response.results[0].alternatives[0].confidence
-                print(f"STT Success: transcript='{transcript}', confidence={confidence}")
+                logger.debug("STT success: confidence={}", confidence)
                 return transcript
             else:
-                print("STT Warning: No results returned")
-                print("  Possible reasons: audio too short, too quiet, or encoding mismatch")
-                # 더 자세한 에러 정보 확인
-                if hasattr(response, 'error'):
-                    print(f"  Error: {response.error}")
+                # 오디오가 너무 짧거나 작거나, 인코딩 불일치
+                logger.warning(
+                    "STT returned no results (encoding={}, size={} bytes)",
+                    config.encoding, len(content)
+                )
                 return "音声を認識できませんでした。"
             
-        except ServiceUnavailableError:
-            # ServiceUnavailableError는 그대로 전파
+        except (ServiceUnavailableError, ServiceOverloadedError):
+            # ServiceUnavailableError, 속도 제한 초과는 그대로 전파
             raise
         except Exception as e:
-            print(f"STT Error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.opt(exception=e).error("STT error: {}", e)
             # 기타 예외는 ServiceExecutionError로 변환
             from app.utils.exceptions import ServiceExecutionError
             raise ServiceExecutionError(
@@ -2,12 +2,23 @@
 Text correction service using Google Gemini API
 문맥(Context)을 기반으로 STT 결과를 보정하는 서비스
 """
+import hashlib
 from typing import Optional, Any
 import google.generativeai as genai  # type: ignore
+from loguru import logger
 from app.config import get_settings
+from app.services.correction_cache import CorrectionCache
+from app.utils.logger import log_payload
+from app.utils.circuit_breaker import get_circuit_breaker
+from app.utils.hedging import HedgeAttempt, get_hedge_policy
+from app.utils.metrics import track_provider_call
+from app.utils.rate_limit import estimate_tokens, get_rate_limiter, usage_tokens
+from app.utils.tracing import set_span_attributes
 
 settings = get_settings()
 
+GEMINI_MODEL_NAME = "gemini-2.0-flash"
+
 
 class TextCorrectionService:
     """문맥 기반 텍스트 보정 서비스"""
@@ -17,85 +28,151 @@ class TextCorrectionService:
         self.api_key = settings.gemini_api_key
         self.model: Optional[Any] = None  # type: ignore
         
-        print(f"[DEBUG] TextCorrection - Gemini API Key present: {bool(self.api_key)}")
+        logger.debug("TextCorrection - Gemini API key present: {}", bool(self.api_key))
         
         if self.api_key:
             try:
                 genai.configure(api_key=self.api_key)  # type: ignore
-                self.model = genai.GenerativeModel("gemini-2.0-flash")  # type: ignore
-                print(f"[DEBUG] TextCorrection model initialized: {self.model}")
-                print("Gemini API initialized for text correction")
+                self.model = genai.GenerativeModel(GEMINI_MODEL_NAME)  # type: ignore
+                logger.info("Gemini API initialized for text correction")
             except Exception as e:
-                print(f"Warning: Gemini API initialization failed: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.opt(exception=e).warning("Gemini API initialization failed: {}", e)
                 self.model = None
         else:
-            print("[WARNING] No Gemini API key found for text correction")
+            logger.warning("No Gemini API key found for text correction")
+        
+        # temperature 0.1 보정은 사실상 결정적이므로 같은 입력은 캐시 결과를 재사용
+        # 프롬프트 템플릿이 바뀌면 키도 바뀌도록 템플릿 해시를 키에 포함
+        template = self._create_correction_prompt("{raw_text}", "{scenario_context}")
+        self.template_hash = hashlib.sha256(
+            f"{GEMINI_MODEL_NAME}\x1f{template}".encode("utf-8")
+        ).hexdigest()[:16]
+        self.cache = CorrectionCache(
+            max_entries=settings.correction_cache_max_entries,
+            ttl_seconds=settings.correction_cache_ttl_seconds,
+            db_path=settings.correction_cache_db_path or None
+        )
+    
+    async def warmup(self) -> None:
+        """서버 시작 시 Gemini 연결 준비 (과금되지 않는 count_tokens 호출)"""
+        if self.model is None:
+            return
+        await self.model.count_tokens_async("こんにちは")
+        logger.info("Gemini connection warmed up (text correction)")
+    
+    def close(self) -> None:
+        """보정 캐시 저장소 종료"""
+        self.cache.close()
+    
+    def cache_stats(self) -> dict:
+        """보정 캐시 hit/miss 통계"""
+        return self.cache.stats()
     
     async def correct_text_with_context(
         self,
         raw_text: str,
-        scenario_context: str
+        scenario_context: str,
+        scenario_id: Optional[str] = None
     ) -> str:
         """
         문맥을 고려하여 STT 결과를 보정
         
+        (시나리오, 프롬프트 템플릿, 정규화된 raw_text)가 같으면 Gemini 호출 없이 캐시 결과를 반환합니다.
+        
         Args:
             raw_text: Google STT로부터 얻은 원본 텍스트
             scenario_context: 현재 시나리오 상황 설명
+            scenario_id: 시나리오 ID (캐시 키, 없으면 상황 설명 해시 사용)
             
         Returns:
             str: 보정된 일본어 텍스트
         """
         # Gemini가 없으면 원본 그대로 반환
         if self.model is None:
-            print("Warning: Gemini not available, returning raw text")
+            logger.warning("Gemini not available, returning raw text")
             return raw_text
         
+        scenario_key = scenario_id or hashlib.sha256(scenario_context.encode("utf-8")).hexdigest()
+        cache_key = CorrectionCache.make_key(scenario_key, self.template_hash, raw_text)
+        cached = await self.cache.get(cache_key)
+        set_span_attributes(cache_hit=cached is not None)
+        if cached is not None:
+            log_payload("Text correction (cache hit): {!r} -> {!r}", raw_text, cached)
+            return cached
+        
+        corrected_text = await self._request_correction(raw_text, scenario_context)
+        if corrected_text is None:
+            # 에러 발생 시 원본 반환 (캐시하지 않음)
+            return raw_text
+        
+        await self.cache.set(cache_key, corrected_text)
+        return corrected_text
+    
+    async def _request_correction(self, raw_text: str, scenario_context: str) -> Optional[str]:
+        """
+        Gemini 보정 요청
+        
+        Returns:
+            Optional[str]: 보정된 텍스트 (응답이 비정상이거나 에러 시 None)
+        """
         model = self.model
+        if model is None:
+            return None
         
         try:
             # 문맥 기반 보정 프롬프트
             prompt = self._create_correction_prompt(raw_text, scenario_context)
             
             # Gemini API 호출 (간결한 응답을 위해 temperature 낮춤)
+            max_output_tokens = 100  # 짧은 문장만 필요
             generation_config = genai.types.GenerationConfig(  # type: ignore
                 temperature=0.1,  # 창의성 최소화, 정확성 최대화
                 top_p=0.9,
                 top_k=20,
-                max_output_tokens=100,  # 짧은 문장만 필요
+                max_output_tokens=max_output_tokens,
             )
             
-            response = await model.generate_content_async(
-                prompt,
-                generation_config=generation_config
-            )
+            breaker = get_circuit_breaker("gemini")
+            limiter = get_rate_limiter("gemini")
+            estimated_tokens = estimate_tokens(prompt, max_output_tokens)
             
-            # 응답 검증 - 디버깅 로그 추가
-            print(f"[DEBUG] TextCorrection - Gemini Response received")
+            async def generate(attempt: HedgeAttempt) -> Any:
+                # 보정/평가/응답이 공유하는 Gemini 할당량 안에서 호출 (차례가 올 때까지 대기)
+                async with breaker.guard(), limiter.limit(tokens=estimated_tokens) as permit:
+                    with track_provider_call("gemini", "correction") as call, attempt.timed():
+                        response = await model.generate_content_async(
+                            prompt,
+                            generation_config=generation_config
+                        )
+                        call.record_bytes(sent=len(prompt.encode()))
+                        call.record_usage(response)
+                    permit.settle(usage_tokens(response))
+                return response
             
+            # 보정은 멱등이므로 느린 호출은 헤지 (설정 시)
+            response = await get_hedge_policy("gemini", "correction").run(generate)
+            
+            # 응답 검증
             if not response.candidates or len(response.candidates) == 0:
-                print("Warning: No candidates in Gemini correction response")
-                return raw_text
+                logger.warning("No candidates in Gemini correction response")
+                return None
             
             candidate = response.candidates[0]
-            print(f"[DEBUG] TextCorrection finish_reason: {candidate.finish_reason}")
+            logger.debug("TextCorrection finish_reason: {}", candidate.finish_reason)
             
             # finish_reason 체크 완화 (Gemini 2.0에서는 값이 다를 수 있음)
             if hasattr(candidate.finish_reason, 'name'):
                 finish_reason_name = candidate.finish_reason.name
-                print(f"[DEBUG] TextCorrection finish_reason name: {finish_reason_name}")
                 if finish_reason_name not in ['STOP', 'MAX_TOKENS']:
-                    print(f"Warning: Gemini correction finish_reason={finish_reason_name}")
-                    return raw_text
+                    logger.warning("Gemini correction finish_reason={}", finish_reason_name)
+                    return None
             elif candidate.finish_reason not in [1, 2]:  # 1=STOP, 2=MAX_TOKENS
-                print(f"Warning: Gemini correction finish_reason={candidate.finish_reason}")
-                return raw_text
+                logger.warning("Gemini correction finish_reason={}", candidate.finish_reason)
+                return None
             
             if not hasattr(response, 'text') or not response.text:
-                print("Warning: No text in Gemini correction response")
-                return raw_text
+                logger.warning("No text in Gemini correction response")
+                return None
             
             # 보정된 텍스트 추출 (불필요한 공백 제거)
             corrected_text = response.text.strip()
@@ -107,16 +184,13 @@ class TextCorrectionService:
             # 따옴표 제거 (Gemini가 가끔 따옴표로 감싸서 반환)
             corrected_text = corrected_text.strip('"').strip("'").strip('「').strip('」')
             
-            print(f"Text Correction: '{raw_text}' -> '{corrected_text}'")
+            log_payload("Text correction: {!r} -> {!r}", raw_text, corrected_text)
             
             return corrected_text
             
         except Exception as e:
-            print(f"Text Correction Error: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            # 에러 발생 시 원본 반환
-            return raw_text
+            logger.opt(exception=e).error("Text correction error: {}", e)
+            return None
     
     def _create_correction_prompt(self, raw_text: str, scenario_context: str) -> str:
         """
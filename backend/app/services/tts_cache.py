@@ -0,0 +1,204 @@
+"""
+Content-addressed on-disk cache for synthesized speech
+텍스트 + 음성 설정 해시를 키로 TTS 결과 파일을 재사용하는 LRU 캐시
+
+파일 쓰기/mtime 갱신/삭제는 이벤트 루프를 막지 않도록 스레드에서 수행하고,
+인덱스(OrderedDict)는 이벤트 루프에서만 갱신합니다.
+"""
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+class TTSCache:
+    """TTS 오디오 파일 캐시 (디스크 LRU, 용량 제한)"""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        url_prefix: str,
+        max_bytes: int,
+        extension: str = "mp3",
+        retention_seconds: float = 600.0
+    ):
+        """
+        Args:
+            cache_dir: 캐시 파일 저장 디렉토리 (정적 파일로 서빙되는 uploads 하위)
+            url_prefix: 캐시 파일 URL prefix (예: /uploads/audio/cache)
+            max_bytes: 캐시 최대 용량 (bytes)
+            extension: 오디오 파일 확장자
+            retention_seconds: URL을 반환한 뒤 이 시간 동안은 용량을 넘어도 삭제하지 않음
+                (클라이언트가 받은 URL로 파일을 내려받기 전에 지워지지 않도록)
+        """
+        self.cache_dir = cache_dir
+        self.url_prefix = url_prefix.rstrip("/")
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.retention_seconds = retention_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # key → (파일 크기, 마지막으로 URL을 반환한 시각) (오래된 순서 → 최근 사용 순서)
+        self._entries: "OrderedDict[str, tuple[int, float]]" = OrderedDict()
+        self._total_bytes = 0
+        # 시나리오 데이터가 URL을 참조하는 항목 (eviction 대상에서 제외)
+        self._pinned: set[str] = set()
+        self._load_index()
+
+    @staticmethod
+    def make_key(
+        text: str,
+        language_code: str,
+        voice_name: str,
+        speaking_rate: float,
+        pitch: float,
+        audio_encoding: str
+    ) -> str:
+        """합성 결과를 결정하는 모든 입력으로부터 캐시 키 생성"""
+        material = "\x1f".join([
+            text,
+            language_code,
+            voice_name,
+            f"{speaking_rate:.3f}",
+            f"{pitch:.3f}",
+            audio_encoding,
+        ])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _load_index(self) -> None:
+        """기존 캐시 파일을 mtime 순으로 인덱싱 (재시작 후에도 LRU 순서 유지)"""
+        files = []
+        for path in self.cache_dir.glob(f"*.{self.extension}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path.stem, stat.st_size))
+
+        for mtime, key, size in sorted(files):
+            self._entries[key] = (size, mtime)
+            self._total_bytes += size
+
+        # 서버 시작 시 한 번이므로 동기 삭제
+        self._unlink(self._select_victims())
+
+    def path_for(self, key: str) -> Path:
+        """캐시 키에 해당하는 파일 경로"""
+        return self.cache_dir / f"{key}.{self.extension}"
+
+    def url_for(self, key: str) -> str:
+        """캐시 키에 해당하는 파일 URL"""
+        return f"{self.url_prefix}/{key}.{self.extension}"
+
+    def contains(self, key: str) -> bool:
+        """캐시 존재 여부 확인 (hit/miss 카운트와 LRU 순서에 영향 없음)"""
+        return key in self._entries and self.path_for(key).exists()
+
+    def pin(self, key: str) -> None:
+        """URL이 시나리오 데이터에 저장되는 항목은 용량 초과 시에도 삭제하지 않음"""
+        self._pinned.add(key)
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        캐시 조회
+
+        Returns:
+            Optional[str]: 캐시된 파일 URL (없으면 None)
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            # 인덱스를 먼저 갱신해 두면 mtime 갱신을 기다리는 동안 다른 put()이 이 항목을 지우지 않음
+            self._entries[key] = (entry[0], time.time())
+            self._entries.move_to_end(key)
+            try:
+                # mtime 갱신으로 LRU 순서를 디스크에도 기록
+                await asyncio.to_thread(os.utime, self.path_for(key))
+            except FileNotFoundError:
+                # 다른 워커가 eviction한 경우
+                removed = self._entries.pop(key, None)
+                if removed is not None:
+                    self._total_bytes -= removed[0]
+            else:
+                self.hits += 1
+                return self.url_for(key)
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, audio_content: bytes) -> str:
+        """
+        캐시 저장 (임시 파일에 쓴 뒤 rename으로 원자적 교체)
+
+        Returns:
+            str: 저장된 파일 URL
+        """
+        await asyncio.to_thread(self._write_file, self.path_for(key), audio_content)
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._total_bytes -= previous[0]
+        self._entries[key] = (len(audio_content), time.time())
+        self._total_bytes += len(audio_content)
+
+        victims = self._select_victims(keep=key)
+        if victims:
+            await asyncio.to_thread(self._unlink, victims)
+
+        return self.url_for(key)
+
+    @staticmethod
+    def _write_file(path: Path, audio_content: bytes) -> None:
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "wb") as out:
+            out.write(audio_content)
+        os.replace(temp_path, path)
+
+    def _select_victims(self, keep: Optional[str] = None) -> list[str]:
+        """
+        용량 초과 시 가장 오래 사용되지 않은 항목부터 인덱스에서 제거하고 삭제할 키 목록 반환
+
+        고정(pin)된 항목과 최근 retention_seconds 안에 URL을 반환한 항목은 건너뛰므로
+        용량을 일시적으로 넘을 수 있습니다.
+        """
+        victims: list[str] = []
+        retain_after = time.time() - self.retention_seconds
+        for key, (size, last_used) in list(self._entries.items()):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if key == keep or key in self._pinned:
+                continue
+            if last_used >= retain_after:
+                # 이후 항목은 모두 더 최근에 사용됨
+                break
+            del self._entries[key]
+            self._total_bytes -= size
+            self.evictions += 1
+            victims.append(key)
+        return victims
+
+    def _unlink(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            try:
+                self.path_for(key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "pinned": len(self._pinned),
+            "size_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -1,13 +1,28 @@
 """
 Text-to-Speech service using Google Cloud TTS
 """
+import asyncio
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+from loguru import logger
 from app.config import get_settings
+from app.services.tts_cache import TTSCache
+from app.utils.circuit_breaker import get_circuit_breaker
+from app.utils.hedging import HedgeAttempt, get_hedge_policy
+from app.utils.metrics import track_provider_call
+from app.utils.rate_limit import get_rate_limiter
+from app.utils.tracing import set_span_attributes
 
 settings = get_settings()
 
+# 일본어 음성 설정 (캐시 키에 포함됨)
+TTS_LANGUAGE_CODE = "ja-JP"
+TTS_VOICE_NAME = "ja-JP-Wavenet-A"  # 자연스러운 여성 음성
+TTS_SPEAKING_RATE = 1.0
+TTS_PITCH = 0.0
+TTS_AUDIO_ENCODING = "MP3"
+
 
 class TTSService:
     """텍스트를 음성으로 변환하는 서비스"""
@@ -20,7 +35,17 @@ class TTSService:
         base_dir = Path(__file__).parent.parent.parent
         self.upload_dir = base_dir / "uploads" / "audio"
         self.upload_dir.mkdir(parents=True, exist_ok=True)
-        print(f"TTS upload_dir initialized: {self.upload_dir.absolute()}")
+        logger.debug("TTS upload_dir initialized: {}", self.upload_dir.absolute())
+        
+        # 동일 텍스트/음성 설정은 API 호출 없이 기존 파일 재사용
+        self.cache = TTSCache(
+            cache_dir=self.upload_dir / "cache",
+            url_prefix="/uploads/audio/cache",
+            max_bytes=settings.tts_cache_max_mb * 1024 * 1024,
+            retention_seconds=settings.tts_cache_retention_seconds
+        )
+        # 같은 키에 대한 동시 합성 요청은 하나의 API 호출로 합침
+        self._inflight: dict[str, asyncio.Task] = {}
         
         # Google Cloud TTS 클라이언트 초기화 (지연 로딩)
         self.client = None
@@ -35,51 +60,105 @@ class TTSService:
         self._initialized = True
         
         # Google Cloud TTS 클라이언트 초기화
-        print(f"TTS Service init: credentials_path={self.credentials_path}")
+        logger.debug("TTS Service init: credentials_path={}", self.credentials_path)
         if self.credentials_path and os.path.exists(self.credentials_path):
             try:
                 os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = self.credentials_path
-                print(f"Setting GOOGLE_APPLICATION_CREDENTIALS for TTS: {self.credentials_path}")
                 from google.cloud import texttospeech
                 self.client = texttospeech.TextToSpeechAsyncClient()
                 self.texttospeech = texttospeech
-                print("Google Cloud TTS client initialized successfully")
+                logger.info("Google Cloud TTS client initialized")
             except ImportError:
-                print("Warning: google-cloud-texttospeech not installed")
+                logger.warning("google-cloud-texttospeech not installed")
                 self.client = None
                 self.texttospeech = None
             except Exception as e:
-                print(f"Warning: Google Cloud TTS client initialization failed: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.opt(exception=e).warning("Google Cloud TTS client initialization failed: {}", e)
                 self.client = None
                 self.texttospeech = None
         else:
-            print(f"Warning: TTS credentials file not found at {self.credentials_path}")
+            logger.warning("TTS credentials file not found at {}", self.credentials_path)
+            self.client = None
+            self.texttospeech = None
+    
+    async def warmup(self) -> None:
+        """
+        서버 시작 시 클라이언트 생성 및 연결 (list_voices로 채널과 인증 토큰 준비)
+        """
+        self._ensure_client_initialized()
+        if self.client is None:
+            return
+        await self.client.list_voices(language_code=TTS_LANGUAGE_CODE)
+        logger.info("TTS client connected")
+    
+    async def close(self) -> None:
+        """진행 중인 합성 취소 후 클라이언트 종료"""
+        for task in list(self._inflight.values()):
+            task.cancel()
+        await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+        if self.client is not None:
+            await self.client.transport.close()
             self.client = None
             self.texttospeech = None
+            self._initialized = False
     
-    async def synthesize_speech(
-        self,
-        text: str,
-        interaction_id: str
-    ) -> Optional[str]:
+    def cache_key(self, text: str) -> str:
+        """현재 음성 설정 기준 캐시 키"""
+        return TTSCache.make_key(
+            text=text,
+            language_code=TTS_LANGUAGE_CODE,
+            voice_name=TTS_VOICE_NAME,
+            speaking_rate=TTS_SPEAKING_RATE,
+            pitch=TTS_PITCH,
+            audio_encoding=TTS_AUDIO_ENCODING
+        )
+    
+    def cached_audio_path(self, text: str) -> Optional[Path]:
+        """합성되어 캐시에 있는 음성 파일 경로 (없으면 None)"""
+        key = self.cache_key(text)
+        return self.cache.path_for(key) if self.cache.contains(key) else None
+    
+    def cache_stats(self) -> dict:
+        """TTS 캐시 hit/miss 통계"""
+        return self.cache.stats()
+    
+    async def synthesize_speech(self, text: str) -> Optional[str]:
         """
         Synthesize speech from text using Google Cloud TTS
         
+        텍스트와 음성 설정이 같으면 캐시된 파일 URL을 API 호출 없이 반환합니다.
+        
         Args:
             text: 변환할 텍스트
-            interaction_id: 인터랙션 ID (파일명 생성용)
             
         Returns:
             Optional[str]: 생성된 음성 파일 URL
         """
+        key = self.cache_key(text)
+        
+        cached_url = await self.cache.get(key)
+        set_span_attributes(cache_hit=bool(cached_url), coalesced=not cached_url and key in self._inflight)
+        if cached_url:
+            logger.debug("TTS cache hit: {}", cached_url)
+            return cached_url
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._synthesize_and_cache(key, text))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # 한 요청이 취소되어도 같은 텍스트를 기다리는 다른 요청에는 영향 없음
+        return await asyncio.shield(task)
+    
+    async def _synthesize_and_cache(self, key: str, text: str) -> Optional[str]:
+        """Google Cloud TTS 호출 후 캐시에 저장"""
         # 클라이언트 초기화 확인
         self._ensure_client_initialized()
         
         if not self.client or not self.texttospeech:
             # TTS 서비스가 없으면 None 반환
-            print("Warning: TTS client is None, skipping speech synthesis")
+            logger.warning("TTS client is None, skipping speech synthesis")
             return None
         
         try:
@@ -88,39 +167,40 @@ class TTSService:
             
             # 일본어 음성 설정
             voice = self.texttospeech.VoiceSelectionParams(
-                language_code="ja-JP",
-                name="ja-JP-Wavenet-A",  # 자연스러운 여성 음성
+                language_code=TTS_LANGUAGE_CODE,
+                name=TTS_VOICE_NAME,
                 ssml_gender=self.texttospeech.SsmlVoiceGender.FEMALE
             )
             
             # 오디오 설정
             audio_config = self.texttospeech.AudioConfig(
-                audio_encoding=self.texttospeech.AudioEncoding.MP3,
-                speaking_rate=1.0,
-                pitch=0.0
+                audio_encoding=getattr(self.texttospeech.AudioEncoding, TTS_AUDIO_ENCODING),
+                speaking_rate=TTS_SPEAKING_RATE,
+                pitch=TTS_PITCH
             )
             
-            # TTS API 호출
-            response = await self.client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice,
-                audio_config=audio_config
-            )
+            client = self.client
             
-            # 오디오 파일 저장
-            filename = f"{interaction_id}_response.mp3"
-            filepath = self.upload_dir / filename
+            async def synthesize(attempt: HedgeAttempt) -> Any:
+                async with get_circuit_breaker("google_tts").guard(), get_rate_limiter("google_tts").limit():
+                    with track_provider_call("google_tts", "synthesize") as call, attempt.timed():
+                        response = await client.synthesize_speech(
+                            input=synthesis_input,
+                            voice=voice,
+                            audio_config=audio_config
+                        )
+                        call.record_bytes(sent=len(text.encode()), received=len(response.audio_content))
+                return response
             
-            with open(filepath, "wb") as out:
-                out.write(response.audio_content)
+            # TTS API 호출 (같은 입력이면 같은 음성이므로 느린 호출은 헤지, 설정 시)
+            response = await get_hedge_policy("google_tts", "synthesize").run(synthesize)
             
-            print(f"TTS file saved: {filepath}")
-            print(f"TTS file exists: {filepath.exists()}")
+            # 오디오 파일 저장 (uploads/audio/cache/{hash}.mp3)
+            url = await self.cache.put(key, response.audio_content)
+            logger.debug("TTS file saved: {}", self.cache.path_for(key))
             
-            # URL 반환 (uploads/audio/ 디렉토리에 저장)
-            return f"/uploads/audio/{filename}"
+            return url
             
         except Exception as e:
-            print(f"TTS Error: {str(e)}")
+            logger.error("TTS error: {}", e)
             return None
-
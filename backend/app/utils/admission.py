@@ -0,0 +1,196 @@
+"""
+Admission control for interaction requests
+동시 처리 수 제한 + 사용자별 공정 대기열 + 대기 시간 기한 초과 시 즉시 거절 (503 + Retry-After)
+
+버스트가 그대로 STT/Gemini/Azure로 퍼져 할당량에 걸리고 모든 요청이 함께 느려지는 대신,
+처리할 수 있는 만큼만 받고 나머지는 일찍 거절하여 받아들인 요청의 p99를 유지합니다.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from app.utils.exceptions import ServiceOverloadedError
+from app.utils.metrics import ADMISSION_QUEUE_WAIT
+
+SERVICE_NAME = "Interaction admission"
+
+# 처리 시간 이동 평균(EWMA) 가중치
+SERVICE_TIME_ALPHA = 0.2
+
+REJECT_QUEUE_FULL = "queue_full"
+REJECT_DEADLINE = "deadline"  # 예상 대기 시간이 기한 초과
+REJECT_TIMEOUT = "timeout"  # 실제로 기한까지 기다렸지만 차례가 오지 않음
+
+
+class AdmissionTicket:
+    """입장 허가 (처리가 끝나면 release, 여러 번 호출해도 안전)"""
+
+    def __init__(self, controller: "AdmissionController", waited_seconds: float):
+        self.controller = controller
+        self.waited_seconds = waited_seconds
+        self._admitted_at = time.perf_counter()
+        self._released = False
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self.controller._release(time.perf_counter() - self._admitted_at)
+
+
+class AdmissionController:
+    """
+    동시 처리 수 제한기 (사용자별 라운드 로빈 대기열)
+
+    슬롯이 비면 대기 중인 사용자를 차례로 돌며 한 명씩 입장시키므로,
+    한 사용자가 요청을 몰아 보내도 다른 사용자의 대기 순서는 밀리지 않습니다.
+    이벤트 루프 스레드에서만 사용합니다.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_deadline_seconds: float):
+        """
+        Args:
+            max_concurrent: 동시에 처리할 최대 인터랙션 수 (0 이하이면 제한 없음)
+            max_queue: 전체 대기열 길이 (초과 시 즉시 거절)
+            queue_deadline_seconds: 최대 대기 시간 (예상 대기 시간이 넘으면 즉시, 실제로 넘으면 그 시점에 거절)
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_deadline_seconds = queue_deadline_seconds
+        # 사용자 키 → 대기 중인 future (맨 앞 사용자가 다음 차례)
+        self._queues: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self._service_time: Optional[float] = None
+
+        self.active = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = {REJECT_QUEUE_FULL: 0, REJECT_DEADLINE: 0, REJECT_TIMEOUT: 0}
+        self.total_wait_seconds = 0.0
+
+    @asynccontextmanager
+    async def admit(self, key: str) -> AsyncIterator[AdmissionTicket]:
+        """블록 실행 동안 슬롯 점유 (acquire + release)"""
+        ticket = await self.acquire(key)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    async def acquire(self, key: str) -> AdmissionTicket:
+        """
+        슬롯 획득 (없으면 key의 대기열에서 차례를 기다림)
+
+        Args:
+            key: 공정 대기열 키 (사용자 ID, 없으면 클라이언트 주소)
+
+        Raises:
+            ServiceOverloadedError: 대기열이 가득 찼거나 대기 시간이 기한을 넘는 경우
+        """
+        if self.max_concurrent <= 0 or (self.active < self.max_concurrent and not self.queued):
+            self.active += 1
+            return self._admit(0.0)
+
+        if self.queued >= self.max_queue:
+            self._reject(REJECT_QUEUE_FULL, f"queue is full ({self.queued} waiting)")
+        estimated = self._estimate_wait(key)
+        if estimated is not None and estimated > self.queue_deadline_seconds:
+            self._reject(REJECT_DEADLINE, f"estimated wait {estimated:.1f}s exceeds deadline", estimated)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append(future)
+        self.queued += 1
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.queue_deadline_seconds):
+                await future
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # 슬롯을 넘겨받은 직후 취소/타임아웃 → 다음 대기자에게 넘김
+                self._release_slot()
+            else:
+                future.cancel()
+                self._remove_waiter(key, future)
+            if isinstance(e, TimeoutError):
+                self._reject(REJECT_TIMEOUT, f"waited {self.queue_deadline_seconds:.1f}s without a free slot")
+            raise
+        # 슬롯은 _release_slot()에서 active를 유지한 채 넘겨받음
+        return self._admit(time.perf_counter() - started)
+
+    def _admit(self, waited_seconds: float) -> AdmissionTicket:
+        self.admitted += 1
+        self.total_wait_seconds += waited_seconds
+        ADMISSION_QUEUE_WAIT.observe(waited_seconds)
+        return AdmissionTicket(self, waited_seconds)
+
+    def _estimate_wait(self, key: str) -> Optional[float]:
+        """
+        key의 새 요청이 입장하기까지 예상 대기 시간 (초, 처리 시간 기록이 없으면 None)
+
+        라운드 로빈에서는 같은 사용자의 대기 요청 수(own)만큼 다른 사용자도 최대 own + 1개씩 먼저 들어갑니다.
+        """
+        if self._service_time is None:
+            return None
+        own = len(self._queues.get(key, ()))
+        ahead = own + sum(min(len(queue), own + 1) for other, queue in self._queues.items() if other != key)
+        return (ahead + 1) * self._service_time / self.max_concurrent
+
+    def _retry_after(self, estimated: Optional[float] = None) -> int:
+        """클라이언트 재시도 권장 시간 (초, 현재 대기열이 빠지는 데 걸리는 시간 기준)"""
+        if estimated is None and self._service_time is not None:
+            estimated = (self.queued + 1) * self._service_time / self.max_concurrent
+        return max(1, math.ceil(estimated if estimated is not None else self.queue_deadline_seconds))
+
+    def _reject(self, reason: str, details: str, estimated: Optional[float] = None) -> None:
+        self.rejected[reason] += 1
+        raise ServiceOverloadedError(
+            service_name=SERVICE_NAME,
+            retry_after=self._retry_after(estimated),
+            details=f"{details} ({self.active} active, {self.max_concurrent} max)"
+        )
+
+    def _release(self, held_seconds: float) -> None:
+        if self._service_time is None:
+            self._service_time = held_seconds
+        else:
+            self._service_time += SERVICE_TIME_ALPHA * (held_seconds - self._service_time)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        """슬롯 반납 (대기자가 있으면 다음 차례 사용자에게 바로 넘김)"""
+        while self._queues:
+            key, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            self.queued -= 1
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def _remove_waiter(self, key: str, future: asyncio.Future) -> None:
+        queue = self._queues.get(key)
+        if queue is None or future not in queue:
+            return
+        queue.remove(future)
+        self.queued -= 1
+        if not queue:
+            del self._queues[key]
+
+    def stats(self) -> dict:
+        """동시 처리/대기열 현황"""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": self.queued,
+            "queued_users": len(self._queues),
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "avg_wait_ms": round(self.total_wait_seconds / self.admitted * 1000, 2) if self.admitted else 0.0,
+            "service_time_ms": round(self._service_time * 1000, 2) if self._service_time is not None else None,
+        }
@@ -0,0 +1,286 @@
+"""
+Audio format helpers
+매직 바이트 기반 포맷 감지, WAV 헤더 파싱, ffmpeg 파이프 변환 (stdin/stdout으로 처리, 탐색이 필요한 컨테이너만 임시 파일 사용)
+업로드는 ingest_audio()로 한 번만 디코딩하여 STT와 Azure가 같은 PCM 버퍼를 공유합니다.
+"""
+import os
+import struct
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from typing import Optional, Union
+from loguru import logger
+from app.utils.executors import get_executor
+
+# Azure Speech / Google STT가 기대하는 표준 포맷
+TARGET_SAMPLE_RATE = 16000
+TARGET_CHANNELS = 1
+TARGET_BITS_PER_SAMPLE = 16
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+FFMPEG_TIMEOUT_SECONDS = 10
+
+# 컨테이너/코덱 식별자 (detect_audio_format 반환값)
+FORMAT_PCM = "pcm"  # 헤더 없는 s16le (CanonicalAudio)
+FORMAT_WAV = "wav"
+FORMAT_AMR_WB = "amr_wb"
+FORMAT_AMR_NB = "amr_nb"
+FORMAT_MP3 = "mp3"
+FORMAT_MP4 = "mp4"  # m4a/aac 포함
+FORMAT_OGG = "ogg"
+FORMAT_FLAC = "flac"
+FORMAT_WEBM = "webm"
+FORMAT_UNKNOWN = "unknown"
+
+
+def detect_audio_format(data: Union[bytes, memoryview]) -> str:
+    """
+    매직 바이트로 실제 컨테이너/코덱 감지 (파일 확장자는 신뢰하지 않음)
+
+    Args:
+        data: 오디오 바이너리 데이터 (앞부분만 있어도 됨)
+
+    Returns:
+        str: FORMAT_* 식별자
+    """
+    head = bytes(data[:16])
+    if head[0:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return FORMAT_WAV
+    # "#!AMR-WB\n"이 "#!AMR\n"보다 먼저 검사되어야 함
+    if head.startswith(b"#!AMR-WB\n"):
+        return FORMAT_AMR_WB
+    if head.startswith(b"#!AMR\n"):
+        return FORMAT_AMR_NB
+    if head[4:8] == b"ftyp":
+        return FORMAT_MP4
+    if head.startswith(b"OggS"):
+        return FORMAT_OGG
+    if head.startswith(b"fLaC"):
+        return FORMAT_FLAC
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return FORMAT_WEBM
+    if head.startswith(b"ID3") or (len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return FORMAT_MP3
+    return FORMAT_UNKNOWN
+
+
+@dataclass(frozen=True)
+class CanonicalAudio:
+    """한 번 디코딩된 표준 PCM 오디오 (16kHz, mono, s16le, 헤더 없음)"""
+    pcm: memoryview
+    source_format: str
+    sample_rate: int = TARGET_SAMPLE_RATE
+    channels: int = TARGET_CHANNELS
+
+    @property
+    def num_samples(self) -> int:
+        return len(self.pcm) // (TARGET_BITS_PER_SAMPLE // 8) // self.channels
+
+    @property
+    def duration_ms(self) -> int:
+        return self.num_samples * 1000 // self.sample_rate
+
+    def as_bytes(self) -> bytes:
+        """
+        bytes만 받는 SDK에 넘길 PCM 데이터
+
+        view가 원본 bytes 전체를 가리키면(ffmpeg 출력) 원본 객체를 그대로 반환하여 복사하지 않습니다.
+        WAV 헤더를 잘라낸 view처럼 일부만 가리키는 경우에만 한 번 복사합니다.
+        """
+        backing = self.pcm.obj
+        if isinstance(backing, bytes) and len(self.pcm) == len(backing):
+            return backing
+        return self.pcm.tobytes()
+
+
+@dataclass(frozen=True)
+class WavInfo:
+    """WAV 헤더 정보"""
+    audio_format: int
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+    data_offset: int  # data 청크 본문 시작 위치
+    data_size: int  # data 청크 본문 길이 (바이트)
+
+    @property
+    def is_target_format(self) -> bool:
+        """16kHz, mono, 16-bit PCM 여부 (변환 불필요)"""
+        return (
+            self.audio_format in (WAVE_FORMAT_PCM, WAVE_FORMAT_EXTENSIBLE)
+            and self.sample_rate == TARGET_SAMPLE_RATE
+            and self.channels == TARGET_CHANNELS
+            and self.bits_per_sample == TARGET_BITS_PER_SAMPLE
+        )
+
+
+def parse_wav_header(data: bytes) -> Optional[WavInfo]:
+    """
+    RIFF/WAVE 헤더 파싱 (fmt, data 청크 탐색)
+
+    스트리밍으로 기록되어 크기 필드가 비어 있는(0 또는 0xFFFFFFFF) WAV는
+    data 청크가 파일 끝까지 이어진다고 간주합니다.
+    data 길이는 샘플(블록) 경계로 내림합니다 (잘린 마지막 샘플은 버림).
+
+    Args:
+        data: 오디오 바이너리 데이터
+
+    Returns:
+        Optional[WavInfo]: WAV가 아니거나 헤더가 손상된 경우 None
+    """
+    if len(data) < 12 or data[0:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+
+    fmt: Optional[tuple[int, int, int, int]] = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        chunk_size = struct.unpack_from("<I", data, offset + 4)[0]
+        body = offset + 8
+
+        if chunk_id == b"fmt ":
+            if chunk_size < 16 or body + 16 > len(data):
+                return None
+            audio_format, channels, sample_rate, _byte_rate, _block_align, bits = struct.unpack_from(
+                "<HHIIHH", data, body
+            )
+            fmt = (audio_format, channels, sample_rate, bits)
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            available = len(data) - body
+            if chunk_size == 0 or chunk_size > available:
+                chunk_size = available
+            audio_format, channels, sample_rate, bits = fmt
+            block_size = channels * bits // 8
+            if block_size > 0:
+                chunk_size -= chunk_size % block_size
+            return WavInfo(
+                audio_format=audio_format,
+                channels=channels,
+                sample_rate=sample_rate,
+                bits_per_sample=bits,
+                data_offset=body,
+                data_size=chunk_size
+            )
+
+        # 청크는 2바이트 정렬
+        offset = body + chunk_size + (chunk_size & 1)
+
+    return None
+
+
+def _run_ffmpeg(
+    audio_data: bytes,
+    output_args: list[str],
+    timeout: float,
+    input_path: Optional[str] = None
+) -> bytes:
+    """
+    ffmpeg 실행 후 stdout 출력을 돌려받음
+
+    Args:
+        input_path: 입력 파일 경로 (없으면 audio_data를 stdin으로 전달)
+    """
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel", "error",
+        "-i", input_path or "pipe:0",            # 입력 (파일 또는 stdin)
+        "-ar", str(TARGET_SAMPLE_RATE),          # 샘플링 레이트
+        "-ac", str(TARGET_CHANNELS),             # 모노 채널
+        *output_args,
+        "pipe:1",                                # stdout 출력
+    ]
+    result = subprocess.run(
+        cmd,
+        input=None if input_path else audio_data,
+        stdin=subprocess.DEVNULL if input_path else None,
+        capture_output=True,
+        timeout=timeout
+    )
+    if result.returncode != 0 or not result.stdout:
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffmpeg exited with {result.returncode}: {stderr}")
+    return result.stdout
+
+
+def _run_ffmpeg_seekable(audio_data: bytes, output_args: list[str], timeout: float) -> bytes:
+    """탐색(seek)이 필요한 입력용: 임시 파일에 쓴 뒤 파일 경로로 ffmpeg 실행"""
+    fd, path = tempfile.mkstemp(prefix="jscenario_audio_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(audio_data)
+        return _run_ffmpeg(audio_data, output_args, timeout, input_path=path)
+    finally:
+        os.unlink(path)
+
+
+def decode_to_pcm(audio_data: bytes, timeout: float = FFMPEG_TIMEOUT_SECONDS) -> bytes:
+    """
+    ffmpeg으로 헤더 없는 PCM(16kHz, mono, s16le) 디코딩 (블로킹, 워커 스레드에서 호출)
+
+    입력은 stdin, 출력은 stdout 파이프로 주고받아 디스크를 거치지 않습니다.
+    m4a/mp4는 모바일 녹음기 기본값처럼 moov atom이 파일 끝에 있으면 파이프로 읽을 수 없으므로 처음부터 임시 파일을 사용하고,
+    그 외 포맷도 파이프 디코딩이 실패하면 임시 파일로 한 번 더 시도합니다.
+
+    Args:
+        audio_data: 원본 오디오 데이터
+        timeout: ffmpeg 실행 제한 시간 (초)
+
+    Returns:
+        bytes: 16kHz mono s16le PCM
+
+    Raises:
+        FileNotFoundError: ffmpeg이 설치되지 않은 경우
+        subprocess.TimeoutExpired: 제한 시간 초과
+        RuntimeError: ffmpeg이 실패한 경우
+    """
+    output_args = ["-f", "s16le"]
+    if detect_audio_format(audio_data) == FORMAT_MP4:
+        return _run_ffmpeg_seekable(audio_data, output_args, timeout)
+    try:
+        return _run_ffmpeg(audio_data, output_args, timeout)
+    except RuntimeError as e:
+        logger.debug("Pipe decode failed, retrying with a seekable temp file: {}", e)
+        return _run_ffmpeg_seekable(audio_data, output_args, timeout)
+
+
+async def ingest_audio(audio_data: bytes) -> Optional[CanonicalAudio]:
+    """
+    업로드 오디오를 표준 PCM으로 한 번만 디코딩
+
+    16kHz mono 16-bit WAV는 data 청크를 가리키는 view만 만들고(복사/변환 없음),
+    그 외 포맷은 "transcode" executor에서 ffmpeg으로 디코딩합니다.
+
+    Args:
+        audio_data: 업로드된 오디오 바이너리 데이터
+
+    Returns:
+        Optional[CanonicalAudio]: 디코딩 실패 시 None (각 서비스가 원본 바이트로 처리)
+
+    Raises:
+        ExecutorSaturatedError: transcode executor 대기열이 가득 찬 경우
+    """
+    source_format = detect_audio_format(audio_data)
+
+    if source_format == FORMAT_WAV:
+        wav_info = parse_wav_header(audio_data)
+        if wav_info is not None and wav_info.is_target_format:
+            view = memoryview(audio_data)[wav_info.data_offset:wav_info.data_offset + wav_info.data_size]
+            return CanonicalAudio(pcm=view, source_format=source_format)
+
+    try:
+        pcm = await get_executor("transcode").run(decode_to_pcm, audio_data)
+    except FileNotFoundError:
+        logger.warning("ffmpeg not found (install: brew install ffmpeg)")
+        return None
+    except subprocess.TimeoutExpired:
+        logger.warning("ffmpeg decode timeout")
+        return None
+    except RuntimeError as e:
+        logger.warning("Audio decode failed ({}): {}", source_format, e)
+        return None
+    return CanonicalAudio(pcm=memoryview(pcm), source_format=source_format)
@@ -0,0 +1,200 @@
+"""
+Circuit breakers for external providers
+제공자별 최근 실패율이 높으면 회로를 열어 호출 없이 즉시 실패 (SDK 타임아웃까지 기다리지 않음)
+
+closed → (기간 내 실패율 초과) → open → (open_seconds 경과) → half_open: 시험 호출 1회
+  → 성공하면 closed, 실패하면 다시 open
+"""
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from app.config import get_settings
+from app.utils.exceptions import (
+    CircuitOpenError,
+    ExecutorSaturatedError,
+    NoSpeechDetectedError,
+    ServiceOverloadedError,
+)
+
+settings = get_settings()
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# 제공자 장애가 아닌 에러 (속도 제한 대기 거절, 로컬 스레드 풀 포화, 음성이 없는 오디오)
+IGNORED_ERRORS = (ServiceOverloadedError, ExecutorSaturatedError, NoSpeechDetectedError)
+
+
+class CircuitBreaker:
+    """
+    제공자 하나의 회로 차단기 (실패율 기간 + half-open 시험 호출)
+
+    모든 서비스가 같은 인스턴스를 공유합니다 (get_circuit_breaker). 이벤트 루프 스레드에서만 사용합니다.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        window_seconds: float = 30.0,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        open_seconds: float = 15.0,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            provider: 제공자 이름 (지표 라벨, 예: "gemini")
+            window_seconds: 실패율을 계산할 최근 기간
+            min_calls: 기간 내 호출이 이보다 적으면 실패율과 무관하게 회로를 열지 않음
+            failure_rate: 회로를 열 실패율 (0.0 ~ 1.0)
+            open_seconds: 회로를 연 뒤 시험 호출을 허용하기까지의 시간
+            enabled: False면 결과만 기록하고 차단하지 않음
+        """
+        self.provider = provider
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.enabled = enabled
+        # (완료 시각, 실패 여부)
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        self.opened = 0
+        self.fast_failed = 0
+
+    @property
+    def state(self) -> str:
+        """현재 상태 (open_seconds가 지났으면 half_open)"""
+        if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = STATE_HALF_OPEN
+        return self._state
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """
+        회로 상태를 확인하고 블록 결과(성공/실패)를 기록
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있거나 half-open 시험 호출이 이미 진행 중인 경우
+        """
+        probe = self._before_call()
+        try:
+            yield
+        except IGNORED_ERRORS:
+            self._release_probe(probe)
+            raise
+        except Exception:
+            self._record(failed=True, probe=probe)
+            raise
+        except BaseException:
+            # 취소 (헤지 요청에서 진 쪽 등) → 결과로 치지 않음
+            self._release_probe(probe)
+            raise
+        self._record(failed=False, probe=probe)
+
+    def _before_call(self) -> bool:
+        """호출 허용 여부 확인 (반환값: half-open 시험 호출 여부)"""
+        state = self.state
+        if not self.enabled or state == STATE_CLOSED:
+            return False
+        if state == STATE_HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        self.fast_failed += 1
+        retry_in = self.open_seconds - (time.monotonic() - self._opened_at)
+        raise CircuitOpenError(
+            service_name=self.provider,
+            retry_after=max(1, math.ceil(retry_in)),
+            details=f"circuit {state}" + (" (probe in flight)" if state == STATE_HALF_OPEN else "")
+        )
+
+    def _release_probe(self, probe: bool) -> None:
+        if probe:
+            self._probe_in_flight = False
+
+    def _record(self, failed: bool, probe: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, failed))
+        self._failures += failed
+        self._prune(now)
+
+        if probe:
+            self._probe_in_flight = False
+            if failed:
+                self._open(now)
+            else:
+                # 복구됨 → 장애 기간의 기록은 버리고 새로 집계
+                self._state = STATE_CLOSED
+                self._outcomes.clear()
+                self._failures = 0
+            return
+
+        if (
+            self.enabled
+            and self._state == STATE_CLOSED
+            and len(self._outcomes) >= self.min_calls
+            and self._failures / len(self._outcomes) >= self.failure_rate
+        ):
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        self._state = STATE_OPEN
+        self._opened_at = now
+        self.opened += 1
+
+    def _prune(self, now: float) -> None:
+        """기간이 지난 결과 제거"""
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            _, failed = self._outcomes.popleft()
+            self._failures -= failed
+
+    def stats(self) -> dict:
+        """회로 상태 및 최근 실패율"""
+        self._prune(time.monotonic())
+        calls = len(self._outcomes)
+        return {
+            "provider": self.provider,
+            "state": self.state,
+            "window_calls": calls,
+            "window_failures": self._failures,
+            "failure_rate": round(self._failures / calls, 3) if calls else 0.0,
+            "opened": self.opened,
+            "fast_failed": self.fast_failed,
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """
+    제공자별 공유 회로 차단기 조회 (최초 호출 시 생성)
+
+    Args:
+        provider: "gemini", "google_stt", "google_tts", "azure_speech"
+    """
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            provider,
+            window_seconds=settings.circuit_breaker_window_seconds,
+            min_calls=settings.circuit_breaker_min_calls,
+            failure_rate=settings.circuit_breaker_failure_rate,
+            open_seconds=settings.circuit_breaker_open_seconds,
+            enabled=settings.circuit_breaker_enabled
+        )
+        _breakers[provider] = breaker
+    return breaker
+
+
+def circuit_breaker_stats() -> list[dict]:
+    """생성된 모든 회로 차단기의 상태"""
+    return [breaker.stats() for breaker in _breakers.values()]
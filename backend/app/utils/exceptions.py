@@ -28,6 +28,31 @@ class ServiceUnavailableError(ServiceError):
         super().__init__(message, service_name, details)
 
 
+class CircuitOpenError(ServiceUnavailableError):
+    """Provider has been failing and calls are short-circuited until the breaker lets a probe through"""
+    
+    def __init__(self, service_name: str, retry_after: int, details: Optional[str] = None):
+        ServiceError.__init__(
+            self,
+            f"{service_name} is failing repeatedly; calls are suspended for {retry_after} seconds.",
+            service_name,
+            details
+        )
+        self.retry_after = retry_after
+
+
+class ExecutorSaturatedError(ServiceUnavailableError):
+    """Local worker pool for blocking SDK calls is full (server-side backpressure, not a provider failure)"""
+    
+    def __init__(self, service_name: str, details: Optional[str] = None):
+        ServiceError.__init__(
+            self,
+            f"{service_name} is saturated; the request was rejected before reaching the provider.",
+            service_name,
+            details
+        )
+
+
 class ServiceConfigurationError(ServiceError):
     """Service configuration error"""
     
@@ -36,6 +61,15 @@ class ServiceConfigurationError(ServiceError):
         super().__init__(message, service_name, details)
 
 
+class ServiceOverloadedError(ServiceError):
+    """Server is at capacity and rejected the request before processing (client should retry later)"""
+    
+    def __init__(self, service_name: str, retry_after: int, details: Optional[str] = None):
+        message = f"{service_name} is overloaded. Please retry after {retry_after} seconds."
+        super().__init__(message, service_name, details)
+        self.retry_after = retry_after
+
+
 class ServiceExecutionError(ServiceError):
     """Error during service execution"""
     
@@ -43,3 +77,6 @@ class ServiceExecutionError(ServiceError):
         message = f"Error occurred during {service_name} service execution."
         super().__init__(message, service_name, details)
 
+
+class NoSpeechDetectedError(ServiceExecutionError):
+    """Provider processed the audio but found no speech in it (not a provider failure)"""
@@ -0,0 +1,158 @@
+"""
+Named, bounded thread pool executors for blocking SDK calls
+STT, Azure, 오디오 변환이 서로의 스레드를 빼앗지 않도록 분리된 executor와 포화 지표 제공
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+from app.config import get_settings
+from app.utils.exceptions import ExecutorSaturatedError
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """대기열 길이가 제한된 이름 있는 스레드 풀"""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        """
+        Args:
+            name: executor 이름 (스레드 이름 및 지표 라벨)
+            max_workers: 워커 스레드 수
+            max_queue: 모든 워커가 바쁠 때 대기 가능한 작업 수 (초과 시 즉시 거절)
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"{name}-worker"
+        )
+        self._lock = threading.Lock()
+
+        # 이벤트 루프 스레드에서만 변경
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queued_submissions = 0  # 제출 시점에 모든 워커가 바빴던 횟수
+
+        # 워커 스레드에서 변경 (lock 사용)
+        self.running = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        블로킹 함수를 이 executor에서 실행
+
+        Raises:
+            ExecutorSaturatedError: 대기열이 가득 찬 경우 (ServiceUnavailableError 하위 클래스)
+        """
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ExecutorSaturatedError(
+                service_name=f"{self.name} executor",
+                details=f"queue is full ({self.in_flight} in flight, "
+                        f"{self.max_workers} workers, {self.max_queue} queue)"
+            )
+
+        if self.in_flight >= self.max_workers:
+            self.queued_submissions += 1
+        self.in_flight += 1
+        self.submitted += 1
+        submitted_at = time.perf_counter()
+        # 호출한 쪽의 contextvars(로그 interaction_id 등)를 워커 스레드에서도 유지
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+
+        def execute() -> T:
+            wait = time.perf_counter() - submitted_at
+            with self._lock:
+                self.running += 1
+                self.total_wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            try:
+                return call()
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, execute)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> dict:
+        """executor 포화 및 대기 시간 지표"""
+        with self._lock:
+            running = self.running
+            total_wait = self.total_wait_seconds
+            max_wait = self.max_wait_seconds
+        return {
+            "name": self.name,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "running": running,
+            "queued": max(0, self.in_flight - running),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queued_submissions": self.queued_submissions,
+            "avg_wait_ms": round(total_wait / self.submitted * 1000, 2) if self.submitted else 0.0,
+            "max_wait_ms": round(max_wait * 1000, 2),
+        }
+
+    def shutdown(self) -> None:
+        """대기 중인 작업 취소 후 종료"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _executor_sizes() -> dict[str, tuple[int, int]]:
+    """executor 이름 → (워커 수, 대기열 길이)"""
+    return {
+        "stt": (settings.stt_executor_workers, settings.stt_executor_queue),
+        # 세션 턴 수를 SessionManager에서 먼저 제한하므로 대기열 없이 턴마다 스레드 하나
+        "session_stt": (settings.session_max_concurrent_turns, 0),
+        "azure": (settings.azure_executor_workers, settings.azure_executor_queue),
+        "transcode": (settings.transcode_executor_workers, settings.transcode_executor_queue),
+    }
+
+
+_executors: dict[str, BoundedExecutor] = {}
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """
+    이름으로 공유 executor 조회 (최초 호출 시 생성)
+
+    Args:
+        name: "stt", "session_stt", "azure", "transcode"
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        max_workers, max_queue = _executor_sizes()[name]
+        executor = BoundedExecutor(name, max_workers=max_workers, max_queue=max_queue)
+        _executors[name] = executor
+    return executor
+
+
+def executor_stats() -> list[dict]:
+    """생성된 모든 executor의 지표"""
+    return [executor.stats() for executor in _executors.values()]
+
+
+def shutdown_executors() -> None:
+    """모든 executor 종료"""
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
@@ -0,0 +1,225 @@
+"""
+Hedged requests for idempotent provider calls
+첫 호출이 최근 p95 지연 시간 안에 끝나지 않으면 같은 호출을 한 번 더 보내고 먼저 성공한 응답을 사용
+
+부분 장애로 일부 호출만 느려질 때 꼬리 지연 시간(p99)을 줄입니다.
+헤지는 느린 호출(약 5%)에만 발생하고 호출 수 대비 비율 예산을 넘지 않으므로 부하가 크게 늘지 않습니다.
+결과가 같고 부작용이 없는 호출(보정, TTS)에만 사용합니다.
+
+지연 시간은 SDK 호출 구간(HedgeAttempt.timed)만 재므로 속도 제한 대기는 p95에 섞이지 않고,
+헤지에 진 첫 호출은 그때까지의 경과 시간을 하한값(censored)으로 기록해 p95가 점점 낮아지지 않도록 합니다.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
+from app.config import get_settings
+from app.utils.circuit_breaker import STATE_CLOSED, get_circuit_breaker
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+# p95 계산에 사용할 최근 성공 지연 시간 수
+LATENCY_SAMPLES = 200
+# 헤지 예산 최대 적립량 (한가할 때 모아 둔 예산으로 장애 초기에 한꺼번에 헤지하지 않도록)
+MAX_HEDGE_CREDIT = 5.0
+
+
+class HedgeAttempt:
+    """호출 1회의 SDK 호출 구간 기록 (회로 차단기/속도 제한 대기는 제외)"""
+
+    def __init__(self):
+        self.started: Optional[float] = None
+        self.elapsed: Optional[float] = None
+
+    @contextmanager
+    def timed(self) -> Iterator[None]:
+        """SDK 호출만 감싸서 사용 (성공한 경우에만 elapsed 기록)"""
+        self.started = time.perf_counter()
+        yield
+        self.elapsed = time.perf_counter() - self.started
+
+    def running_for(self) -> Optional[float]:
+        """SDK 호출이 시작된 뒤 지난 시간 (아직 시작 전이면 None)"""
+        if self.started is None:
+            return None
+        return time.perf_counter() - self.started
+
+
+class HedgePolicy:
+    """
+    제공자 연산 하나의 헤지 정책 (최근 지연 시간 분포 + 헤지 비율 예산)
+
+    이벤트 루프 스레드에서만 사용합니다.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        operation: str,
+        enabled: bool = False,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        min_delay_seconds: float = 0.05,
+        max_ratio: float = 0.1
+    ):
+        """
+        Args:
+            provider: 제공자 이름 (회로 차단기 조회, 지표 라벨)
+            operation: 연산 이름 (예: "correction")
+            enabled: False면 지연 시간만 기록하고 헤지하지 않음
+            percentile: 헤지 지연으로 사용할 지연 시간 분위수
+            min_samples: 이보다 기록이 적으면 헤지하지 않음
+            min_delay_seconds: 헤지 지연 하한
+            max_ratio: 전체 호출 대비 헤지 비율 상한
+        """
+        self.provider = provider
+        self.operation = operation
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay_seconds = min_delay_seconds
+        self.max_ratio = max_ratio
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._credit = 0.0
+
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0  # 헤지 호출이 먼저 성공한 횟수
+        self.censored = 0  # 헤지에 져서 경과 시간만 하한값으로 기록한 횟수
+
+    def hedge_delay(self) -> Optional[float]:
+        """헤지까지 기다릴 시간 (초, 기록이 부족하면 None)"""
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        rank = max(1, math.ceil(self.percentile / 100 * len(ordered)))
+        return max(self.min_delay_seconds, ordered[rank - 1])
+
+    def _can_hedge(self) -> bool:
+        """헤지 예산이 있고 회로가 정상일 때만 (장애 중인 제공자에 호출을 늘리지 않음)"""
+        return (
+            self.enabled
+            and self._credit >= 1.0
+            and get_circuit_breaker(self.provider).state == STATE_CLOSED
+        )
+
+    async def _attempt(self, call: Callable[[HedgeAttempt], Awaitable[T]], attempt: HedgeAttempt) -> T:
+        """호출 1회 (성공 시 SDK 호출 구간의 지연 시간 기록)"""
+        result = await call(attempt)
+        if attempt.elapsed is not None:
+            self._latencies.append(attempt.elapsed)
+        return result
+
+    async def run(self, call: Callable[[HedgeAttempt], Awaitable[T]]) -> T:
+        """
+        call 실행 (SDK 호출이 p95 지연 안에 끝나지 않으면 한 번 더 호출하고 먼저 성공한 결과 반환)
+
+        Args:
+            call: 호출할 때마다 새 요청을 보내는 함수 (멱등 연산만).
+                  받은 HedgeAttempt의 timed()로 SDK 호출만 감싸야 함
+
+        Returns:
+            먼저 성공한 호출의 결과 (둘 다 실패하면 마지막 에러 발생)
+        """
+        self.calls += 1
+        self._credit = min(MAX_HEDGE_CREDIT, self._credit + self.max_ratio)
+        delay = self.hedge_delay()
+        if delay is None or not self._can_hedge():
+            return await self._attempt(call, HedgeAttempt())
+
+        primary_attempt = HedgeAttempt()
+        primary = asyncio.create_task(self._attempt(call, primary_attempt))
+        attempts = [primary]
+        try:
+            # SDK 호출이 delay만큼 진행될 때까지 대기 (속도 제한 대기 중에 헤지하면 대기열만 늘어남)
+            while True:
+                running_for = primary_attempt.running_for()
+                remaining = delay if running_for is None else delay - running_for
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait({primary}, timeout=remaining)
+                if done:
+                    return await primary
+            if not self._can_hedge():
+                return await primary
+
+            self._credit -= 1.0
+            self.hedged += 1
+            hedge = asyncio.create_task(self._attempt(call, HedgeAttempt()))
+            attempts.append(hedge)
+            pending = set(attempts)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                            self._record_censored(primary_attempt)
+                        return task.result()
+                    error = task.exception()
+            # 두 호출이 모두 실패해야 여기에 도달하므로 error는 항상 설정됨
+            assert error is not None
+            raise error
+        finally:
+            # 진 쪽(또는 호출자 취소 시 남은 호출)은 취소
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+    def _record_censored(self, attempt: HedgeAttempt) -> None:
+        """헤지에 진 호출의 경과 시간을 하한값으로 기록 (실제 지연은 이보다 김)"""
+        running_for = attempt.running_for()
+        if attempt.elapsed is None and running_for is not None:
+            self._latencies.append(running_for)
+            self.censored += 1
+
+    def stats(self) -> dict:
+        """헤지 현황"""
+        delay = self.hedge_delay()
+        return {
+            "provider": self.provider,
+            "operation": self.operation,
+            "enabled": self.enabled,
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "censored": self.censored,
+            "hedge_delay_ms": round(delay * 1000, 1) if delay is not None else None,
+        }
+
+
+_policies: dict[tuple[str, str], HedgePolicy] = {}
+
+
+def get_hedge_policy(provider: str, operation: str) -> HedgePolicy:
+    """
+    (제공자, 연산)별 공유 헤지 정책 조회 (최초 호출 시 생성)
+
+    Args:
+        provider: "gemini", "google_tts"
+        operation: "correction", "synthesize"
+    """
+    key = (provider, operation)
+    policy = _policies.get(key)
+    if policy is None:
+        policy = HedgePolicy(
+            provider,
+            operation,
+            enabled=settings.hedged_requests_enabled,
+            percentile=settings.hedge_delay_percentile,
+            min_samples=settings.hedge_min_samples,
+            min_delay_seconds=settings.hedge_min_delay_ms / 1000,
+            max_ratio=settings.hedge_max_ratio
+        )
+        _policies[key] = policy
+    return policy
+
+
+def hedge_stats() -> list[dict]:
+    """생성된 모든 헤지 정책의 현황"""
+    return [policy.stats() for policy in _policies.values()]
@@ -1,12 +1,25 @@
 """
 Centralized logging configuration
+
+모든 sink는 enqueue=True로 등록되어 로그 호출은 큐에 넣기만 하고,
+실제 stderr/파일 쓰기는 loguru 전용 스레드에서 처리됩니다 (이벤트 루프를 막지 않음).
 """
+import random
 import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
 from loguru import logger
 from app.config import get_settings
 
 settings = get_settings()
 
+# interaction_id가 없는 로그(시작/종료, 백그라운드 작업)에 표시할 값
+NO_INTERACTION_ID = "-"
+
+# 현재 인터랙션의 상세 페이로드 로그 샘플링 여부 (None이면 호출마다 결정)
+_payload_sampled: ContextVar[Optional[bool]] = ContextVar("payload_sampled", default=None)
+
 
 def setup_logging():
     """
@@ -14,18 +27,20 @@ def setup_logging():
     """
     # 기존 핸들러 제거
     logger.remove()
-    
+    logger.configure(extra={"interaction_id": NO_INTERACTION_ID})
+
     # 콘솔 출력 설정
     log_level = "DEBUG" if settings.debug else "INFO"
-    
+
     logger.add(
         sys.stderr,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <magenta>{extra[interaction_id]}</magenta> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
         level=log_level,
-        colorize=True
+        colorize=True,
+        enqueue=True
     )
-    
-    # 파일 로깅 (프로덕션)
+
+    # 파일 로깅 (프로덕션) - JSON Lines로 저장하여 interaction_id 등으로 검색 가능
     if not settings.debug:
         logger.add(
             "logs/app_{time:YYYY-MM-DD}.log",
@@ -33,12 +48,51 @@ def setup_logging():
             retention="30 days",  # 30일 보관
             compression="zip",  # 압축 저장
             level="INFO",
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+            serialize=True,
+            enqueue=True
         )
-    
+
     return logger
 
 
+def _should_sample() -> bool:
+    rate = settings.debug_log_sample_rate
+    return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+@contextmanager
+def interaction_context(interaction_id: str) -> Iterator[None]:
+    """
+    블록 안의 모든 로그에 interaction_id를 붙이고, 상세 페이로드 샘플링 여부를 인터랙션 단위로 결정
+
+    블록 안에서 생성한 asyncio 태스크와 executor 작업도 같은 컨텍스트를 물려받습니다.
+
+    Args:
+        interaction_id: 인터랙션 ID
+    """
+    token = _payload_sampled.set(_should_sample())
+    try:
+        with logger.contextualize(interaction_id=interaction_id):
+            yield
+    finally:
+        _payload_sampled.reset(token)
+
+
+def log_payload(message: str, *args: Any, **kwargs: Any) -> None:
+    """
+    상세 페이로드(전체 JSON, 인식 후보 목록 등)를 DEBUG로 기록 (debug_log_sample_rate 비율로 샘플링)
+
+    같은 인터랙션의 페이로드는 모두 기록되거나 모두 생략됩니다.
+    인자는 loguru 형식({})으로 넘기고, 만드는 비용이 큰 값은 함수로 넘기면 기록할 때만 호출됩니다.
+    """
+    sampled = _payload_sampled.get()
+    if sampled is None:
+        sampled = _should_sample()
+    if sampled:
+        args = tuple(arg() if callable(arg) else arg for arg in args)
+        kwargs = {key: value() if callable(value) else value for key, value in kwargs.items()}
+        logger.opt(depth=1).debug(message, *args, **kwargs)
+
+
 # 전역 로거 인스턴스
 app_logger = setup_logging()
-
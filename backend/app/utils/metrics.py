@@ -0,0 +1,295 @@
+"""
+Prometheus metrics
+파이프라인 스테이지, 외부 API 호출(지연 시간, 페이로드 크기, 토큰), 에러, 동시 처리 수 지표
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from app.utils.circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, circuit_breaker_stats
+from app.utils.executors import executor_stats
+from app.utils.hedging import hedge_stats
+from app.utils.rate_limit import rate_limiter_stats
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# 스테이지/외부 호출 지연 시간 구간 (초) - STT/Gemini는 수백 ms ~ 수 초
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+# 페이로드 크기 구간 (bytes) - 텍스트 수십 바이트 ~ 오디오 수 MB
+BYTES_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+STAGE_DURATION = Histogram(
+    "jscenario_stage_duration_seconds",
+    "Pipeline stage duration",
+    ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+INTERACTION_DURATION = Histogram(
+    "jscenario_interaction_duration_seconds",
+    "End-to-end interaction pipeline duration",
+    ["mode"],
+    buckets=LATENCY_BUCKETS
+)
+INTERACTIONS_IN_FLIGHT = Gauge(
+    "jscenario_interactions_in_flight",
+    "Interactions currently being processed",
+    ["mode"]
+)
+
+PROVIDER_DURATION = Histogram(
+    "jscenario_provider_request_duration_seconds",
+    "External provider call duration",
+    ["provider", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+PROVIDER_BYTES = Histogram(
+    "jscenario_provider_payload_bytes",
+    "External provider payload size",
+    ["provider", "operation", "direction"],
+    buckets=BYTES_BUCKETS
+)
+PROVIDER_TOKENS = Histogram(
+    "jscenario_provider_tokens",
+    "Tokens per external provider call",
+    ["provider", "operation", "kind"],
+    buckets=TOKEN_BUCKETS
+)
+PROVIDER_IN_FLIGHT = Gauge(
+    "jscenario_provider_requests_in_flight",
+    "External provider calls currently in flight",
+    ["provider"]
+)
+
+ADMISSION_QUEUE_WAIT = Histogram(
+    "jscenario_admission_queue_wait_seconds",
+    "Time admitted interactions spent waiting for a slot",
+    buckets=(0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0)
+)
+
+SERVICE_ERRORS = Counter(
+    "jscenario_service_errors_total",
+    "Service errors returned to clients",
+    ["service", "error_type"]
+)
+
+
+class ProviderCall:
+    """진행 중인 외부 호출의 페이로드 크기/토큰 기록기"""
+
+    def __init__(self, provider: str, operation: str):
+        self.provider = provider
+        self.operation = operation
+
+    def record_bytes(self, sent: Optional[int] = None, received: Optional[int] = None) -> None:
+        if sent is not None:
+            PROVIDER_BYTES.labels(self.provider, self.operation, "sent").observe(sent)
+        if received is not None:
+            PROVIDER_BYTES.labels(self.provider, self.operation, "received").observe(received)
+
+    def record_tokens(self, prompt: Optional[int] = None, completion: Optional[int] = None) -> None:
+        if prompt:
+            PROVIDER_TOKENS.labels(self.provider, self.operation, "prompt").observe(prompt)
+        if completion:
+            PROVIDER_TOKENS.labels(self.provider, self.operation, "completion").observe(completion)
+
+    def record_usage(self, response: Any) -> None:
+        """Gemini 응답의 usage_metadata에서 토큰 수 기록"""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            self.record_tokens(
+                prompt=getattr(usage, "prompt_token_count", None),
+                completion=getattr(usage, "candidates_token_count", None)
+            )
+
+
+@contextmanager
+def track_provider_call(provider: str, operation: str) -> Iterator[ProviderCall]:
+    """
+    외부 API 호출 계측 (지연 시간, 성공/실패/취소, 동시 호출 수)
+
+    헤지 요청에서 진 쪽처럼 취소된 호출은 outcome="cancelled"로 따로 기록합니다 (에러율에 섞지 않음).
+
+    Args:
+        provider: "google_stt", "gemini", "azure_speech", "google_tts"
+        operation: 호출 종류 (예: "recognize", "correction")
+
+    Yields:
+        ProviderCall: 페이로드 크기/토큰 기록기
+    """
+    in_flight = PROVIDER_IN_FLIGHT.labels(provider)
+    in_flight.inc()
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield ProviderCall(provider, operation)
+        outcome = "ok"
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    finally:
+        in_flight.dec()
+        PROVIDER_DURATION.labels(provider, operation, outcome).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def track_interaction(mode: str) -> Iterator[None]:
+    """인터랙션 전체 처리 시간 및 동시 처리 수 계측 (mode: "rest", "stream")"""
+    in_flight = INTERACTIONS_IN_FLIGHT.labels(mode)
+    in_flight.inc()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        in_flight.dec()
+        INTERACTION_DURATION.labels(mode).observe(time.perf_counter() - started)
+
+
+def observe_stage_timings(timings: dict[str, Any]) -> None:
+    """파이프라인 실행 결과의 스테이지별 소요 시간 기록 (StageTiming)"""
+    for timing in timings.values():
+        STAGE_DURATION.labels(timing.name).observe(timing.duration_ms / 1000)
+
+
+def record_service_error(error: Exception) -> None:
+    """ServiceError 하위 클래스별 에러 집계"""
+    service = getattr(error, "service_name", "Unknown")
+    SERVICE_ERRORS.labels(service, type(error).__name__).inc()
+
+
+class RuntimeStatsCollector:
+    """
+    스크레이프 시점의 executor / 캐시 / 세션 통계를 지표로 변환
+
+    이 값들은 이미 각 컴포넌트가 집계하고 있으므로 복제하지 않고 읽기만 합니다.
+    """
+
+    def __init__(
+        self,
+        cache_stats: dict[str, Callable[[], dict]],
+        session_stats: Optional[Callable[[], dict]] = None,
+        admission_stats: Optional[Callable[[], dict]] = None
+    ):
+        """
+        Args:
+            cache_stats: 캐시 이름 → stats() 함수
+            session_stats: 세션 통계 함수 (선택)
+            admission_stats: 인터랙션 입장 제어 통계 함수 (선택)
+        """
+        self.cache_stats = cache_stats
+        self.session_stats = session_stats
+        self.admission_stats = admission_stats
+
+    def collect(self) -> Iterator[Any]:
+        gauges = {
+            key: GaugeMetricFamily(f"jscenario_executor_{key}", f"Executor {key}", labels=["executor"])
+            for key in ("in_flight", "running", "queued", "max_workers", "max_queue", "avg_wait_ms", "max_wait_ms")
+        }
+        counters = {
+            key: CounterMetricFamily(f"jscenario_executor_{key}", f"Executor {key}", labels=["executor"])
+            for key in ("submitted", "completed", "rejected")
+        }
+        for stats in executor_stats():
+            for key, gauge in gauges.items():
+                gauge.add_metric([stats["name"]], stats[key])
+            for key, counter in counters.items():
+                counter.add_metric([stats["name"]], stats[key])
+        yield from gauges.values()
+        yield from counters.values()
+
+        limiter_gauges = {
+            key: GaugeMetricFamily(f"jscenario_rate_limit_{key}", f"Provider rate limiter {key}", labels=["provider"])
+            for key in ("waiting", "avg_wait_ms", "max_wait_ms")
+        }
+        limiter_counters = {
+            key: CounterMetricFamily(f"jscenario_rate_limit_{key}", f"Provider rate limiter {key}", labels=["provider"])
+            for key in ("acquired", "delayed", "rejected", "quota_errors")
+        }
+        for stats in rate_limiter_stats():
+            for key, gauge in limiter_gauges.items():
+                gauge.add_metric([stats["provider"]], stats[key])
+            for key, counter in limiter_counters.items():
+                counter.add_metric([stats["provider"]], stats[key])
+        yield from limiter_gauges.values()
+        yield from limiter_counters.values()
+
+        state = GaugeMetricFamily("jscenario_circuit_state", "Circuit breaker state (1 for the current state)", labels=["provider", "state"])
+        failure_rate = GaugeMetricFamily("jscenario_circuit_failure_rate", "Failure rate in the breaker window", labels=["provider"])
+        opened = CounterMetricFamily("jscenario_circuit_opened", "Times the circuit opened", labels=["provider"])
+        fast_failed = CounterMetricFamily("jscenario_circuit_fast_failed", "Calls rejected while the circuit was open", labels=["provider"])
+        for stats in circuit_breaker_stats():
+            for name in (STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN):
+                state.add_metric([stats["provider"], name], float(stats["state"] == name))
+            failure_rate.add_metric([stats["provider"]], stats["failure_rate"])
+            opened.add_metric([stats["provider"]], stats["opened"])
+            fast_failed.add_metric([stats["provider"]], stats["fast_failed"])
+        yield from (state, failure_rate, opened, fast_failed)
+
+        hedge_families = {
+            key: CounterMetricFamily(f"jscenario_hedge_{key}", f"Hedged request {key}", labels=["provider", "operation"])
+            for key in ("calls", "hedged", "hedge_wins", "censored")
+        }
+        for stats in hedge_stats():
+            for key, counter in hedge_families.items():
+                counter.add_metric([stats["provider"], stats["operation"]], stats[key])
+        yield from hedge_families.values()
+
+        hits = CounterMetricFamily("jscenario_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("jscenario_cache_misses", "Cache misses", labels=["cache"])
+        entries = GaugeMetricFamily("jscenario_cache_entries", "Cache entries", labels=["cache"])
+        size = GaugeMetricFamily("jscenario_cache_size_bytes", "Cache size on disk", labels=["cache"])
+        for name, get_stats in self.cache_stats.items():
+            stats = get_stats()
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            entries.add_metric([name], stats["entries"])
+            if "size_bytes" in stats:
+                size.add_metric([name], stats["size_bytes"])
+        yield from (hits, misses, entries, size)
+
+        if self.session_stats is not None:
+            stats = self.session_stats()
+            yield GaugeMetricFamily("jscenario_sessions_active", "Active conversation sessions", value=stats["active"])
+            yield CounterMetricFamily("jscenario_sessions_opened", "Conversation sessions opened", value=stats["opened"])
+            yield GaugeMetricFamily("jscenario_session_turns_active", "Conversation turns streaming to STT", value=stats["active_turns"])
+            yield CounterMetricFamily("jscenario_session_turns_rejected", "Conversation turns rejected at the concurrency limit", value=stats["rejected_turns"])
+
+        if self.admission_stats is not None:
+            stats = self.admission_stats()
+            yield GaugeMetricFamily("jscenario_admission_active", "Interactions holding an admission slot", value=stats["active"])
+            yield GaugeMetricFamily("jscenario_admission_queue_depth", "Interactions waiting for a slot", value=stats["queued"])
+            yield GaugeMetricFamily("jscenario_admission_queued_users", "Users with waiting interactions", value=stats["queued_users"])
+            yield GaugeMetricFamily("jscenario_admission_max_concurrent", "Admission slot limit", value=stats["max_concurrent"])
+            yield CounterMetricFamily("jscenario_admission_admitted", "Interactions admitted", value=stats["admitted"])
+            rejected = CounterMetricFamily("jscenario_admission_rejected", "Interactions rejected by admission control", labels=["reason"])
+            for reason, count in stats["rejected"].items():
+                rejected.add_metric([reason], count)
+            yield rejected
+
+
+def render_metrics(
+    cache_stats: dict[str, Callable[[], dict]],
+    session_stats: Optional[Callable[[], dict]] = None,
+    admission_stats: Optional[Callable[[], dict]] = None
+) -> bytes:
+    """
+    Prometheus 텍스트 포맷 출력
+
+    Args:
+        cache_stats: 캐시 이름 → stats() 함수
+        session_stats: 세션 통계 함수 (선택)
+        admission_stats: 인터랙션 입장 제어 통계 함수 (선택)
+    """
+    runtime = CollectorRegistry(auto_describe=False)
+    runtime.register(RuntimeStatsCollector(cache_stats, session_stats, admission_stats))
+    return generate_latest(REGISTRY) + generate_latest(runtime)
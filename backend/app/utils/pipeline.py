@@ -0,0 +1,171 @@
+"""
+Stage dependency graph executor
+의존성이 모두 준비된 스테이지를 즉시 시작하는 작은 DAG 실행기
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+from app.utils.tracing import tracer
+
+
+# 스테이지 함수는 지금까지의 결과 dict를 받아 자신의 결과를 반환
+StageFunc = Callable[[dict[str, Any]], Awaitable[Any]]
+
+# 스테이지 완료 콜백 (스테이지 이름, 결과)
+StageCallback = Callable[[str, Any], None]
+
+
+@dataclass
+class Stage:
+    """파이프라인 스테이지 정의"""
+    name: str
+    func: StageFunc
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass
+class StageTiming:
+    """스테이지 실행 시간 기록 (graph 시작 기준 상대 시간, 초)"""
+    name: str
+    started_at: float
+    finished_at: float
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.finished_at - self.started_at) * 1000
+
+
+@dataclass
+class PipelineRun:
+    """파이프라인 실행 결과"""
+    results: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, StageTiming] = field(default_factory=dict)
+    total_ms: float = 0.0
+
+    def summary(self) -> str:
+        """시작 순서대로 정렬된 스테이지 타이밍 요약 문자열"""
+        ordered = sorted(self.timings.values(), key=lambda t: t.started_at)
+        parts = [
+            f"{t.name}={t.duration_ms:.0f}ms(+{t.started_at * 1000:.0f})"
+            for t in ordered
+        ]
+        return f"total={self.total_ms:.0f}ms | " + ", ".join(parts)
+
+    def server_timing(self) -> str:
+        """HTTP Server-Timing 헤더 값 (스테이지별 소요 시간, 시작 순서)"""
+        ordered = sorted(self.timings.values(), key=lambda t: t.started_at)
+        parts = [f"{t.name};dur={t.duration_ms:.1f}" for t in ordered]
+        return ", ".join([*parts, f"total;dur={self.total_ms:.1f}"])
+
+
+class StageGraph:
+    """
+    스테이지 DAG 실행기
+
+    각 스테이지는 선행 스테이지가 모두 끝나는 즉시 시작되므로,
+    전체 지연 시간은 스테이지 합계가 아니라 critical path에 가까워집니다.
+    한 스테이지가 실패하면 나머지 스테이지를 취소하고 원래 예외를 그대로 전파합니다.
+    """
+
+    def __init__(self, stages: list[Stage]):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Duplicate stage names in pipeline")
+        self._validate()
+
+    def _validate(self) -> None:
+        """의존성 누락 및 순환 검사"""
+        for stage in self.stages.values():
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        # Kahn 알고리즘으로 순환 검사
+        indegree = {name: len(stage.depends_on) for name, stage in self.stages.items()}
+        ready = [name for name, degree in indegree.items() if degree == 0]
+        visited = 0
+        while ready:
+            current = ready.pop()
+            visited += 1
+            for stage in self.stages.values():
+                if current in stage.depends_on:
+                    indegree[stage.name] -= 1
+                    if indegree[stage.name] == 0:
+                        ready.append(stage.name)
+        if visited != len(self.stages):
+            raise ValueError("Pipeline stages contain a dependency cycle")
+
+    async def run(
+        self,
+        on_stage_complete: Optional[StageCallback] = None,
+        initial: Optional[dict[str, Any]] = None
+    ) -> PipelineRun:
+        """
+        모든 스테이지 실행
+
+        Args:
+            on_stage_complete: 각 스테이지가 끝날 때마다 호출되는 콜백 (스트리밍용, 선택)
+            initial: 이미 결과가 있는 스테이지 (실행하지 않고 완료된 것으로 간주, 타이밍 없음)
+
+        Returns:
+            PipelineRun: 스테이지별 결과와 타이밍
+        """
+        run = PipelineRun()
+        origin = time.perf_counter()
+        done_events = {name: asyncio.Event() for name in self.stages}
+
+        for name, result in (initial or {}).items():
+            if name not in self.stages:
+                raise ValueError(f"Initial result for unknown stage '{name}'")
+            run.results[name] = result
+            done_events[name].set()
+
+        async def execute(stage: Stage) -> None:
+            for dep in stage.depends_on:
+                await done_events[dep].wait()
+            started = time.perf_counter() - origin
+            # 스테이지마다 span을 열어 스테이지 안의 서비스 호출이 속성을 추가할 수 있게 함
+            with tracer.span(stage.name):
+                run.results[stage.name] = await stage.func(run.results)
+            run.timings[stage.name] = StageTiming(
+                name=stage.name,
+                started_at=started,
+                finished_at=time.perf_counter() - origin
+            )
+            done_events[stage.name].set()
+            if on_stage_complete is not None:
+                on_stage_complete(stage.name, run.results[stage.name])
+
+        tasks = [
+            asyncio.create_task(execute(stage), name=f"stage:{stage.name}")
+            for stage in self.stages.values()
+            if stage.name not in run.results
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # 실패 또는 외부 취소 시 남은 스테이지 정리
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            run.total_ms = (time.perf_counter() - origin) * 1000
+
+        return run
+
+    def critical_path(self, run: PipelineRun) -> list[str]:
+        """가장 늦게 끝난 스테이지에서 선행 스테이지를 역으로 추적한 critical path"""
+        if not run.timings:
+            return []
+        path = []
+        current: Optional[StageTiming] = max(run.timings.values(), key=lambda t: t.finished_at)
+        while current is not None:
+            path.append(current.name)
+            dep_timings = [
+                run.timings[dep]
+                for dep in self.stages[current.name].depends_on
+                if dep in run.timings
+            ]
+            current = max(dep_timings, key=lambda t: t.finished_at) if dep_timings else None
+        return list(reversed(path))
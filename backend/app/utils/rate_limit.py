@@ -0,0 +1,290 @@
+"""
+Client-side rate limiting for external provider calls
+제공자별 토큰 버킷(초당 요청 수, Gemini는 분당 토큰 수)으로 호출을 고르게 펴고, 할당량을 넘기 전에 대기시킴
+
+할당량 초과(429)를 예외로 받고 나서야 알게 되면 동시에 실패한 호출들이 한꺼번에 재시도하며 다시 429를 맞습니다.
+버킷으로 미리 속도를 맞추고, 그래도 429를 받으면 해당 제공자의 호출을 잠시 멈춰 재시도 폭주를 막습니다.
+"""
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+from app.config import get_settings
+from app.utils.exceptions import ServiceOverloadedError
+
+settings = get_settings()
+
+# 할당량 초과 응답으로 판단할 에러 메시지 (Google: 429 RESOURCE_EXHAUSTED, Azure: Too many requests)
+QUOTA_ERROR_MARKERS = ("429", "resource_exhausted", "resource exhausted", "too many requests", "quota")
+
+
+class TokenBucket:
+    """
+    토큰 버킷 (예약 방식)
+
+    토큰을 먼저 차감하고(음수 허용) 부족분이 채워질 때까지의 시간을 돌려주므로,
+    먼저 예약한 호출이 먼저 실행되며 별도 lock이나 대기열이 필요 없습니다.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: 초당 충전량
+            capacity: 최대 적립량 (순간 허용 버스트)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """amount만큼 차감하고 사용 가능해질 때까지의 대기 시간(초) 반환"""
+        self._refill()
+        self.tokens -= amount
+        return max(0.0, -self.tokens / self.rate)
+
+    def refund(self, amount: float) -> None:
+        """예약 취소 또는 실제 사용량이 예약보다 적을 때 반환 (음수면 추가 차감)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+
+class RateLimitPermit:
+    """예약된 호출 허가 (Gemini는 응답의 실제 토큰 수로 정산)"""
+
+    def __init__(self, limiter: "ProviderRateLimiter", reserved_tokens: int, waited_seconds: float):
+        self.limiter = limiter
+        self.reserved_tokens = reserved_tokens
+        self.waited_seconds = waited_seconds
+        self._settled = False
+
+    def settle(self, used_tokens: Optional[int]) -> None:
+        """
+        실제 사용 토큰 수로 정산 (예약보다 적으면 반환, 많으면 추가 차감)
+
+        Args:
+            used_tokens: 응답의 입력 + 출력 토큰 수 (None이면 예약량 그대로 유지)
+        """
+        if self._settled or used_tokens is None or self.limiter._tokens is None:
+            return
+        self._settled = True
+        self.limiter._tokens.refund(self.reserved_tokens - used_tokens)
+
+
+class ProviderRateLimiter:
+    """
+    외부 제공자 하나의 호출 속도 제한기
+
+    모든 서비스가 같은 인스턴스를 공유하므로 (get_rate_limiter) 보정/평가/응답 호출이
+    Gemini 할당량 하나를 함께 나눠 씁니다. 이벤트 루프 스레드에서만 사용합니다.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        requests_per_second: float,
+        tokens_per_minute: float = 0,
+        burst_seconds: float = 1.0,
+        max_wait_seconds: float = 10.0,
+        quota_backoff_seconds: float = 5.0
+    ):
+        """
+        Args:
+            provider: 제공자 이름 (지표 라벨, 예: "gemini")
+            requests_per_second: 초당 요청 수 (0 이하이면 제한 없음)
+            tokens_per_minute: 분당 토큰 수 (0 이하이면 제한 없음)
+            burst_seconds: 버킷 크기 = 초당 허용량 × burst_seconds
+            max_wait_seconds: 예약 대기 시간이 이보다 길면 호출하지 않고 즉시 거절
+            quota_backoff_seconds: 429를 받으면 이 시간 동안 새 호출을 멈춤
+        """
+        self.provider = provider
+        self.requests_per_second = requests_per_second
+        self.tokens_per_minute = tokens_per_minute
+        self.max_wait_seconds = max_wait_seconds
+        self.quota_backoff_seconds = quota_backoff_seconds
+        self._requests: Optional[TokenBucket] = None
+        self._tokens: Optional[TokenBucket] = None
+        if requests_per_second > 0:
+            self._requests = TokenBucket(requests_per_second, max(1.0, requests_per_second * burst_seconds))
+        if tokens_per_minute > 0:
+            tokens_per_second = tokens_per_minute / 60
+            self._tokens = TokenBucket(tokens_per_second, tokens_per_second * burst_seconds)
+        self._paused_until = 0.0
+
+        self.waiting = 0
+        self.acquired = 0
+        self.delayed = 0  # 대기 후 호출된 횟수
+        self.rejected = 0
+        self.quota_errors = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_observed = 0.0
+
+    @asynccontextmanager
+    async def limit(self, tokens: int = 0) -> AsyncIterator[RateLimitPermit]:
+        """
+        속도 제한을 지키며 블록 실행 (차례가 올 때까지 대기, 블록에서 할당량 초과 에러가 나면 호출 일시 중지)
+
+        Args:
+            tokens: 예상 토큰 수 (분당 토큰 제한이 있는 제공자만 사용)
+
+        Raises:
+            ServiceOverloadedError: 예약 대기 시간이 max_wait_seconds를 넘는 경우
+        """
+        permit = await self.acquire(tokens)
+        try:
+            yield permit
+        except BaseException as e:
+            if is_quota_error(e):
+                self.pause(self.quota_backoff_seconds)
+            raise
+
+    async def acquire(self, tokens: int = 0) -> RateLimitPermit:
+        """호출 1회(+토큰) 예약 후 차례가 올 때까지 대기"""
+        reserved_tokens = tokens if self._tokens is not None else 0
+        now = time.monotonic()
+        wait = max(0.0, self._paused_until - now)
+        if self._requests is not None:
+            wait = max(wait, self._requests.reserve(1))
+        if reserved_tokens and self._tokens is not None:
+            wait = max(wait, self._tokens.reserve(reserved_tokens))
+
+        if wait > self.max_wait_seconds:
+            self._cancel(reserved_tokens)
+            self.rejected += 1
+            raise ServiceOverloadedError(
+                service_name=f"{self.provider} rate limit",
+                retry_after=max(1, math.ceil(wait)),
+                details=f"next call slot in {wait:.1f}s exceeds {self.max_wait_seconds:.1f}s"
+            )
+
+        started = time.monotonic()
+        if wait > 0:
+            self.delayed += 1
+            self.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+                # 대기 중에 429로 일시 중지되었으면 재개 시각까지 더 기다림
+                while (remaining := self._paused_until - time.monotonic()) > 0:
+                    await asyncio.sleep(remaining)
+            except BaseException:
+                self._cancel(reserved_tokens)
+                raise
+            finally:
+                self.waiting -= 1
+
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait_seconds += waited
+        self.max_wait_observed = max(self.max_wait_observed, waited)
+        return RateLimitPermit(self, reserved_tokens, waited)
+
+    def _cancel(self, reserved_tokens: int) -> None:
+        """사용하지 않은 예약 반환"""
+        if self._requests is not None:
+            self._requests.refund(1)
+        if reserved_tokens and self._tokens is not None:
+            self._tokens.refund(reserved_tokens)
+
+    def pause(self, seconds: float) -> None:
+        """할당량 초과 응답 후 seconds 동안 새 호출 중지 (대기 중인 호출도 재개 시각까지 대기)"""
+        self.quota_errors += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def stats(self) -> dict:
+        """대기/거절 지표"""
+        return {
+            "provider": self.provider,
+            "requests_per_second": self.requests_per_second,
+            "tokens_per_minute": self.tokens_per_minute,
+            "available_requests": round(self._requests.available(), 2) if self._requests is not None else None,
+            "available_tokens": round(self._tokens.available(), 1) if self._tokens is not None else None,
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "rejected": self.rejected,
+            "quota_errors": self.quota_errors,
+            "paused": self._paused_until > time.monotonic(),
+            "avg_wait_ms": round(self.total_wait_seconds / self.acquired * 1000, 2) if self.acquired else 0.0,
+            "max_wait_ms": round(self.max_wait_observed * 1000, 2),
+        }
+
+
+def is_quota_error(error: BaseException) -> bool:
+    """제공자의 할당량 초과(429) 에러 여부 (google.api_core ResourceExhausted, Azure 취소 사유 등)"""
+    if getattr(error, "code", None) == 429:
+        return True
+    message = f"{type(error).__name__} {error} {getattr(error, 'details', '') or ''}".lower()
+    return any(marker in message for marker in QUOTA_ERROR_MARKERS)
+
+
+def estimate_tokens(text: str, max_output_tokens: int = 0) -> int:
+    """
+    Gemini 호출 토큰 수 추정 (예약용, 응답의 실제 사용량으로 정산)
+
+    영문/숫자는 약 4자당 1토큰, 일본어/한국어 등은 약 1자당 1토큰으로 계산하고 최대 출력 토큰을 더합니다.
+    """
+    ascii_chars = sum(1 for char in text if char.isascii())
+    return (len(text) - ascii_chars) + math.ceil(ascii_chars / 4) + max_output_tokens
+
+
+def usage_tokens(response: Any) -> Optional[int]:
+    """Gemini 응답의 usage_metadata에서 입력 + 출력 토큰 수 (없으면 None)"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return None
+    total = getattr(usage, "total_token_count", None)
+    if total:
+        return total
+    prompt = getattr(usage, "prompt_token_count", None) or 0
+    completion = getattr(usage, "candidates_token_count", None) or 0
+    return (prompt + completion) or None
+
+
+def _limiter_settings() -> dict[str, tuple[float, float]]:
+    """제공자 이름 → (초당 요청 수, 분당 토큰 수)"""
+    return {
+        "gemini": (settings.gemini_rate_limit_rps, settings.gemini_rate_limit_tpm),
+        "google_stt": (settings.google_stt_rate_limit_rps, 0),
+        "google_tts": (settings.google_tts_rate_limit_rps, 0),
+        "azure_speech": (settings.azure_speech_rate_limit_rps, 0),
+    }
+
+
+_limiters: dict[str, ProviderRateLimiter] = {}
+
+
+def get_rate_limiter(provider: str) -> ProviderRateLimiter:
+    """
+    제공자별 공유 속도 제한기 조회 (최초 호출 시 생성)
+
+    Args:
+        provider: "gemini", "google_stt", "google_tts", "azure_speech"
+    """
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        requests_per_second, tokens_per_minute = _limiter_settings()[provider]
+        limiter = ProviderRateLimiter(
+            provider,
+            requests_per_second=requests_per_second,
+            tokens_per_minute=tokens_per_minute,
+            burst_seconds=settings.rate_limit_burst_seconds,
+            max_wait_seconds=settings.rate_limit_max_wait_seconds,
+            quota_backoff_seconds=settings.rate_limit_quota_backoff_seconds
+        )
+        _limiters[provider] = limiter
+    return limiter
+
+
+def rate_limiter_stats() -> list[dict]:
+    """생성된 모든 속도 제한기의 지표"""
+    return [limiter.stats() for limiter in _limiters.values()]
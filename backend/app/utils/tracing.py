@@ -0,0 +1,211 @@
+"""
+Lightweight request tracing
+contextvars 기반 span 계층 (trace_id / parent_id)과 교체 가능한 exporter
+
+OpenTelemetry와 같은 개념(trace, span, attribute, status)을 쓰지만 의존성 없이 동작하며,
+기본 exporter는 끝난 span을 JSON Lines 파일에 한 줄씩 기록합니다 (오프라인 분석용).
+"""
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+from loguru import logger
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    """하나의 작업 구간"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    root: Optional["Span"] = field(default=None, repr=False)  # trace의 최상위 span (자신이면 None)
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_time: float = field(default_factory=time.time)  # epoch (초)
+    status: str = STATUS_OK
+    error: Optional[str] = None
+    duration_ms: Optional[float] = None
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def trace_root(self) -> "Span":
+        return self.root or self
+
+    @property
+    def ended(self) -> bool:
+        return self.duration_ms is not None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter:
+    """끝난 span을 받아 내보내는 exporter 인터페이스"""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class JsonlSpanExporter(SpanExporter):
+    """
+    span을 JSON Lines 파일에 기록
+
+    export()는 큐에 넣기만 하고, 파일 쓰기는 전용 스레드에서 처리합니다 (이벤트 루프를 막지 않음).
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 출력 파일 경로 (없으면 생성, 있으면 이어서 기록)
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._queue: "queue.SimpleQueue[Optional[dict]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write_loop, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        self._queue.put(span.to_dict())
+
+    def _write_loop(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    return
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                # 큐가 비었을 때만 flush (몰려오는 span은 한 번에 기록)
+                if self._queue.empty():
+                    f.flush()
+
+    def shutdown(self) -> None:
+        """남은 span을 기록하고 종료"""
+        self._queue.put(None)
+        self._thread.join(timeout=5.0)
+
+
+class Tracer:
+    """span 생성 및 현재 span 관리"""
+
+    def __init__(self, exporter: Optional[SpanExporter] = None):
+        self.exporter = exporter
+
+    def start_span(self, name: str, parent: Optional[Span] = None, **attributes: Any) -> Span:
+        """
+        span 시작 (현재 span으로 설정하지 않음, end_span()으로 종료)
+
+        Args:
+            name: span 이름
+            parent: 부모 span (None이면 현재 span, 현재 span도 없으면 새 trace 시작)
+            attributes: 초기 속성
+        """
+        parent = parent or _current_span.get()
+        if parent is None:
+            return Span(name=name, trace_id=uuid.uuid4().hex, span_id=uuid.uuid4().hex[:16], attributes=attributes)
+        return Span(
+            name=name,
+            trace_id=parent.trace_id,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id,
+            root=parent.trace_root,
+            attributes=attributes
+        )
+
+    def end_span(self, span: Span) -> None:
+        """span 종료 및 내보내기 (이미 끝난 span은 무시)"""
+        if span.ended:
+            return
+        span.duration_ms = (time.perf_counter() - span._started) * 1000
+        if self.exporter is not None:
+            try:
+                self.exporter.export(span)
+            except Exception as e:
+                logger.warning("Span export failed: {}", e)
+
+    @contextmanager
+    def use_span(self, span: Span, end_on_exit: bool = False) -> Iterator[Span]:
+        """
+        블록 안에서 span을 현재 span으로 사용 (블록에서 생성한 태스크도 물려받음)
+
+        Args:
+            span: 사용할 span
+            end_on_exit: 블록이 끝나면 span도 종료
+        """
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            if end_on_exit:
+                self.end_span(span)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """현재 span의 자식 span을 열고 블록이 끝나면 종료"""
+        with self.use_span(self.start_span(name, **attributes), end_on_exit=True) as span:
+            yield span
+
+
+tracer = Tracer()
+
+
+def configure_tracing(exporter: Optional[SpanExporter]) -> None:
+    """전역 tracer의 exporter 교체 (None이면 span을 만들기만 하고 내보내지 않음)"""
+    if tracer.exporter is not None and tracer.exporter is not exporter:
+        tracer.exporter.shutdown()
+    tracer.exporter = exporter
+
+
+def shutdown_tracing() -> None:
+    """exporter에 남은 span 기록 후 종료"""
+    configure_tracing(None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    """현재 span에 속성 추가 (span 밖에서 호출하면 무시)"""
+    span = _current_span.get()
+    if span is not None:
+        span.set_attributes(**attributes)
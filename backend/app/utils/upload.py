@@ -0,0 +1,146 @@
+"""
+Chunked audio upload ingestion
+업로드를 청크 단위로 읽으며 크기 제한, 포맷 감지를 동시에 처리
+"""
+from dataclasses import dataclass
+from fastapi import HTTPException, UploadFile, status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.audio import FORMAT_UNKNOWN, detect_audio_format
+from app.utils.validators import (
+    MIN_AUDIO_SIZE_BYTES,
+    validate_audio_max_size,
+    validate_audio_metadata,
+    validate_audio_min_size,
+)
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# multipart 본문 중 파일 외 부분 (boundary, 폼 필드) 허용치
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class AudioUpload:
+    """검증이 끝난 오디오 업로드"""
+    data: bytes
+    filename: str
+    size: int
+    detected_format: str  # detect_audio_format() 결과
+
+
+async def read_audio_upload(
+    upload: UploadFile,
+    max_size_mb: int,
+    min_size_bytes: int = MIN_AUDIO_SIZE_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AudioUpload:
+    """
+    업로드 파일을 청크 단위로 읽으며 검증
+
+    - 파일명/확장자는 본문을 읽기 전에 검사
+    - 크기가 이미 알려져 있으면 한 바이트도 읽지 않고 거절
+    - 첫 청크에서 매직 바이트로 포맷을 감지하여 오디오가 아니면 즉시 거절
+    - 읽는 도중 최대 크기를 넘으면 즉시 중단 (413)
+
+    Args:
+        upload: FastAPI UploadFile
+        max_size_mb: 최대 파일 크기 (MB)
+        min_size_bytes: 최소 파일 크기 (bytes)
+        chunk_size: 한 번에 읽을 크기
+
+    Returns:
+        AudioUpload: 본문, 크기, 감지된 포맷
+
+    Raises:
+        HTTPException: 400 (형식 오류, 너무 작음), 413 (너무 큼)
+    """
+    validate_audio_metadata(upload.filename, upload.content_type)
+    if upload.size is not None:
+        validate_audio_max_size(upload.size, max_size_mb)
+
+    chunks: list[bytes] = []
+    total = 0
+    detected_format = FORMAT_UNKNOWN
+
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        if total == 0:
+            detected_format = detect_audio_format(chunk)
+            if detected_format == FORMAT_UNKNOWN:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="오디오 파일 형식을 인식할 수 없습니다"
+                )
+        total += len(chunk)
+        validate_audio_max_size(total, max_size_mb)
+        chunks.append(chunk)
+
+    validate_audio_min_size(total, min_size_bytes)
+
+    return AudioUpload(
+        data=b"".join(chunks),
+        filename=upload.filename or "audio.wav",
+        size=total,
+        detected_format=detected_format
+    )
+
+
+class UploadSizeLimitMiddleware:
+    """
+    업로드 경로의 요청 본문 크기 제한 (multipart 파싱 전 단계)
+
+    Content-Length가 한도를 넘으면 본문을 받지 않고 바로 413을 응답하고,
+    Content-Length 없이(chunked) 들어오는 본문은 누적 크기가 한도를 넘는 순간 수신을 중단합니다.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: int, path_prefix: str):
+        """
+        Args:
+            app: ASGI 앱
+            max_body_bytes: 허용할 최대 요청 본문 크기
+            path_prefix: 제한을 적용할 경로 접두사
+        """
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            response = JSONResponse(
+                {"detail": self._too_large_detail()},
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    # FastAPI가 본문 파싱 중 발생한 HTTPException을 그대로 응답으로 변환
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=self._too_large_detail()
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def _too_large_detail(self) -> str:
+        return f"요청 본문이 최대 크기({self.max_body_bytes / (1024 * 1024):.2f}MB)를 초과했습니다"
@@ -0,0 +1,112 @@
+"""
+Voice activity detection for leading/trailing silence trimming
+프레임 단위 에너지 + 영교차율(ZCR)을 NumPy로 벡터화하여 계산
+"""
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from app.utils.audio import CanonicalAudio
+
+# 프레임 길이 (ms)
+FRAME_MS = 20
+# 잡음 바닥(하위 10% 프레임 에너지)보다 이만큼 크면 음성으로 판단 (dB)
+ENERGY_MARGIN_DB = 10.0
+# 절대 최소 음성 에너지 (dBFS) - 완전 무음 녹음에서 잡음 바닥이 너무 낮아지는 것 방지
+MIN_SPEECH_DB = -50.0
+# 무성 자음(「さ」「し」 등)은 에너지가 낮고 ZCR이 높으므로 별도 기준 적용
+UNVOICED_MARGIN_DB = 4.0
+UNVOICED_MIN_ZCR = 0.25
+
+
+@dataclass(frozen=True)
+class TrimResult:
+    """VAD 트리밍 결과"""
+    audio: CanonicalAudio  # 앞뒤 무음이 제거된 오디오 (원본 버퍼의 view)
+    leading_ms: int  # 앞에서 잘라낸 길이
+    trailing_ms: int  # 뒤에서 잘라낸 길이
+    speech_detected: bool
+
+    @property
+    def trimmed_ms(self) -> int:
+        return self.leading_ms + self.trailing_ms
+
+
+def detect_speech_bounds(
+    pcm: memoryview,
+    sample_rate: int,
+    padding_ms: int = 200
+) -> Optional[tuple[int, int]]:
+    """
+    음성 구간의 시작/끝 샘플 위치 탐지
+
+    Args:
+        pcm: 16-bit mono PCM (little-endian)
+        sample_rate: 샘플링 레이트
+        padding_ms: 음성 구간 앞뒤로 남겨 둘 여유 (단어 첫/끝 음 잘림 방지)
+
+    Returns:
+        Optional[tuple[int, int]]: (시작 샘플, 끝 샘플), 음성을 찾지 못하면 None
+    """
+    usable = len(pcm) - len(pcm) % 2  # 홀수 바이트는 샘플 경계가 아니므로 버림
+    samples = np.frombuffer(pcm[:usable], dtype="<i2")  # 복사 없이 버퍼를 해석
+    frame_len = sample_rate * FRAME_MS // 1000
+    num_frames = len(samples) // frame_len
+    if num_frames == 0:
+        return None
+
+    frames = samples[:num_frames * frame_len].reshape(num_frames, frame_len).astype(np.float32) / 32768.0
+
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    energy_db = 20.0 * np.log10(rms + 1e-10)
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame_len - 1)
+
+    noise_floor = float(np.percentile(energy_db, 10))
+    threshold = max(noise_floor + ENERGY_MARGIN_DB, MIN_SPEECH_DB)
+    voiced = energy_db > threshold
+    unvoiced = (energy_db > max(noise_floor + UNVOICED_MARGIN_DB, MIN_SPEECH_DB)) & (zcr > UNVOICED_MIN_ZCR)
+    speech = voiced | unvoiced
+
+    speech_frames = np.flatnonzero(speech)
+    if speech_frames.size == 0:
+        return None
+
+    padding = sample_rate * padding_ms // 1000
+    start = max(0, int(speech_frames[0]) * frame_len - padding)
+    end = min(len(samples), (int(speech_frames[-1]) + 1) * frame_len + padding)
+    return start, end
+
+
+def trim_silence(audio: CanonicalAudio, padding_ms: int = 200) -> TrimResult:
+    """
+    앞뒤 무음 제거
+
+    결과 오디오는 원본 PCM 버퍼의 view이므로 복사가 발생하지 않습니다.
+    음성을 찾지 못하면 원본을 그대로 반환합니다 (판단은 인식기에 맡김).
+
+    Args:
+        audio: 표준 PCM 오디오
+        padding_ms: 음성 구간 앞뒤로 남겨 둘 여유 (ms)
+
+    Returns:
+        TrimResult: 트리밍된 오디오와 잘라낸 길이
+    """
+    bounds = detect_speech_bounds(audio.pcm, audio.sample_rate, padding_ms)
+    if bounds is None:
+        return TrimResult(audio=audio, leading_ms=0, trailing_ms=0, speech_detected=False)
+
+    start, end = bounds
+    total_samples = audio.num_samples
+    bytes_per_sample = 2 * audio.channels
+    trimmed = CanonicalAudio(
+        pcm=audio.pcm[start * bytes_per_sample:end * bytes_per_sample],
+        source_format=audio.source_format,
+        sample_rate=audio.sample_rate,
+        channels=audio.channels
+    )
+    return TrimResult(
+        audio=trimmed,
+        leading_ms=start * 1000 // audio.sample_rate,
+        trailing_ms=(total_samples - end) * 1000 // audio.sample_rate,
+        speech_detected=True
+    )
@@ -53,18 +53,20 @@ def validate_scenario_id(scenario_id: str) -> None:
         )
 
 
-def validate_audio_file(filename: Optional[str], content_type: Optional[str], file_size: int, max_size_mb: int = 10) -> None:
+# 최소 파일 크기 (너무 작은 파일은 유효하지 않은 오디오일 가능성)
+MIN_AUDIO_SIZE_BYTES = 1024  # 1KB
+
+
+def validate_audio_metadata(filename: Optional[str], content_type: Optional[str]) -> None:
     """
-    Validate audio file
+    Validate audio file name and type (본문을 읽기 전에 검사 가능한 항목)
     
     Args:
         filename: 파일명
         content_type: MIME 타입
-        file_size: 파일 크기 (bytes)
-        max_size_mb: 최대 파일 크기 (MB)
         
     Raises:
-        HTTPException: If file validation fails
+        HTTPException: If file name or extension is invalid
     """
     # 파일명 검증
     if not filename:
@@ -92,8 +94,19 @@ def validate_audio_file(filename: Optional[str], content_type: Optional[str], fi
         if mime_type not in ALLOWED_AUDIO_MIME_TYPES:
             # MIME 타입이 허용 목록에 없어도 확장자가 유효하면 경고만 (엄격하지 않게)
             pass
+
+
+def validate_audio_max_size(file_size: int, max_size_mb: int = 10) -> None:
+    """
+    Validate upper bound of audio size (수신 중에도 호출 가능)
     
-    # 파일 크기 검증
+    Args:
+        file_size: 현재까지의 파일 크기 (bytes)
+        max_size_mb: 최대 파일 크기 (MB)
+        
+    Raises:
+        HTTPException: If file is too large
+    """
     max_size_bytes = max_size_mb * 1024 * 1024
     if file_size > max_size_bytes:
         raise HTTPException(
@@ -101,9 +114,19 @@ def validate_audio_file(filename: Optional[str], content_type: Optional[str], fi
             detail=f"파일 크기가 {max_size_mb}MB를 초과했습니다. "
                    f"현재 크기: {file_size / (1024 * 1024):.2f}MB"
         )
+
+
+def validate_audio_min_size(file_size: int, min_size_bytes: int = MIN_AUDIO_SIZE_BYTES) -> None:
+    """
+    Validate lower bound of audio size (수신 완료 후 호출)
     
-    # 최소 파일 크기 검증 (너무 작은 파일은 유효하지 않은 오디오일 가능성)
-    min_size_bytes = 1024  # 1KB
+    Args:
+        file_size: 파일 크기 (bytes)
+        min_size_bytes: 최소 파일 크기 (bytes)
+        
+    Raises:
+        HTTPException: If file is too small
+    """
     if file_size < min_size_bytes:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -111,6 +134,24 @@ def validate_audio_file(filename: Optional[str], content_type: Optional[str], fi
         )
 
 
+def validate_audio_file(filename: Optional[str], content_type: Optional[str], file_size: int, max_size_mb: int = 10) -> None:
+    """
+    Validate audio file
+    
+    Args:
+        filename: 파일명
+        content_type: MIME 타입
+        file_size: 파일 크기 (bytes)
+        max_size_mb: 최대 파일 크기 (MB)
+        
+    Raises:
+        HTTPException: If file validation fails
+    """
+    validate_audio_metadata(filename, content_type)
+    validate_audio_max_size(file_size, max_size_mb)
+    validate_audio_min_size(file_size)
+
+
 def sanitize_user_id(user_id: Optional[str]) -> Optional[str]:
     """
     Sanitize user ID to prevent injection attacks
@@ -0,0 +1,116 @@
+"""
+Micro-benchmark fixtures
+네트워크 없이 요청마다 실행되는 순수 Python 경로의 입력 데이터
+"""
+import json
+import os
+
+# 외부 API 자격 증명 없이 설정을 읽을 수 있도록 대체 구현 모드로 import
+os.environ.setdefault("STAND_IN_PROVIDERS", "true")
+
+import pytest  # noqa: E402
+from pytest_benchmark.utils import parse_compare_fail  # noqa: E402
+from app.services.interaction_service import InteractionService  # noqa: E402
+
+# --benchmark-compare 실행 시 기본 회귀 기준 (저장된 기준값보다 중앙값이 20% 이상 느려지면 실패)
+# 평균은 GC/스케줄링으로 튀는 소수 라운드에 끌려가고 최솟값도 실행마다 ±30%까지 흔들리지만,
+# 중앙값은 같은 머신에서 반복 실행해도 ±10% 안에 머무르므로 그 두 배를 기준으로 둠
+# 기준값은 비교를 실행할 CI 호스트에서 다시 저장해야 함 (같은 OS/Python이라도 CPU가 다르면 비교 의미 없음)
+REGRESSION_THRESHOLDS = ("median:20%",)
+
+WORDS = ["すみません", "財布", "を", "なくして", "しまい", "まし", "た"]
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("benchmark_compare") and not config.getoption("benchmark_compare_fail"):
+        config.option.benchmark_compare_fail = [parse_compare_fail(t) for t in REGRESSION_THRESHOLDS]
+
+
+@pytest.fixture(scope="session")
+def interaction_service() -> InteractionService:
+    return InteractionService()
+
+
+@pytest.fixture
+def pronunciation_scores() -> dict:
+    """Azure 발음 평가 결과 (점수가 낮은 단어 포함)"""
+    return {
+        "accuracy_score": 82.0,
+        "pronunciation_score": 68.5,
+        "completeness_score": 100.0,
+        "fluency_score": 65.0,
+        "recognized_text": "すみません財布をなくしてしまいました",
+        "word_scores": [
+            {"word": word, "accuracy_score": 55.0 + i * 7, "error_type": "None"}
+            for i, word in enumerate(WORDS)
+        ],
+    }
+
+
+@pytest.fixture
+def grammar_eval() -> dict:
+    return {
+        "grammar_score": 84,
+        "grammar_feedback": "助詞の使い方が少し不自然です",
+        "appropriateness_score": 90,
+        "appropriateness_feedback": "状況に適切です",
+        "better_expressions": [
+            "財布を紛失しました。届け出をお願いします。",
+            "財布をなくしてしまいました。遺失物として届けたいのですが。",
+        ],
+        "coaching_advice": "좋은 시도예요! '財布をなくしてしまいました'라고 말하는 것이 자연스러워요. " * 3,
+    }
+
+
+@pytest.fixture
+def pipeline_results(pronunciation_scores: dict, grammar_eval: dict) -> dict:
+    """_build_response에 전달되는 스테이지 결과"""
+    return {
+        "stt": "すいません、太陽をなくしてしまいました。",
+        "correction": "すみません、財布をなくしてしまいました。",
+        "pronunciation": pronunciation_scores,
+        "grammar": grammar_eval,
+        "reply": "それは大変でしたね。どのような財布ですか？",
+        "tts": "/uploads/audio/cache/5444d7cb66d728b06a9d3661a97f9040e0251ed2475ef88c63328bcafb0ac21e.mp3",
+        "vad": None,
+    }
+
+
+@pytest.fixture
+def gemini_fenced_response(grammar_eval: dict) -> str:
+    """코드 펜스로 감싼 Gemini 문법 평가 응답"""
+    return "```json\n" + json.dumps(grammar_eval, ensure_ascii=False, indent=2) + "\n```"
+
+
+@pytest.fixture
+def azure_result_json() -> str:
+    """Azure SpeechRecognitionResult.json (단어 + 음소 단위 상세 결과)"""
+    words = [
+        {
+            "Word": word,
+            "Offset": i * 4_000_000,
+            "Duration": 3_500_000,
+            "PronunciationAssessment": {"AccuracyScore": 60.0 + i * 5, "ErrorType": "None"},
+            "Phonemes": [
+                {"Phoneme": ch, "PronunciationAssessment": {"AccuracyScore": 80.0}}
+                for ch in word
+            ],
+        }
+        for i, word in enumerate(WORDS)
+    ]
+    return json.dumps({
+        "Id": "0f4c1a2b",
+        "RecognitionStatus": "Success",
+        "DisplayText": "すみません、財布をなくしてしまいました。",
+        "NBest": [
+            {
+                "Confidence": 0.93,
+                "Lexical": "すみません 財布 を なくして しまい まし た",
+                "PronunciationAssessment": {
+                    "AccuracyScore": 82.0, "FluencyScore": 65.0,
+                    "CompletenessScore": 100.0, "PronScore": 68.5,
+                },
+                "Words": words,
+            }
+        ],
+    }, ensure_ascii=False)
@@ -0,0 +1,29 @@
+"""
+외부 API 응답 파싱 및 입력 검증 벤치마크
+"""
+from app.services.azure_pronunciation_service import parse_word_scores
+from app.services.evaluation_service import EvaluationService
+from app.utils.validators import sanitize_user_id, validate_audio_file, validate_scenario_id
+
+
+def test_parse_gemini_fenced_json(benchmark, gemini_fenced_response):
+    def parse() -> dict:
+        return EvaluationService._normalize_grammar_result(
+            EvaluationService._parse_json_response(gemini_fenced_response)
+        )
+
+    assert benchmark(parse)["grammar_score"] == 84
+
+
+def test_parse_azure_word_scores(benchmark, azure_result_json):
+    word_scores = benchmark(parse_word_scores, azure_result_json)
+    assert [w["word"] for w in word_scores][:2] == ["すみません", "財布"]
+
+
+def test_validate_request(benchmark):
+    def validate() -> None:
+        validate_scenario_id("scenario_001_1")
+        validate_audio_file("recording.wav", "audio/wav", 320_044)
+        sanitize_user_id("user_12345")
+
+    benchmark(validate)
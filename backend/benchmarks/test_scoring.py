@@ -0,0 +1,46 @@
+"""
+InteractionService 점수/경험치 계산 및 응답 모델 구성 벤치마크
+"""
+from app.models.interaction import InteractionResponse
+
+
+def test_calculate_overall_score(benchmark, interaction_service, pronunciation_scores):
+    score = benchmark(
+        interaction_service._calculate_overall_score,
+        pronunciation_scores=pronunciation_scores,
+        grammar_score=84,
+        appropriateness_score=90
+    )
+    assert 0 <= score <= 100
+
+
+def test_extract_pronunciation_suggestions(benchmark, interaction_service, pronunciation_scores):
+    suggestions = benchmark(interaction_service._extract_pronunciation_suggestions, pronunciation_scores)
+    assert len(suggestions) == 5
+
+
+def test_calculate_exp(benchmark, interaction_service):
+    def calculate_all() -> list[int]:
+        return [interaction_service._calculate_exp(score) for score in range(0, 101, 5)]
+
+    assert benchmark(calculate_all)[-1] == 250
+
+
+def test_build_response(benchmark, interaction_service, pipeline_results):
+    response = benchmark(
+        interaction_service._build_response,
+        interaction_id="int_0123456789ab",
+        scenario_id="scenario_001_1",
+        results=pipeline_results
+    )
+    assert response.evaluation.corrected_text == pipeline_results["correction"]
+
+
+def test_serialize_response(benchmark, interaction_service, pipeline_results):
+    response = interaction_service._build_response(
+        interaction_id="int_0123456789ab",
+        scenario_id="scenario_001_1",
+        results=pipeline_results
+    )
+    body = benchmark(response.model_dump_json)
+    assert InteractionResponse.model_validate_json(body) == response
@@ -0,0 +1,235 @@
+"""
+Load test for POST /api/interactions
+목표 RPS로 요청을 보내고 지연 시간 분위수(p50/p95/p99), 처리량, 스테이지별 소요 시간(Server-Timing)을 출력합니다.
+
+--url을 지정하지 않으면 오프라인 대체 구현(STAND_IN_PROVIDERS)으로 앱을 같은 프로세스에서 띄우므로
+자격 증명 없이 노트북이나 CI에서 실행할 수 있습니다 (부하 생성기와 서버가 이벤트 루프를 공유하는 점에 유의).
+
+요청은 응답을 기다리지 않고 일정 간격으로 시작하며(open-loop), 지연 시간은 예정된 시작 시각부터 측정합니다.
+서버가 밀리면 대기 시간까지 지연 시간에 포함됩니다.
+
+Usage:
+    python loadtest.py [--rps 5] [--duration 30] [--url http://localhost:8000] [--json result.json]
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import struct
+import time
+import wave
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+import httpx
+
+ENDPOINT = "/api/interactions"
+
+
+@dataclass
+class RequestResult:
+    """요청 하나의 결과"""
+    status: int  # 0이면 연결 실패/타임아웃
+    latency_ms: float
+    stages: dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def parse_server_timing(header: str) -> dict[str, float]:
+    """Server-Timing 헤더 → {이름: ms}"""
+    stages = {}
+    for entry in header.split(","):
+        name, _, params = entry.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and name:
+                stages[name] = float(value)
+    return stages
+
+
+def percentile(values: list[float], q: float) -> float:
+    """최근접 순위(nearest-rank) 분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def make_test_audio(duration_ms: int = 2000, sample_rate: int = 16000) -> bytes:
+    """앞뒤 무음 + 가운데 톤으로 된 16kHz mono WAV (VAD가 무음을 잘라낼 수 있도록)"""
+    total = sample_rate * duration_ms // 1000
+    silence = total // 5
+    samples = [
+        int(8000 * math.sin(2 * math.pi * 220 * i / sample_rate)) if silence <= i < total - silence else 0
+        for i in range(total)
+    ]
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(struct.pack(f"<{total}h", *samples))
+    return buffer.getvalue()
+
+
+async def send_request(
+    client: httpx.AsyncClient,
+    scheduled_at: float,
+    limit: asyncio.Semaphore,
+    scenario_id: str,
+    user_id: str,
+    audio: bytes,
+    filename: str
+) -> RequestResult:
+    async with limit:
+        try:
+            response = await client.post(
+                ENDPOINT,
+                data={"scenario_id": scenario_id, "user_id": user_id},
+                files={"audio_file": (filename, audio, "application/octet-stream")}
+            )
+        except httpx.HTTPError as e:
+            return RequestResult(0, (time.perf_counter() - scheduled_at) * 1000, error=type(e).__name__)
+    latency_ms = (time.perf_counter() - scheduled_at) * 1000
+    stages = parse_server_timing(response.headers.get("server-timing", ""))
+    return RequestResult(response.status_code, latency_ms, stages)
+
+
+async def generate_load(
+    client: httpx.AsyncClient,
+    rps: float,
+    duration: float,
+    max_in_flight: int,
+    users: int,
+    scenario_id: str,
+    audio: bytes,
+    filename: str
+) -> tuple[list[RequestResult], float]:
+    """
+    duration초 동안 1/rps 간격으로 요청 시작 (users명의 사용자 ID를 번갈아 사용)
+
+    Returns:
+        tuple: (결과 목록, 첫 요청부터 마지막 응답까지 걸린 시간(초))
+    """
+    limit = asyncio.Semaphore(max_in_flight)
+    total = max(1, int(rps * duration))
+    started = time.perf_counter()
+    tasks = []
+    for i in range(total):
+        scheduled_at = started + i / rps
+        delay = scheduled_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(
+            send_request(client, scheduled_at, limit, scenario_id, f"loadtest_{i % users}", audio, filename)
+        ))
+    results = await asyncio.gather(*tasks)
+    return list(results), time.perf_counter() - started
+
+
+def summarize(results: list[RequestResult], elapsed: float, rps: float) -> dict:
+    """결과 집계 (JSON 출력용)"""
+    ok = [r for r in results if r.status == 200]
+    latencies = [r.latency_ms for r in ok]
+    stage_values: dict[str, list[float]] = defaultdict(list)
+    for r in ok:
+        for name, duration_ms in r.stages.items():
+            stage_values[name].append(duration_ms)
+
+    def distribution(values: list[float]) -> dict:
+        return {
+            "p50": round(percentile(values, 50), 1),
+            "p95": round(percentile(values, 95), 1),
+            "p99": round(percentile(values, 99), 1),
+            "max": round(max(values), 1) if values else 0.0,
+        }
+
+    return {
+        "target_rps": rps,
+        "requests": len(results),
+        "succeeded": len(ok),
+        "failed": len(results) - len(ok),
+        "statuses": dict(Counter(str(r.error or r.status) for r in results)),
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": distribution(latencies),
+        "stages_ms": {name: distribution(values) for name, values in stage_values.items()},
+    }
+
+
+def print_report(summary: dict) -> None:
+    print("=" * 60)
+    print(
+        f"Requests: {summary['requests']} (ok {summary['succeeded']}, failed {summary['failed']}) "
+        f"in {summary['elapsed_seconds']}s"
+    )
+    print(f"Statuses: {summary['statuses']}")
+    print(f"Throughput: {summary['throughput_rps']} req/s (target {summary['target_rps']})")
+    print("-" * 60)
+    print(f"{'':<16}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    rows = [("end-to-end", summary["latency_ms"]), *summary["stages_ms"].items()]
+    for name, dist in rows:
+        print(f"{name:<16}{dist['p50']:>10}{dist['p95']:>10}{dist['p99']:>10}{dist['max']:>10}")
+    print("=" * 60)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    if args.audio:
+        with open(args.audio, "rb") as f:
+            audio = f.read()
+        filename = os.path.basename(args.audio)
+    else:
+        audio = make_test_audio()
+        filename = "loadtest.wav"
+
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=args.max_in_flight)
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+            results, elapsed = await generate_load(
+                client, args.rps, args.duration, args.max_in_flight, args.users, args.scenario_id, audio, filename
+            )
+    else:
+        # 설정은 app 모듈을 import할 때 읽히므로 그 전에 지정
+        os.environ["STAND_IN_PROVIDERS"] = "true"
+        os.environ.setdefault("TTS_WARMUP_ON_STARTUP", "false")
+        from loguru import logger
+        from app.main import create_app
+        logger.remove()
+
+        app = create_app()
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://loadtest", timeout=timeout, limits=limits
+            ) as client:
+                results, elapsed = await generate_load(
+                    client, args.rps, args.duration, args.max_in_flight, args.users, args.scenario_id, audio, filename
+                )
+            await logger.complete()
+
+    return summarize(results, elapsed, args.rps)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test POST /api/interactions")
+    parser.add_argument("--rps", type=float, default=5.0, help="초당 요청 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="요청을 보내는 시간 (초)")
+    parser.add_argument("--url", default="", help="대상 서버 (없으면 대체 구현으로 앱을 같은 프로세스에서 실행)")
+    parser.add_argument("--users", type=int, default=10, help="요청을 나눠 보낼 사용자 수 (사용자별 공정 대기열 확인용)")
+    parser.add_argument("--scenario-id", default="scenario_001_1", help="시나리오 ID")
+    parser.add_argument("--audio", default="", help="업로드할 오디오 파일 (없으면 2초 테스트 WAV 생성)")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="동시 요청 상한")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--json", default="", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run(args))
+    print_report(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
@@ -0,0 +1,8 @@
+"""
+Unit test fixtures
+외부 API 호출 없이 유틸리티 모듈의 동작을 검증
+"""
+import os
+
+# 설정 로드에 필요한 필수 값 (실제 API는 호출하지 않음)
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
@@ -0,0 +1,100 @@
+"""
+입장 제어 공정 대기열, 거절, 슬롯 반납 테스트
+"""
+import asyncio
+from typing import Any
+import pytest
+from starlette.requests import ClientDisconnect
+from app.routes.interactions import _ClosingStreamingResponse
+from app.utils.admission import REJECT_DEADLINE, REJECT_QUEUE_FULL, REJECT_TIMEOUT, AdmissionController
+from app.utils.exceptions import ServiceOverloadedError
+
+
+async def test_waiting_users_are_admitted_round_robin():
+    controller = AdmissionController(max_concurrent=1, max_queue=10, queue_deadline_seconds=5)
+    holder = await controller.acquire("holder")
+    order: list[str] = []
+
+    async def request(key: str, label: str) -> None:
+        async with controller.admit(key):
+            order.append(label)
+
+    # 한 사용자가 요청을 몰아 보내도 다른 사용자는 그 뒤에 밀리지 않음
+    tasks = [asyncio.create_task(request("user:a", f"a{i}")) for i in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request("user:b", "b0")))
+    await asyncio.sleep(0)
+    assert controller.stats()["queued"] == 4
+
+    holder.release()
+    holder.release()  # 두 번 반납해도 슬롯은 하나만 돌아감
+    await asyncio.gather(*tasks)
+
+    assert order == ["a0", "b0", "a1", "a2"]
+    stats = controller.stats()
+    assert (stats["active"], stats["queued"], stats["admitted"]) == (0, 0, 5)
+
+
+async def test_rejects_when_queue_is_full_or_wait_exceeds_deadline():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_deadline_seconds=0.05)
+    holder = await controller.acquire("holder")
+    waiter = asyncio.create_task(controller.acquire("user:a"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceOverloadedError):
+        await controller.acquire("user:b")
+    # 기한까지 차례가 오지 않은 대기자는 대기열에서 빠지고 거절됨
+    with pytest.raises(ServiceOverloadedError):
+        await waiter
+    assert controller.stats()["queued"] == 0
+
+    # 처리 시간 기록이 생기면 기한을 넘길 요청은 기다리지 않고 즉시 거절
+    controller._service_time = 1.0
+    with pytest.raises(ServiceOverloadedError) as excinfo:
+        await controller.acquire("user:c")
+    assert excinfo.value.retry_after >= 1
+
+    holder.release()
+    assert controller.rejected == {REJECT_QUEUE_FULL: 1, REJECT_DEADLINE: 1, REJECT_TIMEOUT: 1}
+    assert controller.stats()["active"] == 0
+
+
+async def test_cancelled_waiter_does_not_take_a_slot():
+    controller = AdmissionController(max_concurrent=1, max_queue=10, queue_deadline_seconds=5)
+    holder = await controller.acquire("holder")
+    waiter = asyncio.create_task(controller.acquire("user:a"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    holder.release()
+    stats = controller.stats()
+    assert (stats["active"], stats["queued"]) == (0, 0)
+
+
+async def test_streaming_response_releases_slot_when_client_disconnects_before_body():
+    controller = AdmissionController(max_concurrent=1, max_queue=0, queue_deadline_seconds=1)
+    ticket = await controller.acquire("user:a")
+    iterated = False
+
+    async def events():
+        nonlocal iterated
+        iterated = True
+        yield "data: {}\n\n"
+
+    async def receive() -> dict[str, Any]:
+        await asyncio.sleep(10)
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        raise OSError("client went away")
+
+    response = _ClosingStreamingResponse(events(), on_close=ticket.release, media_type="text/event-stream")
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}, "method": "POST", "path": "/", "headers": []}
+    with pytest.raises(ClientDisconnect):
+        await response(scope, receive, send)
+
+    # 제너레이터가 한 번도 실행되지 않았어도 슬롯은 반납됨
+    assert not iterated
+    assert controller.stats()["active"] == 0
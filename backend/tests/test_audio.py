@@ -0,0 +1,124 @@
+"""
+오디오 포맷 감지, WAV 헤더 파싱, ffmpeg 디코딩 경로 테스트 (ffmpeg 실행은 대체)
+"""
+import struct
+import subprocess
+import pytest
+from app.utils import audio
+from app.utils.audio import (
+    FORMAT_AMR_NB,
+    FORMAT_AMR_WB,
+    FORMAT_MP3,
+    FORMAT_MP4,
+    FORMAT_WAV,
+    decode_to_pcm,
+    detect_audio_format,
+    ingest_audio,
+    parse_wav_header,
+)
+
+
+def make_wav(pcm: bytes, sample_rate: int = 16000, channels: int = 1, bits: int = 16, data_size=None) -> bytes:
+    block_align = channels * bits // 8
+    fmt = struct.pack("<HHIIHH", 1, channels, sample_rate, sample_rate * block_align, block_align, bits)
+    size = len(pcm) if data_size is None else data_size
+    body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt + b"data" + struct.pack("<I", size) + pcm
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+class FakeFfmpeg:
+    """subprocess.run 대체: 호출된 입력 경로를 기록하고 fail_pipe면 파이프 입력을 실패시킴"""
+
+    def __init__(self, fail_pipe: bool = False):
+        self.fail_pipe = fail_pipe
+        self.inputs: list[str] = []
+
+    def __call__(self, cmd, input=None, **kwargs):
+        source = cmd[cmd.index("-i") + 1]
+        self.inputs.append(source)
+        if source == "pipe:0" and self.fail_pipe:
+            return subprocess.CompletedProcess(cmd, 1, b"", b"moov atom not found")
+        return subprocess.CompletedProcess(cmd, 0, b"\x01\x00" * 4, b"")
+
+
+@pytest.mark.parametrize("head, expected", [
+    (make_wav(b""), FORMAT_WAV),
+    (b"#!AMR-WB\n" + b"\x00" * 8, FORMAT_AMR_WB),
+    (b"#!AMR\n" + b"\x00" * 8, FORMAT_AMR_NB),
+    (b"\x00\x00\x00\x20ftypM4A " + b"\x00" * 8, FORMAT_MP4),
+    (b"ID3\x04" + b"\x00" * 12, FORMAT_MP3),
+])
+def test_detects_format_from_magic_bytes(head, expected):
+    assert detect_audio_format(head) == expected
+
+
+def test_parses_target_format_wav_header():
+    info = parse_wav_header(make_wav(b"\x00\x01" * 100))
+    assert info is not None and info.is_target_format
+    assert (info.data_offset, info.data_size) == (44, 200)
+    assert not parse_wav_header(make_wav(b"", sample_rate=44100)).is_target_format
+    assert parse_wav_header(b"not a wav file") is None
+
+
+def test_streamed_wav_without_size_uses_rest_of_file():
+    info = parse_wav_header(make_wav(b"\x00\x01" * 50, data_size=0))
+    assert info is not None and info.data_size == 100
+
+
+def test_mp4_is_decoded_from_a_seekable_temp_file(monkeypatch):
+    ffmpeg = FakeFfmpeg()
+    monkeypatch.setattr(audio.subprocess, "run", ffmpeg)
+
+    decode_to_pcm(b"\x00\x00\x00\x20ftypM4A " + b"\x00" * 64)
+    # moov atom이 파일 끝에 있으면 파이프로 읽을 수 없으므로 처음부터 파일 경로로 전달
+    assert len(ffmpeg.inputs) == 1 and ffmpeg.inputs[0] != "pipe:0"
+
+
+def test_pipe_decode_failure_retries_with_temp_file(monkeypatch):
+    ffmpeg = FakeFfmpeg(fail_pipe=True)
+    monkeypatch.setattr(audio.subprocess, "run", ffmpeg)
+
+    assert decode_to_pcm(b"OggS" + b"\x00" * 64) == b"\x01\x00" * 4
+    assert ffmpeg.inputs[0] == "pipe:0" and ffmpeg.inputs[1] != "pipe:0"
+
+
+async def test_target_format_wav_is_a_view_without_decoding(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("16kHz mono 16-bit WAV must not be decoded")
+
+    monkeypatch.setattr(audio, "decode_to_pcm", fail)
+    data = make_wav(b"\x00\x01" * 100)
+
+    canonical = await ingest_audio(data)
+    assert canonical is not None and canonical.source_format == FORMAT_WAV
+    # 업로드 버퍼의 data 청크를 가리키는 view (복사 없음)
+    assert canonical.pcm.obj is data
+    assert canonical.as_bytes() == b"\x00\x01" * 100
+    assert canonical.duration_ms == 6
+
+
+async def test_other_formats_are_decoded_once_and_failures_return_none(monkeypatch):
+    calls: list[bytes] = []
+
+    def decode(data: bytes) -> bytes:
+        calls.append(data)
+        return b"\x00\x00" * 16000
+
+    monkeypatch.setattr(audio, "decode_to_pcm", decode)
+    canonical = await ingest_audio(b"ID3\x04" + b"\x00" * 64)
+    assert canonical is not None and canonical.source_format == FORMAT_MP3
+    assert canonical.duration_ms == 1000
+    # ffmpeg 출력 전체를 가리키면 SDK에 넘길 때 복사하지 않음
+    assert canonical.as_bytes() is canonical.pcm.obj
+    assert len(calls) == 1
+
+    def missing_ffmpeg(data: bytes) -> bytes:
+        raise FileNotFoundError("ffmpeg")
+
+    monkeypatch.setattr(audio, "decode_to_pcm", missing_ffmpeg)
+    assert await ingest_audio(b"ID3\x04" + b"\x00" * 64) is None
+
+
+def test_wav_data_is_rounded_down_to_whole_samples():
+    info = parse_wav_header(make_wav(b"\x00\x01" * 50 + b"\x02"))
+    assert info is not None and info.data_size == 100
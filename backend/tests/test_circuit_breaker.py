@@ -0,0 +1,119 @@
+"""
+회로 차단기 상태 전이 및 로컬 포화 구분 테스트
+"""
+import asyncio
+import threading
+from typing import Optional
+import pytest
+from app.utils.circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker
+from app.utils.exceptions import CircuitOpenError, ExecutorSaturatedError, ServiceOverloadedError
+from app.utils.executors import BoundedExecutor
+
+
+class ProviderError(Exception):
+    pass
+
+
+async def call(breaker: CircuitBreaker, error: Optional[Exception] = None) -> None:
+    async with breaker.guard():
+        if error is not None:
+            raise error
+
+
+async def fail(breaker: CircuitBreaker, times: int = 1) -> None:
+    for _ in range(times):
+        with pytest.raises(ProviderError):
+            await call(breaker, ProviderError())
+
+
+async def test_opens_when_failure_rate_is_reached_and_fails_fast():
+    breaker = CircuitBreaker("test", min_calls=4, failure_rate=0.5, open_seconds=60)
+    await call(breaker)
+    await fail(breaker, 2)
+    assert breaker.state == STATE_CLOSED  # 최소 호출 수 미만
+
+    await fail(breaker)
+    assert breaker.state == STATE_OPEN
+    with pytest.raises(CircuitOpenError) as excinfo:
+        await call(breaker)
+    assert excinfo.value.retry_after >= 59
+    assert breaker.stats()["fast_failed"] == 1
+
+
+async def test_half_open_probe_closes_on_success_and_reopens_on_failure():
+    breaker = CircuitBreaker("test", min_calls=1, failure_rate=0.5, open_seconds=0.05)
+    await fail(breaker)
+    assert breaker.state == STATE_OPEN
+    await asyncio.sleep(0.06)
+    assert breaker.state == STATE_HALF_OPEN
+
+    # 시험 호출 실패 → 다시 open
+    await fail(breaker)
+    assert breaker.state == STATE_OPEN
+    await asyncio.sleep(0.06)
+
+    # 시험 호출 진행 중에는 다른 호출을 막고, 성공하면 closed (장애 기간 기록은 버림)
+    probe_started = asyncio.Event()
+    finish_probe = asyncio.Event()
+
+    async def probe() -> None:
+        async with breaker.guard():
+            probe_started.set()
+            await finish_probe.wait()
+
+    task = asyncio.create_task(probe())
+    await probe_started.wait()
+    with pytest.raises(CircuitOpenError):
+        await call(breaker)
+    finish_probe.set()
+    await task
+    assert breaker.state == STATE_CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+async def test_overload_and_cancellation_are_not_provider_failures():
+    breaker = CircuitBreaker("test", min_calls=1, failure_rate=0.5)
+    with pytest.raises(ServiceOverloadedError):
+        await call(breaker, ServiceOverloadedError(service_name="test rate limit", retry_after=1))
+
+    task = asyncio.create_task(call_and_wait(breaker))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert breaker.state == STATE_CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+async def call_and_wait(breaker: CircuitBreaker) -> None:
+    async with breaker.guard():
+        await asyncio.sleep(10)
+
+
+async def test_local_executor_saturation_never_opens_the_breaker():
+    breaker = CircuitBreaker("test", min_calls=4, failure_rate=0.5)
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def provider_call() -> bool:
+        async with breaker.guard():
+            return await executor.run(release.wait, 5)
+
+    try:
+        busy = asyncio.create_task(provider_call())
+        await asyncio.sleep(0)
+        # 워커가 하나뿐이므로 버스트의 나머지는 제공자에 닿기 전에 로컬에서 거절됨
+        for _ in range(8):
+            with pytest.raises(ExecutorSaturatedError):
+                await provider_call()
+        release.set()
+        assert await busy
+    finally:
+        executor.shutdown()
+
+    assert breaker.state == STATE_CLOSED
+    stats = breaker.stats()
+    assert (stats["window_calls"], stats["window_failures"], stats["opened"]) == (1, 0, 0)
+    # 바로 다음 요청도 정상 처리
+    await call(breaker)
@@ -0,0 +1,38 @@
+"""
+BoundedExecutor 대기열 제한 및 컨텍스트 전파 테스트
+"""
+import asyncio
+import contextvars
+import threading
+import pytest
+from app.utils.exceptions import ServiceUnavailableError
+from app.utils.executors import BoundedExecutor
+
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="")
+
+
+@pytest.fixture
+def executor():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    yield executor
+    executor.shutdown()
+
+
+async def test_rejects_when_workers_and_queue_are_full(executor):
+    release = threading.Event()
+    running = [asyncio.create_task(executor.run(release.wait, 5)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceUnavailableError):
+        await executor.run(lambda: None)
+
+    release.set()
+    assert await asyncio.gather(*running) == [True, True]
+    stats = executor.stats()
+    assert (stats["submitted"], stats["completed"], stats["rejected"]) == (2, 2, 1)
+    assert stats["in_flight"] == 0
+
+
+async def test_worker_sees_caller_context(executor):
+    request_id.set("int_123")
+    assert await executor.run(request_id.get) == "int_123"
@@ -0,0 +1,67 @@
+"""
+헤지 요청 정책 테스트
+"""
+import asyncio
+import pytest
+from app.utils.hedging import HedgeAttempt, HedgePolicy
+
+
+def warmed_policy(latency: float = 0.01, **kwargs) -> HedgePolicy:
+    policy = HedgePolicy("hedge_test", "op", enabled=True, min_samples=5, min_delay_seconds=0.01, max_ratio=1.0, **kwargs)
+    policy._latencies.extend([latency] * 5)
+    return policy
+
+
+async def test_does_not_hedge_without_enough_samples():
+    policy = HedgePolicy("hedge_test", "op", enabled=True, min_samples=5)
+    calls = 0
+
+    async def call(attempt: HedgeAttempt) -> str:
+        nonlocal calls
+        calls += 1
+        with attempt.timed():
+            await asyncio.sleep(0.01)
+        return "ok"
+
+    assert await policy.run(call) == "ok"
+    assert (calls, policy.hedged) == (1, 0)
+    assert len(policy._latencies) == 1
+
+
+async def test_slow_primary_is_hedged_and_loser_is_cancelled():
+    policy = warmed_policy()
+    cancelled = asyncio.Event()
+    attempts = 0
+
+    async def call(attempt: HedgeAttempt) -> str:
+        nonlocal attempts
+        attempts += 1
+        index = attempts
+        with attempt.timed():
+            try:
+                await asyncio.sleep(1.0 if index == 1 else 0.01)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return f"attempt{index}"
+
+    assert await policy.run(call) == "attempt2"
+    assert (policy.hedged, policy.hedge_wins, policy.censored) == (1, 1, 1)
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+async def test_raises_when_both_attempts_fail():
+    policy = warmed_policy()
+    attempts = 0
+
+    async def call(attempt: HedgeAttempt) -> str:
+        nonlocal attempts
+        attempts += 1
+        index = attempts
+        with attempt.timed():
+            await asyncio.sleep(0.05 if index == 1 else 0.0)
+            raise RuntimeError(f"attempt{index} failed")
+
+    with pytest.raises(RuntimeError, match="failed"):
+        await policy.run(call)
+    assert attempts == 2
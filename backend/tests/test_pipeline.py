@@ -0,0 +1,99 @@
+"""
+StageGraph 실행 순서, 실패/취소 전파 테스트
+"""
+import asyncio
+import pytest
+from app.utils.pipeline import Stage, StageGraph
+
+
+def test_rejects_unknown_dependency_and_cycles():
+    async def noop(results):
+        return None
+
+    with pytest.raises(ValueError, match="unknown stage"):
+        StageGraph([Stage("a", noop, depends_on=("missing",))])
+    with pytest.raises(ValueError, match="cycle"):
+        StageGraph([Stage("a", noop, depends_on=("b",)), Stage("b", noop, depends_on=("a",))])
+    with pytest.raises(ValueError, match="Duplicate"):
+        StageGraph([Stage("a", noop), Stage("a", noop)])
+
+
+async def test_independent_stages_run_concurrently_and_dependents_see_results():
+    started: list[str] = []
+    release = asyncio.Event()
+
+    async def slow(name: str):
+        started.append(name)
+        await release.wait()
+        return name
+
+    async def left(results):
+        return await slow("left")
+
+    async def right(results):
+        return await slow("right")
+
+    async def join(results):
+        return results["left"] + "+" + results["right"]
+
+    graph = StageGraph([
+        Stage("left", left),
+        Stage("right", right),
+        Stage("join", join, depends_on=("left", "right")),
+    ])
+    task = asyncio.create_task(graph.run())
+    await asyncio.sleep(0.01)
+    # 두 독립 스테이지가 서로를 기다리지 않고 함께 시작됨
+    assert sorted(started) == ["left", "right"]
+    release.set()
+    run = await task
+
+    assert run.results["join"] == "left+right"
+    assert run.timings["join"].started_at >= run.timings["left"].finished_at
+    assert graph.critical_path(run)[-1] == "join"
+
+
+async def test_failure_cancels_running_stages_and_propagates_original_error():
+    cancelled = asyncio.Event()
+
+    async def hang(results):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def fail(results):
+        await asyncio.sleep(0.01)
+        raise KeyError("boom")
+
+    async def never(results):
+        raise AssertionError("dependent of a failed stage must not run")
+
+    graph = StageGraph([
+        Stage("hang", hang),
+        Stage("fail", fail),
+        Stage("after", never, depends_on=("fail",)),
+    ])
+    with pytest.raises(KeyError, match="boom"):
+        await graph.run()
+    assert cancelled.is_set()
+
+
+async def test_external_cancellation_cancels_all_stages():
+    cancelled: list[str] = []
+
+    async def hang(results):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("hang")
+            raise
+
+    graph = StageGraph([Stage("hang", hang)])
+    task = asyncio.create_task(graph.run())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert cancelled == ["hang"]
@@ -0,0 +1,82 @@
+"""
+토큰 버킷 및 제공자 속도 제한기 테스트
+"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.utils.exceptions import ServiceOverloadedError
+from app.utils.rate_limit import (
+    ProviderRateLimiter,
+    TokenBucket,
+    estimate_tokens,
+    is_quota_error,
+    usage_tokens,
+)
+
+
+def test_bucket_allows_burst_then_spaces_reservations():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 0.0
+    # 세 번째는 0.1초 뒤, 네 번째는 0.2초 뒤 (예약 순서대로 실행)
+    assert bucket.reserve(1) == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve(1) == pytest.approx(0.2, abs=0.01)
+
+    bucket.refund(2)
+    assert bucket.reserve(1) == pytest.approx(0.1, abs=0.01)
+
+
+async def test_limiter_delays_calls_to_the_configured_rate():
+    limiter = ProviderRateLimiter("test", requests_per_second=20, burst_seconds=0.05, max_wait_seconds=1)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for _ in range(3):
+        async with limiter.limit():
+            pass
+
+    assert loop.time() - started >= 0.09
+    assert (limiter.acquired, limiter.delayed) == (3, 2)
+
+
+async def test_rejects_instead_of_waiting_past_max_wait_and_returns_the_slot():
+    limiter = ProviderRateLimiter("test", requests_per_second=1, max_wait_seconds=0.5)
+    await limiter.acquire()
+
+    with pytest.raises(ServiceOverloadedError) as excinfo:
+        await limiter.acquire()
+    assert excinfo.value.retry_after == 1
+    assert limiter.rejected == 1
+    # 거절된 예약은 반환되므로 버킷이 더 깊은 음수로 내려가지 않음
+    assert limiter.stats()["available_requests"] == pytest.approx(0.0, abs=0.05)
+
+
+async def test_quota_error_pauses_new_calls():
+    limiter = ProviderRateLimiter("test", requests_per_second=100, max_wait_seconds=0.01, quota_backoff_seconds=5)
+
+    with pytest.raises(RuntimeError):
+        async with limiter.limit():
+            raise RuntimeError("429 RESOURCE_EXHAUSTED: quota exceeded")
+
+    assert limiter.stats()["paused"] and limiter.quota_errors == 1
+    with pytest.raises(ServiceOverloadedError):
+        await limiter.acquire()
+
+
+async def test_token_reservation_is_settled_with_actual_usage():
+    limiter = ProviderRateLimiter("gemini", requests_per_second=0, tokens_per_minute=6000, max_wait_seconds=1)
+    async with limiter.limit(tokens=80) as permit:
+        permit.settle(30)
+        permit.settle(0)  # 두 번째 정산은 무시
+
+    assert limiter.stats()["available_tokens"] == pytest.approx(100 - 30, abs=1)
+
+
+def test_quota_error_detection_and_token_helpers():
+    assert is_quota_error(SimpleNamespace(code=429))
+    assert is_quota_error(RuntimeError("Too Many Requests"))
+    assert not is_quota_error(RuntimeError("invalid argument"))
+
+    assert estimate_tokens("abcd", max_output_tokens=10) == 11
+    assert estimate_tokens("財布") == 2
+    assert usage_tokens(SimpleNamespace(usage_metadata=SimpleNamespace(total_token_count=42))) == 42
+    assert usage_tokens(SimpleNamespace()) is None
@@ -0,0 +1,71 @@
+"""
+TTS 디스크 캐시 LRU / 고정 / 보존 기간 테스트
+"""
+import os
+from app.services.tts_cache import TTSCache
+
+
+def make_cache(tmp_path, max_bytes: int = 10, retention_seconds: float = 0.0) -> TTSCache:
+    return TTSCache(tmp_path, "/uploads/audio/cache/", max_bytes=max_bytes, retention_seconds=retention_seconds)
+
+
+def test_key_depends_on_every_voice_setting():
+    base = dict(text="こんにちは", language_code="ja-JP", voice_name="ja-JP-Wavenet-A",
+                speaking_rate=1.0, pitch=0.0, audio_encoding="MP3")
+    key = TTSCache.make_key(**base)
+    assert TTSCache.make_key(**base) == key
+    for field, value in [("text", "こんばんは"), ("voice_name", "ja-JP-Wavenet-B"), ("speaking_rate", 1.1)]:
+        assert TTSCache.make_key(**{**base, field: value}) != key
+
+
+async def test_get_put_roundtrip_counts_hits_and_misses(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=100)
+    assert await cache.get("a") is None
+    url = await cache.put("a", b"audio")
+    assert url == "/uploads/audio/cache/a.mp3"
+    assert cache.path_for("a").read_bytes() == b"audio"
+    assert await cache.get("a") == url
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size_bytes"]) == (1, 1, 5)
+
+
+async def test_evicts_least_recently_used_first(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=10)
+    await cache.put("a", b"12345")
+    await cache.put("b", b"12345")
+    # a를 다시 사용하면 b가 가장 오래된 항목이 됨
+    assert await cache.get("a") is not None
+    await cache.put("c", b"12345")
+
+    assert cache.contains("a") and cache.contains("c")
+    assert not cache.contains("b")
+    assert not cache.path_for("b").exists()
+    assert cache.stats()["evictions"] == 1
+
+
+async def test_pinned_and_recently_served_entries_are_not_evicted(tmp_path):
+    pinned = make_cache(tmp_path / "pinned", max_bytes=10)
+    await pinned.put("a", b"12345")
+    pinned.pin("a")
+    await pinned.put("b", b"12345")
+    await pinned.put("c", b"12345")
+    assert pinned.contains("a") and not pinned.contains("b")
+
+    # 보존 기간 안에 URL을 반환한 파일은 용량을 넘어도 남김 (클라이언트가 아직 내려받지 않았을 수 있음)
+    retained = make_cache(tmp_path / "retained", max_bytes=10, retention_seconds=60)
+    for key in ("x", "y", "z"):
+        await retained.put(key, b"12345")
+    assert all(retained.contains(key) for key in ("x", "y", "z"))
+    assert retained.stats()["size_bytes"] == 15
+
+
+async def test_index_is_rebuilt_from_disk_in_mtime_order(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=100)
+    await cache.put("old", b"12345")
+    await cache.put("new", b"12345")
+    os.utime(cache.path_for("old"), (1, 1))
+
+    reloaded = make_cache(tmp_path, max_bytes=5)
+    # 재시작 후에도 오래된 파일부터 정리
+    assert reloaded.contains("new")
+    assert not cache.path_for("old").exists()
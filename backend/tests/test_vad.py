@@ -0,0 +1,44 @@
+"""
+VAD 앞뒤 무음 트리밍 테스트
+"""
+import numpy as np
+from app.utils.audio import CanonicalAudio
+from app.utils.vad import trim_silence
+
+SAMPLE_RATE = 16000
+
+
+def make_audio(*segments: tuple[str, float]) -> CanonicalAudio:
+    """("silence" | "tone", 초) 구간을 이어 붙인 16kHz PCM"""
+    rng = np.random.default_rng(0)
+    parts = []
+    for kind, seconds in segments:
+        n = int(SAMPLE_RATE * seconds)
+        if kind == "tone":
+            t = np.arange(n) / SAMPLE_RATE
+            parts.append(0.3 * np.sin(2 * np.pi * 220 * t))
+        else:
+            parts.append(rng.normal(0, 0.0005, n))
+    samples = (np.concatenate(parts) * 32767).astype("<i2")
+    return CanonicalAudio(pcm=memoryview(samples.tobytes()), source_format="pcm")
+
+
+def test_trims_leading_and_trailing_silence_within_padding():
+    audio = make_audio(("silence", 1.0), ("tone", 0.5), ("silence", 0.8))
+    result = trim_silence(audio, padding_ms=100)
+
+    assert result.speech_detected
+    assert 880 <= result.leading_ms <= 920
+    assert 680 <= result.trailing_ms <= 720
+    assert abs(result.audio.duration_ms - 700) <= 40
+    # 원본 버퍼의 view (복사 없음)
+    assert result.audio.pcm.obj is audio.pcm.obj
+
+
+def test_silence_only_returns_original_audio():
+    audio = make_audio(("silence", 1.0))
+    result = trim_silence(audio)
+
+    assert not result.speech_detected
+    assert result.audio is audio
+    assert result.trimmed_ms == 0
@@ -0,0 +1,35 @@
+"""
+Pre-synthesize fixed scenario audio (character lines) into the TTS cache
+배포 후 서버 시작 전에 실행하면 첫 사용자도 캐시된 음성을 받습니다.
+
+Usage:
+    python warmup_audio.py [--concurrency 4]
+"""
+import argparse
+import asyncio
+from app.config import get_settings
+from app.services.audio_warmup_service import AudioWarmupService
+from app.services.scenario_service import ScenarioService
+from app.services.tts_service import TTSService
+
+settings = get_settings()
+
+
+async def main(concurrency: int) -> None:
+    scenario_service = ScenarioService()
+    warmup_service = AudioWarmupService(TTSService(), concurrency=concurrency)
+    result = await warmup_service.warmup(scenario_service.scenarios)
+    if result.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm up scenario TTS audio cache")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.tts_warmup_concurrency,
+        help="동시 합성 요청 수"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency))